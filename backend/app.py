@@ -1,13 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from .db import Base, engine
+from .db import ensure_schema
 from .config.settings import settings
+from .ingest import parallel, scheduler
 from .routes import players, teams, picks, suggestions, admin
 from .routes import meta
 from .routes import edits
+from .routes import draft
 
 
-app = FastAPI(title="Draft Assistant API")
+app = FastAPI(title="Draft Assistant API", default_response_class=ORJSONResponse)
 
 app.include_router(meta.router)
 app.include_router(edits.router)
@@ -18,11 +21,25 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Enriched-Version", "X-Next-Cursor", "X-Change-Seq"],
 )
 
 @app.on_event("startup")
 def startup():
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
+
+@app.on_event("startup")
+async def start_scheduler():
+    if settings.injury_refresh_season:
+        scheduler.injuries.start(settings.injury_refresh_season)
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    scheduler.injuries.stop()
+
+@app.on_event("shutdown")
+def stop_parse_pool():
+    parallel.shutdown()
 
 @app.get("/")
 def home():
@@ -37,3 +54,4 @@ app.include_router(teams.router)
 app.include_router(picks.router)
 app.include_router(suggestions.router)
 app.include_router(admin.router)
+app.include_router(draft.router)
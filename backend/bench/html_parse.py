@@ -0,0 +1,103 @@
+# backend/bench/html_parse.py
+"""
+Parse time / memory of the HTML scrapers: the BeautifulSoup versions they
+used to run vs. the ingest.html_tables pull parser they use now.
+
+    python -m backend.bench.html_parse [--repeat 20]
+
+Fixtures in backend/bench/fixtures/ mirror the live pages' structure
+(FantasyPros overall rankings table, CBS injuries page). Each mode is timed
+best-of-N; the memory figure is the tracemalloc peak of one parse, taken in a
+fresh subprocess per mode so earlier runs don't skew it.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+from ..ingest.html_tables import iter_rows
+from ..ingest.sources.injuries_cbs import _TEAM_BLOCKS
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PAGES = {"fantasypros": "fantasypros_overall.html", "cbs": "cbs_injuries.html"}
+
+
+def _soup_fantasypros(html: str) -> list[tuple]:
+    table = BeautifulSoup(html, "lxml").find("table")
+    return [tuple(c.get_text(strip=True) for c in tr.find_all(["td", "th"])) for tr in table.find_all("tr")]
+
+def _soup_cbs(html: str) -> list[tuple]:
+    out = []
+    for sec in BeautifulSoup(html, "lxml").select("div.Page-colMain div.TeamInjuries"):
+        for tr in sec.select("table tr")[1:]:
+            tds = [td.get_text(strip=True) for td in tr.find_all("td")]
+            if len(tds) >= 5:
+                out.append(tuple(tds[:5]))
+    return out
+
+def _pull_fantasypros(html: str) -> list[tuple]:
+    return list(iter_rows(html, max_tables=1))
+
+def _pull_cbs(html: str) -> list[tuple]:
+    return [r[:5] for r in iter_rows(html, within=_TEAM_BLOCKS, cells=("td",)) if len(r) >= 5]
+
+PARSERS = {
+    ("fantasypros", "bs4"): _soup_fantasypros, ("fantasypros", "lxml"): _pull_fantasypros,
+    ("cbs", "bs4"): _soup_cbs, ("cbs", "lxml"): _pull_cbs,
+}
+
+
+def load(page: str) -> str:
+    with open(os.path.join(FIXTURES, PAGES[page]), encoding="utf-8") as f:
+        return f.read()
+
+def best_ms(fn, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+def memory(page: str, mode: str) -> dict:
+    """Python-heap peak (MB) of one parse in this process."""
+    html = load(page)
+    tracemalloc.start()
+    PARSERS[page, mode](html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"heap_peak_mb": round(peak / 2**20, 1)}
+
+def _memory_subprocess(page: str, mode: str) -> dict:
+    out = subprocess.run([sys.executable, "-m", __spec__.name, "--memory", page, mode],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--memory", nargs=2, metavar=("PAGE", "MODE"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.memory:
+        print(json.dumps(memory(*args.memory)))
+        return
+
+    for page in PAGES:
+        html = load(page)
+        old, new = PARSERS[page, "bs4"](html), PARSERS[page, "lxml"](html)
+        if page == "fantasypros":       # the scraper only keeps rows with >= 4 cells
+            old, new = [r for r in old if len(r) >= 4], [r for r in new if len(r) >= 4]
+        assert old == new, f"{page}: row mismatch"
+        print(f"{page}: {len(html) / 1024:.0f} KB, {len(new)} rows (identical)")
+        for mode in ("bs4", "lxml"):
+            ms = best_ms(PARSERS[page, mode], html, args.repeat)
+            mem = _memory_subprocess(page, mode)
+            print(f"  {mode:<5} {ms:7.1f} ms   heap peak {mem['heap_peak_mb']:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
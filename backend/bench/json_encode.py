@@ -0,0 +1,93 @@
+# backend/bench/json_encode.py
+"""
+Serialization cost of the big list endpoints: what FastAPI did before
+(response_model validation / jsonable_encoder + stdlib json) vs. the
+ORJSONResponse paths they use now.
+
+    python -m backend.bench.json_encode [--rows 2000] [--repeat 20]
+
+Synthetic rows shaped like /meta/players_enriched and /players. Times are
+best-of-N for turning the rows into response bytes; sizes are the bodies.
+"""
+import argparse
+import random
+import time
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from .. import schemas
+from ..services import enriched
+
+POS = ("QB", "RB", "WR", "TE", "K", "DST")
+TEAMS = ("ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB")
+
+
+def _enriched_rows(n: int) -> tuple[tuple, list[tuple]]:
+    rnd = random.Random(7)
+    keys = ("player_id", *enriched.FIELDS)
+    sample = {
+        "player_id": lambda i: str(4000 + i), "name": lambda i: f"Player Name{i}",
+        "pos": lambda i: rnd.choice(POS), "team": lambda i: rnd.choice(TEAMS),
+        "ecr": lambda i: float(i + 1), "ecr_pos": lambda i: float(i // 6 + 1),
+        "tier": lambda i: i // 24 + 1, "tier_source": lambda i: "core",
+        "adp": lambda i: round(i + rnd.uniform(-5, 5), 1) if i < 300 else None,
+        "injury_status": lambda i: "Questionable" if i % 17 == 0 else None,
+        "injury_body": lambda i: "Hamstring" if i % 17 == 0 else None,
+    }
+    return keys, [tuple(sample.get(k, lambda i: None)(i) for k in keys) for i in range(n)]
+
+
+class _Obj:
+    """Stands in for an ORM row: attribute access, read via from_attributes."""
+    def __init__(self, **kw):
+        self.__dict__.update(kw)
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def _report(title: str, modes: dict, repeat: int):
+    print(title)
+    base = None
+    for name, fn in modes.items():
+        size = len(fn().body)
+        ms = _best_ms(fn, repeat)
+        base = base or (ms, size)
+        print(f"  {name:<24} {ms:7.2f} ms  {size / 1024:7.1f} KiB  (x{base[0] / ms:4.1f} time, "
+              f"{size / base[1]:4.0%} size)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    keys, rows = _enriched_rows(args.rows)
+    dicts = [dict(zip(keys, r)) for r in rows]
+    _report(f"/meta/players_enriched ({len(rows)} rows)", {
+        "before: jsonable+json": lambda: JSONResponse(jsonable_encoder([dict(zip(keys, r)) for r in rows])),
+        "orjson rows": lambda: ORJSONResponse([dict(zip(keys, r)) for r in rows]),
+        "orjson columns": lambda: ORJSONResponse(
+            {"count": len(rows), "columns": dict(zip(keys, map(list, zip(*rows))))}),
+    }, args.repeat)
+
+    cols = tuple(schemas.PlayerOut.model_fields)
+    players = [(d["player_id"], 2025, d["name"], d["pos"], d["team"], 7) for d in dicts[:1000]]
+    objs = [_Obj(**dict(zip(cols, p))) for p in players]
+    adapter = TypeAdapter(list[schemas.PlayerOut])
+    _report(f"/players ({len(players)} rows)", {
+        "before: response_model": lambda: JSONResponse(
+            jsonable_encoder(adapter.dump_python(adapter.validate_python(objs, from_attributes=True)))),
+        "orjson dicts": lambda: ORJSONResponse([dict(zip(cols, p)) for p in players]),
+    }, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
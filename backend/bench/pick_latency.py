@@ -0,0 +1,99 @@
+# backend/bench/pick_latency.py
+"""
+POST /picks latency with concurrent submitters, against a throwaway SQLite db.
+
+    python -m backend.bench.pick_latency [--clients 12] [--rounds 15]
+
+Three passes over a 12-team league:
+  steady     clients take the next free overall_no from a shared counter
+  contended  every client submits the same overall_no at once (one wins, the rest get 409)
+  retry      the steady picks are resent with their Idempotency-Key (all replays)
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+N_TEAMS = 12
+
+
+def _pct(xs: list[float], q: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+def _report(name: str, samples: list[tuple[int, float]]):
+    ms = [t for _, t in samples]
+    codes = dict(sorted(Counter(c for c, _ in samples).items()))
+    print(f"{name:<10} n={len(ms):<5} p50 {_pct(ms, .5):6.1f} ms  p95 {_pct(ms, .95):6.1f} ms"
+          f"  p99 {_pct(ms, .99):6.1f} ms  max {max(ms):6.1f} ms  {codes}")
+
+def _seed(n_players: int):
+    from .. import models
+    from ..db import SessionLocal, sync_schema
+    sync_schema()
+    db = SessionLocal()
+    db.add_all(models.TeamLeague(team_slot_id=i, team_name=f"Team {i}", draft_position=i)
+               for i in range(1, N_TEAMS + 1))
+    db.add_all(models.Player(player_id=f"p{i}", season=2025, clean_name=f"Player {i}", position="WR")
+               for i in range(n_players))
+    db.commit(); db.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=12)
+    ap.add_argument("--rounds", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="pick_bench_")
+    os.environ["DA_DB_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    from fastapi.testclient import TestClient
+    from ..app import app
+    from ..services.draft_order import snake_position
+
+    steady_n = N_TEAMS * args.rounds
+    contended_n = N_TEAMS * 5
+    _seed(steady_n + 1 + contended_n * args.clients)
+
+    with TestClient(app, raise_server_exceptions=False) as client, ThreadPoolExecutor(args.clients) as pool:
+        def post(overall_no: int, player: str, key: str | None = None) -> tuple[int, float]:
+            rnd, pos = snake_position(overall_no, N_TEAMS)
+            body = {"overall_no": overall_no, "player_id": player, "round_no": rnd, "team_slot_id": pos}
+            t0 = time.perf_counter()
+            r = client.post("/picks", json=body, headers={"Idempotency-Key": key} if key else {})
+            return r.status_code, (time.perf_counter() - t0) * 1000
+
+        counter = iter(range(1, steady_n + 1))
+        lock = threading.Lock()
+
+        def steady_worker():
+            out = []
+            while True:
+                with lock:
+                    o = next(counter, None)
+                if o is None:
+                    return out
+                out.append(post(o, f"p{o}", key=f"k{o}"))
+
+        samples = [s for f in [pool.submit(steady_worker) for _ in range(args.clients)] for s in f.result()]
+        _report("steady", samples)
+
+        samples = []
+        for i in range(contended_n):
+            o = steady_n + i + 1
+            gate = threading.Barrier(args.clients)
+            def racer(c, o=o, gate=gate):
+                gate.wait()
+                return post(o, f"p{steady_n + 1 + i * args.clients + c}")
+            samples += [f.result() for f in [pool.submit(racer, c) for c in range(args.clients)]]
+        _report("contended", samples)
+
+        samples = list(pool.map(lambda o: post(o, f"p{o}", key=f"k{o}"), range(1, steady_n + 1)))
+        _report("retry", samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
 # backend/config/settings.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     db_url: str = "sqlite:///./draft.db"
     cors_origins: List[str] = ["*"]      # later: restrict to your UI origin(s)
     admin_token: Optional[str] = None    # set DA_ADMIN_TOKEN to guard /admin/*
+    import_workers: int = 4              # concurrent background import jobs
+    parse_workers: int = 2               # processes parsing import payloads; 0: parse in a thread
+    fetch_cache_dir: str = "./.fetch_cache"
+    # seconds a cached payload is served without even a conditional request
+    fetch_max_age: Dict[str, int] = {"sleeper": 6 * 3600, "cbs": 900, "fantasypros_ecr": 3600}
+    # Sleeper players outside these positions are dropped while streaming the dump
+    fantasy_positions: List[str] = ["QB", "RB", "WR", "TE", "K", "DEF"]
+    # starters per team, used for VOR replacement levels (DA_ROSTER_SLOTS as JSON)
+    roster_slots: Dict[str, int] = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "K": 1, "DEF": 1}
+    # draft-day CBS injury refresh: seconds between checks; set the season to start it with the app
+    injury_refresh_seconds: int = 120
+    injury_refresh_season: Optional[int] = None
 
     # pydantic v2 settings config
     model_config = SettingsConfigDict(
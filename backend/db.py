@@ -1,4 +1,8 @@
-from sqlalchemy import create_engine
+import hashlib
+import logging
+from datetime import datetime
+from sqlalchemy import create_engine, delete, event, insert, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config.settings import settings
 
@@ -6,6 +10,17 @@ engine = create_engine(
     settings.db_url,
     connect_args={"check_same_thread": False} if settings.db_url.startswith("sqlite") else {}
 )
+if settings.db_url.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _record):
+        # WAL: readers don't block the writer and commits skip the rollback-journal fsyncs
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.close()
+
+log = logging.getLogger(__name__)
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
@@ -15,3 +30,66 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def sync_schema() -> list[str]:
+    """
+    create_all() plus the additive bits it skips on existing tables:
+    new (nullable) columns and new indexes. Keeps an existing draft.db usable
+    after a model gains a column, without a migration tool. A new NOT NULL
+    column without a server default can't be added to existing rows; it is
+    skipped and logged, and returned as "table.column".
+    """
+    Base.metadata.create_all(bind=engine)
+    insp = inspect(engine)
+    skipped = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            have = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in have:
+                    continue
+                if not col.nullable and col.server_default is None:
+                    skipped.append(f"{table.name}.{col.name}")
+                    log.error("schema: can't add NOT NULL column %s.%s without a server default to an "
+                              "existing table; make it nullable or give it a server_default", table.name, col.name)
+                    continue
+                ddl = col.type.compile(dialect=engine.dialect)
+                if col.server_default is not None:
+                    default = col.server_default.arg
+                    default = default.text if hasattr(default, "text") else repr(str(default))
+                    ddl += f" NOT NULL DEFAULT {default}" if not col.nullable else f" DEFAULT {default}"
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {ddl}"))
+            for idx in table.indexes:
+                idx.create(conn, checkfirst=True)
+    return skipped
+
+def schema_fingerprint() -> str:
+    """Hash of every table, column (type, nullability) and index the models define."""
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(table.name)
+        parts += [f"{c.name}:{c.type!r}:{c.nullable}" for c in table.columns]
+        parts += sorted(f"{i.name}:{','.join(c.name for c in i.columns)}" for i in table.indexes)
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+def ensure_schema() -> bool:
+    """
+    sync_schema() unless the db was last synced to the same models; a boot
+    against an up-to-date db is one SELECT instead of an inspection of every
+    table. True if it synced.
+    """
+    from . import models  # noqa: F401 -- registers every table on Base.metadata
+    version = Base.metadata.tables["schema_version"]
+    want = schema_fingerprint()
+    try:
+        with engine.connect() as conn:
+            if conn.execute(select(version.c.fingerprint)).scalar() == want:
+                return False
+    except (OperationalError, ProgrammingError):    # new db, or one from before schema_version
+        pass
+    if sync_schema():
+        return True     # not recorded as current: the skipped columns are reported again next boot
+    with engine.begin() as conn:
+        conn.execute(delete(version))
+        conn.execute(insert(version).values(fingerprint=want, synced_at=datetime.utcnow()))
+    return True
@@ -0,0 +1,59 @@
+# backend/ingest/adp_consensus.py
+"""
+Cross-source ADP consensus.
+
+Every ADP import writes one source ('fp_composite', 'sleeper', 'espn', ...).
+This stage folds all of a season's sources into one derived source,
+'consensus', whose row per player carries the weighted mean ADP (adp), the
+rank of that mean, and the spread across sources: median, min, max, weighted
+standard deviation, number of sources. It is one groupby over a frame of the
+season's ADP rows and a bulk write, so a full recompute is milliseconds.
+
+enriched / survival read 'consensus' (falling back to fp_composite for a db
+whose ADP predates this stage); the std widens the survival simulation's
+per-player spread where the sites disagree.
+"""
+import time
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from .. import models
+
+CONSENSUS = "consensus"
+WEIGHTS = {"fp_composite": 2.0}    # already a blend of several sites; everything else 1.0
+STAT_COLS = ["adp", "rank", "adp_median", "adp_min", "adp_max", "adp_std", "n_sources"]
+
+
+def aggregate_adp(db: Session, season: int) -> dict:
+    """Rebuild the season's consensus rows from every other ADP source (does not commit)."""
+    t0 = time.perf_counter()
+    A = models.ADP
+    conn = db.connection()    # Core rows: the ORM result layer costs more than the aggregation
+    rows = conn.execute(select(A.player_id, A.source, A.adp)
+                        .where(A.season == season, A.source != CONSENSUS, A.adp.isnot(None))).all()
+    conn.execute(delete(A.__table__).where(A.season == season, A.source == CONSENSUS))
+    df = pd.DataFrame(rows, columns=["player_id", "source", "adp"])
+    if df.empty:
+        return {"season": season, "players": 0, "sources": [], "elapsed_ms": 0.0}
+
+    df["w"] = df["source"].map(WEIGHTS).fillna(1.0)
+    df["wx"] = df["w"] * df["adp"]
+    g = df.groupby("player_id", sort=False)
+    out = g["adp"].agg(adp_median="median", adp_min="min", adp_max="max", n_sources="size")
+    sw = g["w"].sum()
+    out["adp"] = g["wx"].sum() / sw
+    dev = df["adp"] - df["player_id"].map(out["adp"])
+    out["adp_std"] = ((df["w"] * dev * dev).groupby(df["player_id"], sort=False).sum() / sw) ** 0.5
+    out[["adp", "adp_std"]] = out[["adp", "adp_std"]].round(2)
+    out["rank"] = out["adp"].rank(method="first")
+
+    # no NaNs by construction (std of one source is 0): plain lists, one executemany
+    cols = {"player_id": out.index.tolist(), **{c: out[c].tolist() for c in STAT_COLS}}
+    fixed = {"season": season, "source": CONSENSUS}
+    conn.execute(insert(A.__table__), [{**fixed, **dict(zip(cols, vals))} for vals in zip(*cols.values())])
+    return {
+        "season": season,
+        "players": len(out),
+        "sources": sorted(df["source"].unique().tolist()),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+    }
@@ -0,0 +1,70 @@
+# backend/ingest/bulk.py
+"""
+Batched INSERT ... ON CONFLICT DO UPDATE for the importers.
+
+Rows are plain dicts with identical keys; they are written in chunks with one
+executemany per chunk instead of one ORM round trip per row.
+"""
+from itertools import islice
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+CHUNK_SIZE = 500
+
+def chunked(rows, size: int = CHUNK_SIZE):
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _dialect_insert(db: Session):
+    name = db.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise RuntimeError(f"bulk upsert needs SQLite or PostgreSQL (ON CONFLICT); got {name}")
+    return insert
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows,
+    key_cols: list[str],
+    update_cols: list[str] | None = None,
+    coalesce_cols: tuple[str, ...] = (),
+    extra_set: dict | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Upsert `rows` into `model`'s table keyed by `key_cols`.
+
+    - update_cols: columns overwritten on conflict (default: every non-key
+      column present in the rows); [] means ON CONFLICT DO NOTHING
+    - coalesce_cols: subset of update_cols that keep the stored value when
+      the incoming one is NULL (mirrors the old "only set if not None" code)
+    - extra_set: literal values applied on conflict (e.g. updated_at)
+
+    Does not commit. Returns the number of rows sent.
+    """
+    insert = _dialect_insert(db)
+    table = model.__table__
+    sent = 0
+    for chunk in chunked(rows, chunk_size):
+        stmt = insert(table)
+        cols = update_cols if update_cols is not None else [c for c in chunk[0] if c not in key_cols]
+        if not cols and not extra_set:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key_cols)
+        else:
+            set_ = {
+                c: func.coalesce(stmt.excluded[c], table.c[c]) if c in coalesce_cols else stmt.excluded[c]
+                for c in cols
+            }
+            set_.update(extra_set or {})
+            stmt = stmt.on_conflict_do_update(index_elements=key_cols, set_=set_)
+        db.execute(stmt, chunk)
+        sent += len(chunk)
+    return sent
@@ -1,46 +1,11 @@
 import pandas as pd
+from datetime import datetime
 from sqlalchemy.orm import Session
 from .. import models
+from .bulk import bulk_upsert
+from .frames import clean_float, clean_int, clean_text, col_or_na, to_records
 
-def upsert_player_and_rank(row, db: Session):
-    # Upsert Player
-    p = db.get(models.Player, row["player_id"])
-    if not p:
-        p = models.Player(
-            player_id=row["player_id"],
-            season=int(row["season"]),
-            clean_name=row["clean_name"],
-            position=row["position"],
-            team=row.get("team"),
-            bye_week=int(row["bye_week"]) if pd.notna(row.get("bye_week")) else None,
-        )
-        db.add(p)
-    else:
-        # update basics (safe fields)
-        p.season = int(row["season"])
-        p.clean_name = row["clean_name"]
-        p.position = row["position"]
-        p.team = row.get("team")
-        p.bye_week = int(row["bye_week"]) if pd.notna(row.get("bye_week")) else None
-
-    # Upsert ConsensusRank
-    cr = db.query(models.ConsensusRank).filter_by(
-        season=int(row["season"]), player_id=row["player_id"]).first()
-    if not cr:
-        cr = models.ConsensusRank(
-            season=int(row["season"]),
-            player_id=row["player_id"],
-            ecr_rank=float(row["ecr_rank"]) if pd.notna(row.get("ecr_rank")) else None,
-            ecr_pos_rank=float(row["ecr_pos_rank"]) if pd.notna(row.get("ecr_pos_rank")) else None,
-            tier=int(row["tier"]) if pd.notna(row.get("tier")) else None,
-            source="seed_csv"
-        )
-        db.add(cr)
-    else:
-        cr.ecr_rank = float(row["ecr_rank"]) if pd.notna(row.get("ecr_rank")) else cr.ecr_rank
-        cr.ecr_pos_rank = float(row["ecr_pos_rank"]) if pd.notna(row.get("ecr_pos_rank")) else cr.ecr_pos_rank
-        cr.tier = int(row["tier"]) if pd.notna(row.get("tier")) else cr.tier
-        cr.source = "seed_csv"
+PLAYER_COLS = ["season", "clean_name", "position", "team", "bye_week"]
 
 def import_from_csv(csv_path: str, db: Session) -> dict:
     df = pd.read_csv(csv_path)
@@ -49,9 +14,28 @@ def import_from_csv(csv_path: str, db: Session) -> dict:
     if missing:
         return {"imported": 0, "errors": [f"Missing columns: {', '.join(sorted(missing))}"]}
 
-    count = 0
-    for _, row in df.iterrows():
-        upsert_player_and_rank(row, db)
-        count += 1
+    frame = pd.DataFrame({
+        "player_id": df["player_id"].astype(str),
+        "season": clean_int(df["season"]),
+        "clean_name": df["clean_name"],
+        "position": df["position"],
+        "team": clean_text(col_or_na(df, "team")),
+        "bye_week": clean_int(col_or_na(df, "bye_week")),
+        "ecr_rank": clean_float(col_or_na(df, "ecr_rank")),
+        "ecr_pos_rank": clean_float(col_or_na(df, "ecr_pos_rank")),
+        "tier": clean_int(col_or_na(df, "tier")),
+    }, index=df.index)
+
+    # Players: basics are overwritten, last row per player_id wins
+    players = frame.drop_duplicates("player_id", keep="last")[["player_id", *PLAYER_COLS]]
+    bulk_upsert(db, models.Player, to_records(players), key_cols=["player_id"],
+                update_cols=PLAYER_COLS, extra_set={"updated_at": datetime.utcnow()})
+
+    # ConsensusRank: blank cells keep the stored value
+    ranks = frame.groupby(["season", "player_id"], sort=False)[["ecr_rank", "ecr_pos_rank", "tier"]].last().reset_index()
+    ranks["source"] = "seed_csv"
+    bulk_upsert(db, models.ConsensusRank, to_records(ranks), key_cols=["season", "player_id"],
+                update_cols=["ecr_rank", "ecr_pos_rank", "tier", "source"],
+                coalesce_cols=("ecr_rank", "ecr_pos_rank", "tier"))
     db.commit()
-    return {"imported": count, "errors": []}
+    return {"imported": len(frame), "errors": []}
@@ -0,0 +1,196 @@
+# backend/ingest/draft_log.py
+"""
+Batch pick import: rebuild a draft from a list of picks or a CSV draft log.
+
+Teams and current picks are read once and every pick is checked in memory --
+player resolved (by id, or by name through the resolver), overall_no unique
+and the draft left without gaps, no player taken twice, round/team derived
+from snake order when missing. Only a fully valid batch is written: one
+executemany in one transaction, optionally replacing the current draft.
+"""
+import csv
+import io
+import time
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+from .. import models
+from ..services import changes
+from ..services.draft_order import snake_position
+from .bulk import chunked
+from .normalize import norm_space
+from .resolver import PlayerResolver
+
+# batch item key -> accepted CSV headers (lower-cased)
+CSV_COLUMNS = {
+    "overall_no": ("overall_no", "overall", "pick", "pick_no"),
+    "round_no": ("round_no", "round", "rd"),
+    "team_slot_id": ("team_slot_id", "slot"),
+    "fantasy_team": ("fantasy_team", "picked_by", "manager"),
+    "player_id": ("player_id",),
+    "player": ("player", "player_name", "name"),
+    "pos": ("pos", "position"),
+    "nfl_team": ("nfl_team", "team"),
+}
+_INT_KEYS = ("overall_no", "round_no", "team_slot_id")
+
+
+def parse_draft_csv(text: str) -> tuple[list[dict], list[str]]:
+    """CSV draft log -> (batch items, errors). Items carry a "label" for error messages."""
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    headers = {(h or "").strip().lower(): h for h in reader.fieldnames or []}
+    cols = {key: next((headers[a] for a in aliases if a in headers), None) for key, aliases in CSV_COLUMNS.items()}
+    if not (cols["player"] or cols["player_id"]):
+        return [], ["CSV needs a player (name) or player_id column"]
+    items, errors = [], []
+    for line, rec in enumerate(reader, start=2):
+        item = {"label": f"line {line}"}
+        for key, col in cols.items():
+            v = (rec.get(col) or "").strip() if col else ""
+            item[key] = v or None
+        for key in _INT_KEYS:
+            if item[key] is not None:
+                try:
+                    f = float(item[key])    # spreadsheets write 3 as "3.0"
+                except ValueError:
+                    f = None
+                if f is None or not f.is_integer():     # also 2.7, inf, nan
+                    errors.append(f"line {line}: {key} {item[key]!r} is not a whole number")
+                else:
+                    item[key] = int(f)
+        items.append(item)
+    return items, errors
+
+
+def _known_ids(db: Session, ids: set[str]) -> set[str]:
+    P = models.Player
+    out = set()
+    for chunk in chunked(sorted(ids)):
+        out.update(pid for (pid,) in db.query(P.player_id).filter(P.player_id.in_(chunk)).all())
+    return out
+
+
+def plan_batch(db: Session, items: list[dict], replace: bool = False) -> dict:
+    """Validate items against the db; rows to insert, the picks being replaced, errors."""
+    T, K = models.TeamLeague, models.Pick
+    teams = db.query(T.team_slot_id, T.team_name, T.draft_position).all()
+    if not teams:
+        return {"rows": [], "errors": ["No teams configured (POST /teams/init first)"]}
+    n_teams = len(teams)
+    slot_at = {dp: slot for slot, _, dp in teams}
+    slot_named = {norm_space(name).lower(): slot for slot, name, _ in teams}
+    slots = {slot for slot, _, _ in teams}
+
+    current = db.query(K.overall_no, K.player_id).all()
+    kept = [] if replace else current
+    taken_overall = {o for o, _ in kept}
+    taken_player = {pid for _, pid in kept}
+    next_overall = max(taken_overall, default=0) + 1
+    last = len(kept) + len(items)    # any pick past this leaves a gap
+
+    known = _known_ids(db, {it["player_id"] for it in items if it.get("player_id")})
+    fast = PlayerResolver.for_names(db, [it.get("player") for it in items if not it.get("player_id")])
+    full, retried = None, 0
+
+    rows, errors = [], []
+    for i, it in enumerate(items):
+        label = it.get("label") or f"picks[{i}]"
+        pid = it.get("player_id")
+        if pid:
+            if pid not in known:
+                errors.append(f"{label}: unknown player_id {pid}")
+                continue
+        elif it.get("player"):
+            args = (it["player"], it.get("pos"), it.get("nfl_team"))
+            pid = fast.resolve(*args)
+            if pid is None:
+                # not spelled like ours: fuzzy tiers need the whole table
+                full = full or PlayerResolver.from_db(db)
+                pid, retried = full.resolve(*args), retried + 1
+            if pid is None:
+                errors.append(f"{label}: no player matches {it['player']!r}")
+                continue
+        else:
+            errors.append(f"{label}: needs player_id or player")
+            continue
+
+        o = it["overall_no"] if it.get("overall_no") is not None else next_overall
+        next_overall = o + 1
+        if o < 1:
+            errors.append(f"{label}: overall_no must be >= 1")
+            continue
+        if o > last:
+            errors.append(f"{label}: overall_no {o} is past the end of the draft (pick {last}) and would leave a gap")
+            continue
+        if it.get("round_no") is not None and not 1 <= it["round_no"] <= o:
+            errors.append(f"{label}: round_no {it['round_no']} is not between 1 and overall_no {o}")
+            continue
+        if o in taken_overall:
+            errors.append(f"{label}: overall_no {o} already used")
+            continue
+        if pid in taken_player:
+            errors.append(f"{label}: {pid} already drafted")
+            continue
+
+        round_no, draft_position = snake_position(o, n_teams)
+        slot = it.get("team_slot_id")
+        if slot is None and it.get("fantasy_team"):
+            slot = slot_named.get(norm_space(it["fantasy_team"]).lower())
+            if slot is None:
+                errors.append(f"{label}: unknown fantasy team {it['fantasy_team']!r}")
+                continue
+        if slot is None:
+            slot = slot_at.get(draft_position)
+        if slot not in slots:
+            errors.append(f"{label}: unknown team_slot_id {slot}")
+            continue
+
+        taken_overall.add(o)
+        taken_player.add(pid)
+        rows.append({"overall_no": o, "round_no": it.get("round_no") or round_no,
+                     "team_slot_id": slot, "player_id": pid})
+
+    if not errors and taken_overall:
+        # overall_no values are unique: the draft is gapless iff the largest equals the count
+        missing = max(taken_overall) - len(taken_overall)
+        if missing:
+            first = next(n for n, o in enumerate(sorted(taken_overall), start=1) if o != n)
+            errors.append(f"draft would have gaps: overall_no {first} is the first of {missing} missing")
+
+    tiers = fast.stats.copy()
+    if full is not None:
+        tiers["unmatched"] -= retried
+        tiers.update(full.stats)
+    return {
+        "rows": rows,
+        "replaced": [pid for _, pid in current] if replace else [],
+        "match_tiers": {k: v for k, v in tiers.items() if v},
+        "errors": errors,
+    }
+
+
+def import_picks(db: Session, items: list[dict], replace: bool = False) -> dict:
+    """
+    Validate and write a batch in one transaction (nothing is written if any
+    pick is invalid). IntegrityError propagates if a concurrent pick races in.
+    """
+    t0 = time.perf_counter()
+    plan = plan_batch(db, items, replace)
+    if plan["errors"]:
+        db.rollback()
+        return {"inserted": 0, "errors": plan["errors"]}
+    K = models.Pick
+    if replace:
+        db.execute(delete(K))
+    picks = []
+    if plan["rows"]:
+        ret = insert(K).returning(K.pick_id, K.overall_no, K.round_no, K.team_slot_id, K.player_id,
+                                  sort_by_parameter_order=True)
+        picks = [dict(r._mapping) for r in db.execute(ret, plan["rows"])]
+    changes.record(db, "pick", plan["replaced"] + [p["player_id"] for p in picks])
+    db.commit()
+    return {
+        "inserted": len(picks), "replaced": len(plan["replaced"]),
+        "match_tiers": plan["match_tiers"],
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        "picks": picks, "replaced_player_ids": plan["replaced"], "errors": [],
+    }
@@ -0,0 +1,148 @@
+# backend/ingest/fetch_cache.py
+"""
+On-disk cache of raw payloads for the remote sources.
+
+Each URL keeps its last 200 body plus ETag / Last-Modified and a SHA-256 of
+the content. Within a source's max-age the stored body is served without a
+request; after that the request is conditional and a 304 serves the stored
+body again. Bodies are streamed straight to disk while being hashed.
+
+CachedClient wraps an httpx.AsyncClient and returns ordinary httpx.Response
+objects, so the source fetchers don't know whether the bytes came from the
+network; get_file() hands out the cached body's path instead, for payloads
+too big to hold in memory. It also remembers the hash of every body it handed out, which the
+job runner uses to skip parse/write when a source's payload hasn't changed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+import httpx
+from ..config.settings import settings
+
+CHUNK = 1 << 16
+
+
+def _paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha1(url.encode()).hexdigest()
+    base = os.path.join(settings.fetch_cache_dir, key)
+    return base + ".body", base + ".json"
+
+
+def _load_meta(url: str) -> dict | None:
+    body, meta = _paths(url)
+    if not (os.path.exists(body) and os.path.exists(meta)):
+        return None
+    with open(meta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_body(url: str) -> bytes:
+    with open(_paths(url)[0], "rb") as f:
+        return f.read()
+
+
+def _save_meta(url: str, meta: dict):
+    path = _paths(url)[1]
+    fd, tmp = tempfile.mkstemp(dir=settings.fetch_cache_dir, suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
+
+
+class CachedClient:
+    """Caching front for one import's GETs (`source` picks the max-age)."""
+
+    def __init__(self, client: httpx.AsyncClient, source: str, max_age: int | None = None):
+        self.client = client
+        self.source = source
+        self.max_age = settings.fetch_max_age.get(source, 0) if max_age is None else max_age
+        self.hashes: list[str] = []
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+        os.makedirs(settings.fetch_cache_dir, exist_ok=True)
+
+    def _cached_response(self, url: str, request: httpx.Request) -> httpx.Response:
+        meta = _load_meta(url)
+        headers = {"content-type": meta.get("content_type") or "application/octet-stream"}
+        return httpx.Response(200, content=_read_body(url), headers=headers, request=request)
+
+    def _served(self, meta: dict, cached: bool):
+        size = os.path.getsize(_paths(meta["url"])[0])
+        self.hashes.append(meta["sha256"])
+        self.stats["bytes_saved" if cached else "bytes_downloaded"] += size
+
+    async def _refresh(self, url: str, request: httpx.Request) -> httpx.Response | None:
+        """Bring the url's cached body up to date; the response instead if it isn't a 200/304."""
+        meta = _load_meta(url)
+        if meta and time.time() - meta["fetched_at"] < self.max_age:
+            self.stats["hits"] += 1
+            self._served(meta, cached=True)
+            return None
+        if meta:
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = await self.client.send(request, stream=True)
+        try:
+            if resp.status_code == 304 and meta:
+                self.stats["revalidated"] += 1
+                meta["fetched_at"] = time.time()
+                _save_meta(url, meta)
+                self._served(meta, cached=True)
+                return None
+            if resp.status_code != 200:
+                await resp.aread()
+                return resp
+            # stream to a temp file in the cache dir while hashing, then swap it in
+            h = hashlib.sha256()
+            fd, tmp = tempfile.mkstemp(dir=settings.fetch_cache_dir, suffix=".body")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    async for chunk in resp.aiter_bytes(CHUNK):
+                        h.update(chunk)
+                        f.write(chunk)
+                os.replace(tmp, _paths(url)[0])
+            except BaseException:
+                os.unlink(tmp)      # a broken download leaves no partial body behind
+                raise
+        finally:
+            await resp.aclose()
+
+        meta = {
+            "url": url,
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "content_type": resp.headers.get("content-type"),
+            "sha256": h.hexdigest(),
+            "fetched_at": time.time(),
+        }
+        _save_meta(url, meta)
+        self.stats["misses"] += 1
+        self._served(meta, cached=False)
+        return None
+
+    async def get(self, url: str, headers: dict | None = None) -> httpx.Response:
+        request = self.client.build_request("GET", url, headers=headers)
+        resp = await self._refresh(url, request)
+        return resp if resp is not None else self._cached_response(url, request)
+
+    async def get_file(self, url: str, headers: dict | None = None) -> str:
+        """Path of the url's up-to-date cached body, for payloads read as a stream; raises on HTTP errors."""
+        resp = await self._refresh(url, self.client.build_request("GET", url, headers=headers))
+        if resp is not None:
+            resp.raise_for_status()
+            raise httpx.HTTPStatusError(f"unexpected status {resp.status_code} for {url}",
+                                        request=resp.request, response=resp)
+        return _paths(url)[0]
+
+    def digest(self, params: dict) -> str | None:
+        """Hash of every body handed out plus the import's params; None if nothing was fetched."""
+        if not self.hashes:
+            return None
+        h = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode())
+        for x in self.hashes:
+            h.update(x.encode())
+        return h.hexdigest()
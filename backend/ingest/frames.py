@@ -0,0 +1,56 @@
+# backend/ingest/frames.py
+"""
+Whole-column versions of the per-cell cleaners used by the CSV importers.
+Each mirrors its scalar counterpart (_clean_float, norm_space, norm_pos,
+norm_team) so results are the same as the old row-by-row loops.
+"""
+import numpy as np
+import pandas as pd
+from .normalize import TEAM_MAP
+
+_NULL_TOKENS = {"", "-", "nan", "none"}
+
+def clean_float(s: pd.Series) -> pd.Series:
+    """dash / empty / unparseable -> NaN, everything else -> float."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    txt = s.astype("string").str.strip()
+    ok = pd.to_numeric(txt.mask(txt.isin(["", "-"])), errors="coerce").notna()
+    out = pd.Series(np.nan, index=s.index)
+    # Python float() on the valid cells: correctly rounded, same as _clean_float
+    out[ok] = txt[ok].astype(object).astype(float)
+    return out
+
+def clean_int(s: pd.Series) -> pd.Series:
+    """Like clean_float but truncated to a nullable integer."""
+    return pd.Series(np.trunc(clean_float(s)), index=s.index).astype("Int64")
+
+def clean_text(s: pd.Series) -> pd.Series:
+    """norm_space for a column: NFKC, nbsp -> space, collapse whitespace; blanks -> NA."""
+    txt = (
+        s.astype("string")
+        .str.normalize("NFKC")
+        .str.replace("\xa0", " ", regex=False)
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+    )
+    return txt.mask(txt.str.lower().isin(_NULL_TOKENS))
+
+def clean_pos(s: pd.Series) -> pd.Series:
+    p = clean_text(s).str.upper()
+    return p.mask(p.isin(["DST", "D/ST", "D-ST", "DEFENSE"]), "DEF")
+
+def clean_team(s: pd.Series) -> pd.Series:
+    t = clean_text(s).str.upper()
+    return t.replace(TEAM_MAP)
+
+def col_or_na(df: pd.DataFrame, col) -> pd.Series:
+    """df[col], or an all-NA column when the CSV doesn't have it."""
+    if col is None or col not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="object")
+    return df[col]
+
+def to_records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame -> list of dicts with NaN/NA turned into None for the DB driver."""
+    out = df.astype(object).where(df.notna(), None)
+    return out.to_dict("records")
@@ -0,0 +1,82 @@
+# backend/ingest/html_tables.py
+"""
+Row extraction for the HTML scrapers without building a soup of the page.
+
+The page is fed to lxml's pull parser in chunks. Only rows of tables inside
+the requested container path are turned into tuples of cell text (the same
+text BeautifulSoup's get_text(strip=True) gives); every other element is
+cleared as soon as it closes, so nav bars, scripts and ads never pile up in
+memory. Rows are yielded as they complete.
+"""
+from itertools import chain
+from typing import Iterator
+from lxml import etree
+
+CHUNK = 1 << 16
+
+Selector = tuple[str, str | None]     # (tag, css class or None)
+
+
+def cell_text(el) -> str:
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _matches(el, sel: Selector) -> bool:
+    tag, cls = sel
+    return el.tag == tag and (cls is None or cls in (el.get("class") or "").split())
+
+
+def _chunks(html: str | bytes, size: int = CHUNK):
+    for i in range(0, len(html), size):
+        yield html[i:i + size]
+
+
+def _drop(el):
+    """Free a finished element and the finished siblings before it."""
+    el.clear()
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def iter_rows(html: str | bytes, within: tuple[Selector, ...] = (), cells=("td", "th"),
+              max_tables: int | None = None) -> Iterator[tuple[str, ...]]:
+    """
+    Yield one tuple of cell texts per <tr> of the tables found inside the
+    nested `within` containers, e.g. (("div", "Page-colMain"), ("div", "TeamInjuries")).
+    `cells` are the tags counted as cells (direct children of the row);
+    `max_tables` stops after that many top-level target tables.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), remove_comments=True, remove_pis=True)
+    path: list = []             # open elements matching within[0..k]
+    tables = 0                  # open <table> depth inside the target
+    done = 0
+    for chunk in chain(_chunks(html), [None]):
+        if chunk is None:
+            parser.close()
+        else:
+            parser.feed(chunk)
+        for event, el in parser.read_events():
+            if event == "start":
+                if len(path) < len(within) and _matches(el, within[len(path)]):
+                    path.append(el)
+                elif el.tag == "table" and len(path) == len(within):
+                    tables += 1
+                continue
+            # end
+            if tables and el.tag == "tr":
+                yield tuple(cell_text(c) for c in el if c.tag in cells)
+                _drop(el)
+            elif tables and el.tag == "table":
+                tables -= 1
+                if tables == 0:
+                    done += 1
+                    _drop(el)
+                    if max_tables is not None and done >= max_tables:
+                        return
+            elif path and el is path[-1]:
+                path.pop()
+                _drop(el)
+            elif not tables:
+                _drop(el)
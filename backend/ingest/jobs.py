@@ -0,0 +1,285 @@
+# backend/ingest/jobs.py
+"""
+Background import jobs.
+
+Submitting an import returns a Job right away; the job then runs on a small
+asyncio worker pool: the fetch phase uses httpx.AsyncClient, parse runs in a
+worker process (ingest.parallel) and write in a thread. Independent sources
+overlap their fetch/parse work, while the DB side is serialized through one
+lock (SQLite allows a single writer). Every
+job writes an ImportRun with fetch/parse/write timings and notifies the read
+models through services.hooks once its rows are committed.
+
+Remote fetches go through the on-disk fetch cache; when the payload (and the
+job's params) hash the same as the source's last successful run, the job
+stops after the fetch. Pass "force": true to re-fetch and re-import anyway,
+or "max_age": <seconds> to override the source's cache max-age for one job
+(the injury scheduler uses 0: always revalidate, still skip when unchanged).
+
+The source modules (and pandas / httpx / lxml behind them) are imported the
+first time a job needs them, not when the API starts.
+"""
+import asyncio
+import importlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+from sqlalchemy.orm import Session
+from ..config.settings import settings
+from ..db import SessionLocal
+from ..services import hooks
+from . import parallel
+from .runs import RunTracker
+
+if TYPE_CHECKING:
+    from .fetch_cache import CachedClient
+
+FETCH_TIMEOUT = 60
+KEEP_JOBS = 200
+_CONTROL = ("force", "max_age")     # job params that don't change what gets imported
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    source: str                 # sources.name for the ImportRun
+    kind: str
+    hook: str                   # source name passed to hooks.on_import_finished
+    required: tuple[str, ...]
+    parse: Callable[[Any, dict], Any]
+    write: Callable[[Session, Any, dict], dict]
+    fetch: Callable[["CachedClient", dict], Awaitable[Any]] | None = None
+    # replaces hooks.on_import_finished for sources that know exactly what changed
+    notify: Callable[[Session, dict, dict], None] | None = None
+    # params -> one params dict per independently parsed part, and the parts -> parse's result
+    split: Callable[[dict], list[dict]] | None = None
+    join: Callable[[list], Any] | None = None
+    pooled: bool = True         # False: parse is trivial, don't ship it to a worker process
+
+
+# --- per-source phases -------------------------------------------------------
+
+def _src(name: str):
+    """ingest.sources.<name>, imported on first use."""
+    return importlib.import_module(f".sources.{name}", __package__)
+
+def _read_csv(path):
+    import pandas as pd
+    return pd.read_csv(path)
+
+def _import_csv(db: Session, path: str) -> dict:
+    from .csv_importer import import_from_csv
+    return import_from_csv(path, db)
+
+async def _fetch_ecr(client: "CachedClient", p: dict):
+    """('csv', bytes) / ('html', text) for a URL, ('path', path) for a local file."""
+    fantasypros_ecr = _src("fantasypros_ecr")
+    target = p["path_or_url"]
+    if not fantasypros_ecr.is_url(target):
+        return "path", target
+    content = await fantasypros_ecr.fetch_csv(client, target)
+    if content:
+        return "csv", content
+    if not p.get("html_fallback", True):
+        raise ValueError(f"No CSV available at {target}")
+    return "html", await fantasypros_ecr.fetch_html(client, target)
+
+def _parse_ecr(payload, p: dict):
+    fantasypros_ecr = _src("fantasypros_ecr")
+    kind, body = payload
+    if kind == "csv":
+        return fantasypros_ecr.parse_csv_bytes(body)
+    if kind == "html":
+        return fantasypros_ecr.parse_overall_html(body), None
+    return fantasypros_ecr.ecr_frame(_read_csv(body))
+
+def _write_ecr(db: Session, parsed, p: dict) -> dict:
+    frame, site_col = parsed
+    return _src("fantasypros_ecr").write_ecr_frame(db, p["season"], frame, site_col)
+
+SOURCES: dict[str, JobSpec] = {
+    "sleeper_players": JobSpec(
+        "sleeper", "players", "sleeper_players", ("season",),
+        fetch=lambda c, p: _src("sleeper_players").fetch_players(c),
+        parse=lambda raw, p: _src("sleeper_players").parse_players(raw, p["season"]),
+        write=lambda db, parsed, p: _src("sleeper_players").write_players(db, parsed),
+        pooled=False,           # parse is a lazy reader over the cached file; the writer drives it
+    ),
+    "fp_ecr": JobSpec(
+        "fantasypros_ecr", "ecr", "fp_ecr", ("season", "path_or_url"),
+        fetch=_fetch_ecr, parse=_parse_ecr, write=_write_ecr,
+    ),
+    "fp_ecr_html": JobSpec(
+        "fantasypros_ecr", "ecr", "fp_ecr", ("season", "url"),
+        fetch=lambda c, p: _src("fantasypros_ecr").fetch_html(c, p["url"]),
+        parse=lambda html, p: (_src("fantasypros_ecr").parse_overall_html(html), None),
+        write=_write_ecr,
+    ),
+    "fp_adp": JobSpec(
+        "fantasypros_adp", "adp", "fp_adp", ("season", "path"),
+        parse=lambda _, p: _src("fantasypros_adp").adp_frame(_read_csv(p["path"])),
+        write=lambda db, frame, p: _src("fantasypros_adp").write_adp_frame(
+            db, p["season"], frame, p.get("source_name", "fp_composite")),
+    ),
+    "fp_projections": JobSpec(
+        "fantasypros_projections", "projections", "fp_projections", ("season", "paths"),
+        parse=lambda _, p: _src("fantasypros_projections").parse_projection_files(p["paths"]),
+        write=lambda db, parsed, p: _src("fantasypros_projections").write_projection_files(
+            db, p["season"], parsed, p.get("source_name", "fp")),
+        split=lambda p: [{**p, "paths": part} for part in _src("fantasypros_projections").split_paths(p["paths"])],
+        join=lambda parts: _src("fantasypros_projections").merge_parsed(parts),
+    ),
+    "injuries_cbs": JobSpec(
+        "cbs", "injuries", "injuries_cbs", ("season",),
+        fetch=lambda c, p: _src("injuries_cbs").fetch_injuries(c),
+        parse=lambda html, p: _src("injuries_cbs").parse_injuries(html),
+        write=lambda db, rows, p: _src("injuries_cbs").write_injuries(db, p["season"], rows),
+        notify=lambda db, result, p: hooks.on_injuries_changed(db, p["season"], result["changes"]),
+    ),
+    "csv": JobSpec(
+        "seed_csv", "players", "csv", ("path",),
+        parse=lambda _, p: p["path"],
+        write=lambda db, path, p: _import_csv(db, path),
+        pooled=False,
+    ),
+}
+
+
+# --- runner ------------------------------------------------------------------
+
+_write_lock = threading.Lock()
+
+def _locked(fn, *args):
+    """One DB writer at a time across jobs (SQLite has a single write lock anyway)."""
+    with _write_lock:
+        return fn(*args)
+
+
+@dataclass
+class Job:
+    id: str
+    source: str
+    params: dict
+    status: str = "queued"          # queued | running | done | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    run_id: int | None = None
+    result: dict | None = None
+    error: str | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id, "source": self.source, "params": self.params, "status": self.status,
+            "submitted_at": self.submitted_at, "started_at": self.started_at,
+            "finished_at": self.finished_at, "run_id": self.run_id,
+            "result": self.result, "error": self.error,
+        }
+
+
+class JobRunner:
+    def __init__(self, workers: int | None = None, keep: int = KEEP_JOBS):
+        self.workers = workers or settings.import_workers
+        self.keep = keep
+        self._sem: asyncio.Semaphore | None = None
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, source: str, params: dict) -> Job:
+        """Queue a job on the running event loop. KeyError: unknown source; ValueError: missing params."""
+        spec = SOURCES[source]
+        missing = [k for k in spec.required if params.get(k) in (None, "", [])]
+        if missing:
+            raise ValueError(f"{source}: missing {', '.join(missing)}")
+        job = Job(uuid.uuid4().hex[:12], source, dict(params))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.keep:
+            self._jobs.popitem(last=False)
+        task = asyncio.get_running_loop().create_task(self._run(job, spec))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        return list(reversed(self._jobs.values()))
+
+    async def wait(self, job: Job) -> Job:
+        await job.done.wait()
+        return job
+
+    async def _run(self, job: Job, spec: JobSpec):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.workers)
+        async with self._sem:
+            job.status, job.started_at = "running", time.time()
+            db = SessionLocal()
+            run = None
+            try:
+                run = await asyncio.to_thread(_locked, RunTracker, db, spec.source, spec.kind)
+                job.run_id = run.run_id
+                raw, digest, cache_stats = None, None, None
+                if spec.fetch is not None:
+                    force = bool(job.params.get("force"))
+                    max_age = 0 if force else job.params.get("max_age")
+                    import httpx
+                    from .fetch_cache import CachedClient
+                    with run.phase("fetch"):
+                        async with httpx.AsyncClient(timeout=FETCH_TIMEOUT, follow_redirects=True) as client:
+                            cached = CachedClient(client, spec.source, max_age=max_age)
+                            raw = await spec.fetch(cached, job.params)
+                    digest = cached.digest({k: v for k, v in job.params.items() if k not in _CONTROL})
+                    cache_stats = cached.stats
+                    if digest and not force:
+                        prev = await asyncio.to_thread(run.last_success_hash)
+                        if prev == digest:
+                            job.result = await asyncio.to_thread(_locked, self._skip, run, digest, cache_stats)
+                            job.status = "done"
+                            return
+                with run.phase("parse"):
+                    if spec.pooled:
+                        parsed = await parallel.parse(job.source, spec, raw, job.params)
+                    else:
+                        parsed = await asyncio.to_thread(spec.parse, raw, job.params)
+                job.result = await asyncio.to_thread(
+                    _locked, self._write, db, spec, run, parsed, job.params, digest, cache_stats)
+                errors = job.result.get("errors") or []
+                job.status = "failed" if errors else "done"
+                job.error = "; ".join(map(str, errors)) or None
+            except Exception as e:
+                job.status, job.error = "failed", str(e)
+                if run is not None:
+                    await asyncio.to_thread(_locked, run.fail, e)
+            finally:
+                db.close()
+                job.finished_at = time.time()
+                job.done.set()
+
+    @staticmethod
+    def _write(db: Session, spec: JobSpec, run: RunTracker, parsed, params: dict,
+               digest: str | None, cache_stats: dict | None) -> dict:
+        with run.phase("write"):
+            result = spec.write(db, parsed, params)
+        run.finish(result, content_hash=digest)
+        if spec.notify is not None:
+            spec.notify(db, result, params)
+        else:
+            hooks.on_import_finished(db, spec.hook, params.get("season"), result)
+        if cache_stats is not None:
+            result = {**result, "fetch_cache": cache_stats}
+        return {**result, **run.timings(), "run_id": run.run_id}
+
+    @staticmethod
+    def _skip(run: RunTracker, digest: str, cache_stats: dict) -> dict:
+        """Same payload as the last successful run: nothing to parse or write."""
+        result = {"imported": 0, "skipped": "unchanged", "fetch_cache": cache_stats, "errors": []}
+        run.finish(result, content_hash=digest)
+        return {**result, **run.timings(), "run_id": run.run_id}
+
+
+runner = JobRunner()
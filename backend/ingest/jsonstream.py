@@ -0,0 +1,81 @@
+# backend/ingest/jsonstream.py
+"""
+Incremental reader for payloads shaped like one big JSON object
+({"key": {...}, "key": {...}, ...}) -- e.g. Sleeper's players dump.
+
+Entries are decoded one at a time with the stdlib decoder as bytes arrive,
+so a caller that filters as it goes never holds more than the current chunk
+plus the entries it keeps.
+"""
+import codecs
+import json
+from typing import Iterable, Iterator
+
+CHUNK = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WS = " \t\n\r"
+
+
+def _skip_ws(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in _WS:
+        pos += 1
+    return pos
+
+
+def file_chunks(path: str, size: int = CHUNK) -> Iterator[bytes]:
+    """Read a payload from disk a chunk at a time, for iter_object()."""
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def _member(buf: str, pos: int, eof: bool):
+    """(key, value, end) of the member starting at pos, or None if buf ends first."""
+    try:
+        key, p = _decoder.raw_decode(buf, pos)
+        p = _skip_ws(buf, p)
+        if p >= len(buf):
+            return None
+        if buf[p] != ":":
+            raise ValueError(f"expected ':' at offset {p}")
+        value, end = _decoder.raw_decode(buf, _skip_ws(buf, p + 1))
+    except json.JSONDecodeError:
+        if eof:
+            raise
+        return None
+    if end >= len(buf) and not eof:
+        return None         # a number/literal may continue in the next chunk
+    return key, value, end
+
+
+def iter_object(chunks: Iterable[bytes]) -> Iterator[tuple[str, object]]:
+    """(key, value) for each member of a top-level JSON object."""
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    it = iter(chunks)
+    buf, pos, opened, eof = "", 0, False, False
+    while True:
+        pos = _skip_ws(buf, pos)
+        if pos < len(buf):
+            c = buf[pos]
+            if not opened:
+                if c != "{":
+                    raise ValueError("expected a JSON object")
+                opened, pos = True, pos + 1
+                continue
+            if c == "}":
+                return
+            if c == ",":
+                pos += 1
+                continue
+            member = _member(buf, pos, eof)
+            if member is not None:
+                key, value, pos = member
+                yield key, value
+                continue
+        if eof:
+            raise ValueError("truncated JSON object")
+        chunk = next(it, None)
+        eof = chunk is None
+        buf = buf[pos:] + utf8.decode(chunk or b"", final=eof)
+        pos = 0
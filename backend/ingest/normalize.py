@@ -0,0 +1,119 @@
+# backend/ingest/normalize.py
+"""Name / position / team normalizers shared by every ingest source."""
+import re
+import unicodedata
+
+TEAM_MAP = {
+    # common cross-site differences
+    "JAX": "JAC",
+    "WSH": "WAS",
+    "LA": "LAR",     # sometimes appears for Rams
+    "STL": "LAR",    # old Rams
+    "SD": "LAC",     # old Chargers
+    "OAK": "LV",     # old Raiders
+    "TB": "TB",      # normalize anyway
+    "NO": "NO",      # Saints sometimes "NOR" → keep as "NO" since Sleeper uses "NO"
+    "NOR": "NO",
+    "NEP": "NE",
+    "GBP": "GB",
+    "SFO": "SF",
+    "KCC": "KC",
+    "JAC": "JAC",    # idempotent
+    "WAS": "WAS",
+    "LV": "LV",
+    "LAC": "LAC",
+    "LAR": "LAR",
+    "SF": "SF",
+    "KC": "KC",
+    "GB": "GB",
+    "NE": "NE",
+}
+
+def norm_space(s: str | None) -> str | None:
+    if s is None:
+        return None
+    # collapse weird spaces/diacritics
+    s = unicodedata.normalize("NFKC", str(s))
+    s = s.replace("\xa0", " ").strip()
+    return re.sub(r"\s+", " ", s)
+
+def norm_pos(pos: str | None) -> str | None:
+    if not pos:
+        return None
+    p = norm_space(pos).upper()
+    if p in ("DST", "D/ST", "D-ST", "DEFENSE"):
+        return "DEF"
+    return p
+
+def norm_team(team: str | None) -> str | None:
+    if not team:
+        return None
+    t = norm_space(team).upper()
+    return TEAM_MAP.get(t, t)
+
+# --- Fuzzy name keys ---------------------------------------------------------
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# first-name nicknames -> the form the other site is likely to use
+NICKNAMES = {
+    "mitch": "mitchell",
+    "gabe": "gabriel",
+    "hollywood": "marquise",
+    "chig": "chigoziem",
+    "kenny": "kenneth",
+    "ken": "kenneth",
+    "josh": "joshua",
+    "matt": "matthew",
+    "mike": "michael",
+    "nick": "nicholas",
+    "tony": "anthony",
+    "rob": "robert",
+    "bob": "robert",
+    "will": "william",
+    "dan": "daniel",
+    "danny": "daniel",
+    "dave": "david",
+    "jeff": "jeffrey",
+    "zach": "zachary",
+    "cam": "cameron",
+    "nate": "nathan",
+    "pat": "patrick",
+    "ben": "benjamin",
+    "jake": "jacob",
+    "joe": "joseph",
+    "tom": "thomas",
+    "tommy": "thomas",
+    "andy": "andrew",
+    "chris": "christopher",
+    "jon": "jonathan",
+    "greg": "gregory",
+    "jim": "james",
+    "jimmy": "james",
+}
+
+_PUNCT_DROP = re.compile(r"[.'’`]")
+_PUNCT_SPACE = re.compile(r"[^a-z0-9 ]+")
+
+def fold_name(name: str | None) -> str:
+    """Diacritics folded, lower-case, punctuation dropped: "Ja'Marr" -> "jamarr", "Amon-Ra" -> "amon ra"."""
+    if not name:
+        return ""
+    s = unicodedata.normalize("NFKD", str(name))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch)).lower()
+    return " ".join(_PUNCT_SPACE.sub(" ", _PUNCT_DROP.sub("", s)).split())
+
+def fuzzy_name_key(name: str | None) -> str | None:
+    """
+    Loose matching key: diacritics folded, lower-case, punctuation dropped,
+    generational suffixes removed and first-name nicknames expanded.
+    "Amon-Ra St. Brown" -> "amon ra st brown", "Mitch Trubisky" ->
+    "mitchell trubisky", "Odell Beckham Jr." -> "odell beckham".
+    """
+    tokens = fold_name(name).split()
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    if not tokens:
+        return None
+    tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return " ".join(tokens)
@@ -0,0 +1,76 @@
+# backend/ingest/parallel.py
+"""
+Process pool for the parse phase of import jobs.
+
+CSV reads, HTML trees and name cleaning are pure-Python / pandas work that
+holds the GIL; on a thread it competes with the request handlers serving the
+draft. Here it runs in worker processes instead: a job ships its source name,
+raw payload (or just a file path) and params, the worker looks the parser up
+in jobs.SOURCES and sends back the parsed rows / frames, and the main process
+only matches and writes. Sources with `split` fan out one task per part (one
+per projection file), so a multi-file import parses on several cores.
+
+Workers are spawned (not forked from a threaded server) on first use and kept
+for later jobs. DA_PARSE_WORKERS=0 parses in a thread as before; a pool whose
+worker died is dropped and that parse falls back to a thread.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ..config.settings import settings
+
+_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def _parse(source: str, raw, params: dict):
+    """Worker side: run the source's parser (imports it on the worker's first job)."""
+    from .jobs import SOURCES
+    return SOURCES[source].parse(raw, params)
+
+
+def _executor() -> ProcessPoolExecutor | None:
+    global _pool
+    if settings.parse_workers <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(settings.parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _drop(pool: ProcessPoolExecutor):
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _one(source: str, raw, params: dict):
+    pool = _executor()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, _parse, source, raw, params)
+        except BrokenProcessPool:
+            _drop(pool)
+    return await asyncio.to_thread(_parse, source, raw, params)
+
+
+async def parse(source: str, spec, raw, params: dict):
+    """The job's parsed payload, computed off the main process where possible."""
+    if spec.split is None:
+        return await _one(source, raw, params)
+    parts = await asyncio.gather(*(_one(source, raw, p) for p in spec.split(params)))
+    return spec.join(parts)
+
+
+def shutdown():
+    """Stop the workers (app shutdown); a parse in flight is allowed to finish."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
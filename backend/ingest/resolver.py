@@ -0,0 +1,256 @@
+# backend/ingest/resolver.py
+"""
+In-memory player identity resolver.
+
+Built once per import from a single SELECT over players; every input row then
+resolves with dictionary lookups instead of up to three queries. Tiers are
+tried in order and counted so an import can report how rows were matched:
+
+  [crosswalk] -> name_pos_team -> name_pos -> name -> fuzzy_pos -> fuzzy -> unmatched
+
+The fuzzy tiers use a precomputed index of `fuzzy_name_key` values (suffixes,
+punctuation, diacritics, nicknames) and only accept an unambiguous hit.
+
+When built for a source, the persistent crosswalk (source, source_key) ->
+player_id is consulted before the name tiers, and every fresh match is
+queued for insertion by `flush()`, so a repeat import is a key lookup and a
+manually corrected mapping sticks.
+"""
+from collections import Counter
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from .. import models
+from .bulk import bulk_upsert, chunked
+from .normalize import norm_space, norm_pos, norm_team, fuzzy_name_key
+
+TIERS = ("crosswalk", "name_pos_team", "name_pos", "name", "fuzzy_pos", "fuzzy", "unmatched")
+
+def source_key(name, pos=None, team=None, site_id=None) -> str:
+    """Crosswalk key: the site's own id when it has one, else normalized name|pos|team."""
+    if site_id is not None and str(site_id).strip():
+        return f"id:{str(site_id).strip()}"
+    return "|".join(v or "" for v in (norm_space(name), norm_pos(pos), norm_team(team)))
+
+
+class PlayerResolver:
+    def __init__(self, rows, source: str | None = None, links: dict[str, str] | None = None):
+        """
+        rows: iterable of (player_id, clean_name, position, team).
+        source/links: crosswalk source name and its source_key -> player_id map.
+        """
+        self.source = source
+        self.links: dict[str, str] = dict(links or {})
+        self.new_links: dict[str, tuple[str, str]] = {}
+        self.by_name: dict[str, str] = {}
+        self.by_name_pos: dict[tuple, str] = {}
+        self.by_name_pos_team: dict[tuple, str] = {}
+        self.fuzzy: dict[str, list[str]] = {}
+        self.fuzzy_pos: dict[tuple, list[str]] = {}
+        self.team_of: dict[str, str | None] = {}
+        self.stats: Counter = Counter()
+        self._norm_rows: list[tuple] = []
+        self._frames: dict[tuple, object] = {}
+        for pid, name, pos, team in rows:
+            n, p, t = norm_space(name), norm_pos(pos), norm_team(team)
+            self._norm_rows.append((pid, n, p, t))
+            # first row wins, same as the old query(...).first()
+            self.by_name.setdefault(n, pid)
+            self.by_name_pos.setdefault((n, p), pid)
+            self.by_name_pos_team.setdefault((n, p, t), pid)
+            fk = fuzzy_name_key(n)
+            if fk:
+                self.fuzzy.setdefault(fk, []).append(pid)
+                self.fuzzy_pos.setdefault((fk, p), []).append(pid)
+            self.team_of[pid] = t
+
+    @classmethod
+    def from_db(cls, db: Session, source: str | None = None) -> "PlayerResolver":
+        P, X = models.Player, models.PlayerCrosswalk
+        links = None
+        if source:
+            links = dict(db.query(X.source_key, X.player_id).filter(X.source == source).all())
+        return cls(db.query(P.player_id, P.clean_name, P.position, P.team).all(), source, links)
+
+    @classmethod
+    def for_names(cls, db: Session, names) -> "PlayerResolver":
+        """
+        Resolver over just the players whose clean_name is one of `names` --
+        a few rows instead of the whole table when the input already uses our
+        spelling. Exact tiers only (no crosswalk): a fuzzy hit inside a subset
+        could be ambiguous in the full table, so leftovers go to from_db().
+        """
+        P = models.Player
+        wanted = sorted({n for n in map(norm_space, names) if n})
+        rows = []
+        for chunk in chunked(wanted):
+            rows += db.query(P.player_id, P.clean_name, P.position, P.team).filter(P.clean_name.in_(chunk)).all()
+        r = cls(rows)
+        r.fuzzy.clear(); r.fuzzy_pos.clear()
+        return r
+
+    def _pick_unique(self, candidates: list[str] | None, team: str | None) -> str | None:
+        if not candidates:
+            return None
+        if len(candidates) > 1 and team:
+            candidates = [c for c in candidates if self.team_of.get(c) == team]
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _resolve(self, name, pos, team, name_only_fallback) -> tuple[str | None, str]:
+        if pos and team:
+            pid = self.by_name_pos_team.get((name, pos, team))
+            if pid: return pid, "name_pos_team"
+        if pos:
+            pid = self.by_name_pos.get((name, pos))
+            if pid: return pid, "name_pos"
+        allow_name_only = name_only_fallback or not pos
+        if allow_name_only:
+            pid = self.by_name.get(name)
+            if pid: return pid, "name"
+        return self._resolve_fuzzy(name, pos, team, allow_name_only)
+
+    def _resolve_fuzzy(self, name, pos, team, allow_name_only) -> tuple[str | None, str]:
+        fk = fuzzy_name_key(name)
+        if fk:
+            if pos:
+                pid = self._pick_unique(self.fuzzy_pos.get((fk, pos)), team)
+                if pid: return pid, "fuzzy_pos"
+            if allow_name_only:
+                pid = self._pick_unique(self.fuzzy.get(fk), team)
+                if pid: return pid, "fuzzy"
+        return None, "unmatched"
+
+    def resolve(self, name, pos=None, team=None, name_only_fallback: bool = True,
+                site_id=None) -> str | None:
+        """
+        Return the matching player_id (or None) and count the tier used.
+        name_only_fallback=False keeps a row that carries a position from
+        matching on name alone (CBS injuries behaviour). site_id is the
+        source's own player id, used as the crosswalk key when present.
+        """
+        n, p, t = norm_space(name), norm_pos(pos), norm_team(team)
+        key = source_key(n, p, t, site_id) if self.source else None
+        if key is not None:
+            pid = self.links.get(key)
+            if pid and pid in self.team_of:
+                self.stats["crosswalk"] += 1
+                return pid
+        if not n:
+            self.stats["unmatched"] += 1
+            return None
+        pid, tier = self._resolve(n, p, t, name_only_fallback)
+        self.stats[tier] += 1
+        if pid and key is not None:
+            self.links[key] = pid
+            self.new_links[key] = (pid, tier)
+        return pid
+
+    # --- whole-frame matching (CSV importers) --------------------------------
+
+    def _player_frame(self, keys: tuple):
+        """Normalized players, first row per key kept (same as the dict tiers)."""
+        if keys not in self._frames:
+            import pandas as pd
+            frame = pd.DataFrame(self._norm_rows, columns=["player_id", "name", "pos", "team"])
+            frame[["name", "pos", "team"]] = frame[["name", "pos", "team"]].astype("string")
+            self._frames[keys] = frame.drop_duplicates(list(keys), keep="first")[[*keys, "player_id"]]
+        return self._frames[keys]
+
+    def _merge_tier(self, q, rows, keys: tuple):
+        left = q.loc[rows, list(keys)].reset_index()
+        idx_col = left.columns[0]
+        merged = left.merge(self._player_frame(keys), on=list(keys), how="left")
+        return merged.set_index(idx_col)["player_id"].dropna()
+
+    def match_frame(self, df, name_col="name", pos_col="pos", team_col="team",
+                    site_col: str | None = None, name_only_fallback: bool = True):
+        """
+        Vectorized resolve() for a frame whose name/pos/team columns are already
+        cleaned (ingest.frames). Exact tiers are merges against the player
+        frame; only rows left over after them go through the fuzzy index.
+        Returns a frame aligned to df.index with player_id and tier columns.
+        """
+        import pandas as pd
+        q = pd.DataFrame({
+            "name": df[name_col].astype("string"),
+            "pos": df[pos_col].astype("string"),
+            "team": df[team_col].astype("string"),
+        }, index=df.index)
+        out = pd.DataFrame({"player_id": pd.Series(None, index=q.index, dtype="object"),
+                            "tier": "unmatched"}, index=q.index)
+
+        def assign(found, tier):
+            out.loc[found.index, "player_id"] = found.values
+            out.loc[found.index, "tier"] = tier
+
+        keys = None
+        if self.source:
+            site = df[site_col].astype("string") if site_col else pd.Series(pd.NA, index=q.index, dtype="string")
+            keys = ("id:" + site.str.strip()).where(site.notna() & (site.str.strip() != ""))
+            keys = keys.fillna(q["name"].fillna("") + "|" + q["pos"].fillna("") + "|" + q["team"].fillna(""))
+            hit = keys.map(self.links)
+            hit = hit[hit.isin(list(self.team_of))]
+            assign(hit, "crosswalk")
+
+        has_name = q["name"].notna()
+
+        def todo():
+            return out["player_id"].isna() & has_name
+
+        assign(self._merge_tier(q, todo() & q["pos"].notna() & q["team"].notna(), ("name", "pos", "team")), "name_pos_team")
+        assign(self._merge_tier(q, todo() & q["pos"].notna(), ("name", "pos")), "name_pos")
+        allow_name_only = pd.Series(name_only_fallback, index=q.index) | q["pos"].isna()
+        assign(self._merge_tier(q, todo() & allow_name_only, ("name",)), "name")
+
+        # fuzzy tiers: only the (usually few) rows the exact merges missed
+        for i in out.index[todo()]:
+            n, p, t = q.at[i, "name"], q.at[i, "pos"], q.at[i, "team"]
+            p = None if pd.isna(p) else p
+            t = None if pd.isna(t) else t
+            pid, tier = self._resolve_fuzzy(n, p, t, bool(allow_name_only.at[i]))
+            if pid:
+                out.at[i, "player_id"], out.at[i, "tier"] = pid, tier
+
+        self.stats.update(out["tier"].value_counts().to_dict())
+        if keys is not None:
+            fresh = out["player_id"].notna() & (out["tier"] != "crosswalk")
+            for k, pid, tier in zip(keys[fresh], out.loc[fresh, "player_id"], out.loc[fresh, "tier"]):
+                self.links[k] = pid
+                self.new_links[k] = (pid, tier)
+        return out
+
+    def flush(self, db: Session) -> int:
+        """Persist fresh matches to the crosswalk (does not commit)."""
+        if not self.source or not self.new_links:
+            return 0
+        rows = [
+            {"source": self.source, "source_key": k, "player_id": pid, "method": tier}
+            for k, (pid, tier) in self.new_links.items()
+        ]
+        # a link that reappears with a different player means the old one went stale
+        bulk_upsert(db, models.PlayerCrosswalk, rows, key_cols=["source", "source_key"],
+                    update_cols=["player_id", "method"])
+        n = len(rows)
+        self.new_links = {}
+        return n
+
+    def summary(self) -> dict:
+        return {tier: self.stats.get(tier, 0) for tier in TIERS}
+
+    def crosswalk_summary(self) -> dict:
+        hits = self.stats.get("crosswalk", 0)
+        fresh = sum(self.stats.get(t, 0) for t in TIERS if t not in ("crosswalk", "unmatched"))
+        return {"hits": hits, "fresh": fresh}
+
+
+def record_site_ids(db: Session, column: str, pairs: dict[str, str]) -> int:
+    """Fill e.g. players.fp_id for matched players that don't have one yet."""
+    if not pairs:
+        return 0
+    t = models.Player.__table__
+    stmt = (
+        update(t)
+        .where(t.c.player_id == bindparam("pid"), t.c[column].is_(None))
+        .values({column: bindparam("val")})
+    )
+    db.execute(stmt, [{"pid": pid, "val": sid} for pid, sid in pairs.items()])
+    return len(pairs)
@@ -0,0 +1,79 @@
+# backend/ingest/runs.py
+"""
+ImportRun bookkeeping shared by every source: one row per import with its
+outcome, row counts and how long the fetch / parse / write phases took.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy.orm import Session
+from .. import models
+
+PHASES = ("fetch", "parse", "write")
+
+def get_or_create_source(db: Session, name: str, kind: str):
+    s = db.query(models.Source).filter_by(name=name).first()
+    if not s:
+        s = models.Source(name=name, kind=kind)
+        db.add(s); db.commit(); db.refresh(s)
+    return s
+
+class RunTracker:
+    """Creates the ImportRun up front (committed) and fills it in at the end."""
+
+    def __init__(self, db: Session, source: str, kind: str):
+        self.db = db
+        src = get_or_create_source(db, source, kind)
+        self.run = models.ImportRun(source_id=src.source_id)
+        db.add(self.run); db.commit(); db.refresh(self.run)
+        self.ms = dict.fromkeys(PHASES, None)
+        self._t0 = time.perf_counter()
+
+    @property
+    def run_id(self) -> int:
+        return self.run.run_id
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ms[name] = (self.ms[name] or 0.0) + (time.perf_counter() - t0) * 1000.0
+
+    def timings(self) -> dict:
+        out = {f"{k}_ms": round(v, 1) for k, v in self.ms.items() if v is not None}
+        out["elapsed_ms"] = round((time.perf_counter() - self._t0) * 1000.0, 1)
+        return out
+
+    def _close(self):
+        r = self.run
+        r.finished_at = datetime.utcnow()
+        r.fetch_ms, r.parse_ms, r.write_ms = (self.ms[p] for p in PHASES)
+        r.elapsed_ms = (time.perf_counter() - self._t0) * 1000.0
+        self.db.commit()
+
+    def last_success_hash(self) -> str | None:
+        """content_hash of this source's previous successful run."""
+        I = models.ImportRun
+        row = self.db.query(I.content_hash).filter(
+            I.source_id == self.run.source_id, I.success.is_(True), I.run_id != self.run.run_id,
+        ).order_by(I.run_id.desc()).first()
+        return row[0] if row else None
+
+    def finish(self, result: dict, content_hash: str | None = None):
+        """Record an importer's result dict (errors -> success=False)."""
+        r = self.run
+        r.content_hash = content_hash
+        errors = result.get("errors") or []
+        r.success = not errors
+        r.row_count = int(result.get("imported") or 0)
+        r.error_text = "; ".join(map(str, errors)) or None
+        r.inserted, r.updated, r.unchanged = (result.get(k) for k in ("inserted", "updated", "unchanged"))
+        self._close()
+
+    def fail(self, error: Exception | str):
+        self.db.rollback()
+        self.run.success = False
+        self.run.error_text = str(error)
+        self._close()
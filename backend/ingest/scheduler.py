@@ -0,0 +1,67 @@
+# backend/ingest/scheduler.py
+"""
+Periodic injury refresh for draft day.
+
+Every `interval` seconds the CBS injuries job is submitted to the job runner
+with max_age=0, so each tick is one conditional GET: an unchanged page stops
+right after the fetch, a changed one is diffed against the stored rows and
+only the differences are written (see injuries_cbs.write_injuries). Ticks
+never overlap -- the next wait starts once the previous job has finished.
+"""
+import asyncio
+import time
+from ..config.settings import settings
+from .jobs import runner
+
+SOURCE = "injuries_cbs"
+MIN_INTERVAL = 15
+
+
+class InjuryScheduler:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self.season: int | None = None
+        self.interval: int | None = None
+        self.started_at: float | None = None
+        self.ticks = 0
+        self.last_job_id: str | None = None
+        self.last_changes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, season: int, interval: int | None = None):
+        """(Re)start on the running event loop; replaces a loop already going."""
+        self.stop()
+        self.season = season
+        self.interval = max(MIN_INTERVAL, interval or settings.injury_refresh_seconds)
+        self.started_at, self.ticks = time.time(), 0
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    def stop(self) -> bool:
+        if not self.running:
+            return False
+        self._task.cancel()
+        self._task = None
+        return True
+
+    async def _loop(self):
+        while True:
+            job = runner.submit(SOURCE, {"season": self.season, "max_age": 0})
+            self.last_job_id = job.id
+            await runner.wait(job)
+            self.ticks += 1
+            self.last_changes = len((job.result or {}).get("changes") or [])
+            await asyncio.sleep(self.interval)
+
+    def status(self) -> dict:
+        last = runner.get(self.last_job_id) if self.last_job_id else None
+        return {
+            "running": self.running, "season": self.season, "interval": self.interval,
+            "started_at": self.started_at, "ticks": self.ticks, "last_changes": self.last_changes,
+            "last_job": last.to_dict() if last else None,
+        }
+
+
+injuries = InjuryScheduler()
@@ -1,40 +1,30 @@
 import pandas as pd
 from sqlalchemy.orm import Session
 from ... import models
+from ..adp_consensus import CONSENSUS, aggregate_adp
+from ..bulk import bulk_upsert
+from ..frames import clean_float, clean_int, clean_text, clean_pos, clean_team, col_or_na, to_records
+from ..resolver import PlayerResolver
+from .fantasypros_ecr import fp_id_col, fp_site_ids, finish_fp_matching
 
-def _clean_float(val):
-    # Treat NaN / empty / dash as None; otherwise cast to float
-    if val is None:
-        return None
-    s = str(val).strip()
-    if s == "" or s == "-":
-        return None
-    try:
-        if pd.isna(val):
-            return None
-    except Exception:
-        pass
-    try:
-        return float(s)
-    except Exception:
-        return None
-
-def _upsert_adp(db: Session, season: int, player_id: str, source: str, adp, rank, sample_size=None):
-    row = db.query(models.ADP).filter_by(season=season, player_id=player_id, source=source).first()
-    if not row:
-        row = models.ADP(season=season, player_id=player_id, source=source)
-        db.add(row)
-    adp_clean = _clean_float(adp)
-    rank_clean = _clean_float(rank)
-    row.adp = adp_clean if adp_clean is not None else row.adp
-    row.rank = rank_clean if rank_clean is not None else row.rank
-    if hasattr(row, "sample_size") and sample_size is not None:
-        try:
-            row.sample_size = int(sample_size)
-        except Exception:
-            pass
+def _write_adp(db: Session, season: int, source: str, vals: pd.DataFrame) -> None:
+    """
+    Bulk upsert (player_id, adp, rank, sample_size). NULLs never overwrite a
+    stored value; duplicates collapse to the last non-null value per column.
+    """
+    if vals.empty:
+        return
+    agg = vals.groupby("player_id", sort=False)[["adp", "rank", "sample_size"]].last().reset_index()
+    agg["season"] = season
+    agg["source"] = source
+    bulk_upsert(
+        db, models.ADP, to_records(agg),
+        key_cols=["season", "player_id", "source"],
+        update_cols=["adp", "rank", "sample_size"],
+        coalesce_cols=("adp", "rank", "sample_size"),
+    )
 
-def import_fp_adp_csv(db: Session, season: int, csv_path: str, source_name="fp_composite") -> dict:
+def adp_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
     Expected CSV headers (flexible):
       - Player / Name
@@ -43,9 +33,8 @@ def import_fp_adp_csv(db: Session, season: int, csv_path: str, source_name="fp_c
       - ADP (or any column with 'adp' in its name)
       - Rank (optional)
       - 'N' or 'Times Drafted' (optional sample size)
+    Raises ValueError when Player/ADP are missing.
     """
-    df = pd.read_csv(csv_path)
-
     def find_col(pred):
         for c in df.columns:
             if pred(c):
@@ -58,36 +47,49 @@ def import_fp_adp_csv(db: Session, season: int, csv_path: str, source_name="fp_c
     pos_col  = find_col(lambda c: c.lower() in ("pos", "position"))
     rank_col = find_col(lambda c: "rank" in c.lower())
     n_col    = find_col(lambda c: c.lower() in ("n", "times drafted", "drafts"))
+    id_col   = fp_id_col(df)
 
     if not (name_col and adp_col):
-        return {"imported": 0, "errors": ["CSV missing Player/ADP columns"]}
-
-    count = 0
-    for _, r in df.iterrows():
-        name = str(r[name_col]).strip()
-        if not name:
-            continue
-        team = str(r.get(team_col) or "").strip() or None
-        pos  = str(r.get(pos_col) or "").strip() or None
-        adp  = r.get(adp_col)
-        rank = r.get(rank_col)
-        n    = r.get(n_col)
+        raise ValueError("CSV missing Player/ADP columns")
 
-        # Match by name; refine with pos/team if available
-        q = db.query(models.Player).filter(models.Player.clean_name == name)
-        if pos:
-            q = q.filter(models.Player.position == pos)
-        if team:
-            q = q.filter(models.Player.team == team)
-        p = q.first()
-        if not p:
-            # If strict match fails, try name-only fallback (still may be wrong, but better coverage)
-            p = db.query(models.Player).filter(models.Player.clean_name == name).first()
-        if not p:
-            continue
+    frame = pd.DataFrame({
+        "name": clean_text(df[name_col]),
+        "team": clean_team(col_or_na(df, team_col)),
+        "pos": clean_pos(col_or_na(df, pos_col)),
+        "adp": clean_float(df[adp_col]),
+        "rank": clean_float(col_or_na(df, rank_col)),
+        "sample_size": clean_int(col_or_na(df, n_col)),
+    }, index=df.index)
+    frame = frame[frame["name"].notna()]
+    if id_col:
+        frame["fp_id"] = fp_site_ids(df.loc[frame.index, id_col])
+    return frame
 
-        _upsert_adp(db, season, p.player_id, source_name, adp, rank, n)
-        count += 1
+def write_adp_frame(db: Session, season: int, frame: pd.DataFrame, source_name="fp_composite") -> dict:
+    if source_name == CONSENSUS:
+        return {"imported": 0, "errors": [f"ADP source '{CONSENSUS}' is derived; import under another name"]}
+    has_ids = "fp_id" in frame.columns
+    # Match by name; refine with pos/team if available, name-only fallback
+    resolver = PlayerResolver.from_db(db, source="fantasypros")
+    m = resolver.match_frame(frame, site_col="fp_id" if has_ids else None)
+    hit = m["player_id"].notna()
 
+    _write_adp(db, season, source_name,
+               frame.loc[hit, ["adp", "rank", "sample_size"]].assign(player_id=m.loc[hit, "player_id"]))
+    fp_ids = {}
+    if has_ids:
+        ids = frame.loc[hit, "fp_id"]
+        fp_ids = dict(zip(m.loc[hit, "player_id"][ids.notna()], ids[ids.notna()]))
+    crosswalk = finish_fp_matching(db, resolver, fp_ids)
+    consensus = aggregate_adp(db, season)
     db.commit()
-    return {"imported": count, "errors": []}
+    return {"imported": int(hit.sum()), "match_tiers": resolver.summary(), "crosswalk": crosswalk,
+            "consensus": consensus, "errors": []}
+
+def import_fp_adp_csv(db: Session, season: int, csv_path: str, source_name="fp_composite") -> dict:
+    """FantasyPros ADP CSV from a local path; see adp_frame for the headers."""
+    try:
+        frame = adp_frame(pd.read_csv(csv_path))
+    except ValueError as e:
+        return {"imported": 0, "errors": [str(e)]}
+    return write_adp_frame(db, season, frame, source_name)
@@ -1,68 +1,22 @@
 # backend/ingest/sources/fantasypros_ecr.py
 import io
 import re
-import unicodedata
 import urllib.parse as up
 import pandas as pd
 import httpx
-from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 from ... import models
+from ..normalize import TEAM_MAP, norm_space, norm_pos, norm_team  # noqa: F401 (re-exported)
+from ..resolver import PlayerResolver, record_site_ids
+from ..bulk import bulk_upsert
+from ..html_tables import iter_rows
+from ..frames import clean_float, clean_int, clean_text, clean_pos, clean_team, col_or_na, to_records
 
 _UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 )
-
-# --- Normalizers -------------------------------------------------------------
-
-TEAM_MAP = {
-    # common cross-site differences
-    "JAX": "JAC",
-    "WSH": "WAS",
-    "LA": "LAR",     # sometimes appears for Rams
-    "STL": "LAR",    # old Rams
-    "SD": "LAC",     # old Chargers
-    "OAK": "LV",     # old Raiders
-    "TB": "TB",      # normalize anyway
-    "NO": "NO",      # Saints sometimes "NOR" → keep as "NO" since Sleeper uses "NO"
-    "NOR": "NO",
-    "NEP": "NE",
-    "GBP": "GB",
-    "SFO": "SF",
-    "KCC": "KC",
-    "JAC": "JAC",    # idempotent
-    "WAS": "WAS",
-    "LV": "LV",
-    "LAC": "LAC",
-    "LAR": "LAR",
-    "SF": "SF",
-    "KC": "KC",
-    "GB": "GB",
-    "NE": "NE",
-}
-
-def norm_space(s: str | None) -> str | None:
-    if s is None:
-        return None
-    # collapse weird spaces/diacritics
-    s = unicodedata.normalize("NFKC", str(s))
-    s = s.replace("\xa0", " ").strip()
-    return re.sub(r"\s+", " ", s)
-
-def norm_pos(pos: str | None) -> str | None:
-    if not pos:
-        return None
-    p = norm_space(pos).upper()
-    if p in ("DST", "D/ST", "D-ST", "DEFENSE"):
-        return "DEF"
-    return p
-
-def norm_team(team: str | None) -> str | None:
-    if not team:
-        return None
-    t = norm_space(team).upper()
-    return TEAM_MAP.get(t, t)
+_HTML_HEADERS = {"User-Agent": _UA, "Accept": "text/html,application/xhtml+xml"}
 
 def _clean_float(val):
     if val is None:
@@ -80,30 +34,26 @@ def _clean_float(val):
     except Exception:
         return None
 
-def _clean_int(val):
-    f = _clean_float(val)
-    try:
-        return int(f) if f is not None else None
-    except Exception:
-        return None
-
 # --- Write helpers -----------------------------------------------------------
 
-def _ensure_consensus_row(db: Session, season: int, player_id: str, ecr_rank, ecr_pos_rank, tier, source="fantasypros"):
-    cr = db.query(models.ConsensusRank).filter_by(season=season, player_id=player_id).first()
-    if not cr:
-        cr = models.ConsensusRank(season=season, player_id=player_id)
-        db.add(cr)
-    ecr_clean  = _clean_float(ecr_rank)
-    epos_clean = _clean_float(ecr_pos_rank)
-    tier_clean = _clean_int(tier)
-    if ecr_clean is not None:
-        cr.ecr_rank = ecr_clean
-    if epos_clean is not None:
-        cr.ecr_pos_rank = epos_clean
-    if tier_clean is not None:
-        cr.tier = tier_clean
-    cr.source = source
+def _write_consensus(db: Session, season: int, vals: pd.DataFrame, source="fantasypros") -> None:
+    """
+    Bulk upsert matched rows (player_id, ecr_rank, ecr_pos_rank, tier) into
+    consensus_ranks. Incoming NULLs keep the stored value, and for a player
+    matched by several rows the last non-null value per column wins -- the
+    same outcome as updating row by row.
+    """
+    if vals.empty:
+        return
+    agg = vals.groupby("player_id", sort=False)[["ecr_rank", "ecr_pos_rank", "tier"]].last().reset_index()
+    agg["season"] = season
+    agg["source"] = source
+    bulk_upsert(
+        db, models.ConsensusRank, to_records(agg),
+        key_cols=["season", "player_id"],
+        update_cols=["ecr_rank", "ecr_pos_rank", "tier", "source"],
+        coalesce_cols=("ecr_rank", "ecr_pos_rank", "tier"),
+    )
 
 # --- CSV/HTML detection ------------------------------------------------------
 
@@ -121,73 +71,91 @@ def _detect_cols(df: pd.DataFrame):
     tier_col = find_col(lambda c: "tier" in c.lower())
     return name_col, team_col, pos_col, ecr_col, posr_col, tier_col
 
-# --- Matching logic ----------------------------------------------------------
-
-def _match_player(db: Session, name: str, pos: str | None, team: str | None):
-    P = models.Player
-    # 1) name + pos + team
-    if pos and team:
-        p = db.query(P).filter(
-            P.clean_name == name,
-            P.position == pos,
-            P.team == team
-        ).first()
-        if p: return p
-    # 2) name + pos
-    if pos:
-        p = db.query(P).filter(
-            P.clean_name == name,
-            P.position == pos
-        ).first()
-        if p: return p
-    # 3) name only
-    p = db.query(P).filter(P.clean_name == name).first()
-    return p
+FP_ID_COLUMNS = ("player id", "player_id", "playerid", "fp_id", "fpid", "fantasypros_id")
 
-def _ingest_ecr_df(db: Session, season: int, df: pd.DataFrame) -> dict:
-    name_col, team_col, pos_col, ecr_col, posr_col, tier_col = _detect_cols(df)
-    if not name_col:
-        return {"imported": 0, "matched": 0, "unmatched": 0, "unmatched_examples": [], "errors": ["CSV missing 'Player'/'Name' column"]}
-
-    total_rows = 0
-    matched = 0
-    unmatched_examples = []
-
-    for _, r in df.iterrows():
-        raw_name = r[name_col]
-        if pd.isna(raw_name):
-            continue
-        total_rows += 1
-
-        name = norm_space(raw_name)
-        team = norm_team(r.get(team_col) or r.get("team") or None)
-        pos  = norm_pos(r.get(pos_col) or r.get("Position") or None)
-
-        ecr = r.get(ecr_col)
-        pos_rank = r.get(posr_col)
-        tier = r.get(tier_col)
+def fp_id_col(df: pd.DataFrame):
+    """FantasyPros' own player id column, when the export carries one."""
+    for c in df.columns:
+        if str(c).strip().lower() in FP_ID_COLUMNS:
+            return c
+    return None
 
-        p = _match_player(db, name, pos, team)
-        if not p:
-            if len(unmatched_examples) < 12:
-                unmatched_examples.append({
-                    "name": name, "pos": pos, "team": team,
-                    "hint": "Check Sleeper import & team/pos normalization"
-                })
-            continue
+def fp_site_ids(s: pd.Series) -> pd.Series:
+    """FP ids as strings ('1234', not '1234.0'); blanks -> NA."""
+    as_int = clean_int(s)
+    return as_int.astype("string").fillna(clean_text(s))
 
-        _ensure_consensus_row(db, season, p.player_id, ecr, pos_rank, tier)
-        matched += 1
+def finish_fp_matching(db: Session, resolver: PlayerResolver, fp_ids: dict[str, str]) -> dict:
+    """Persist new crosswalk links / fp_ids before the importer commits."""
+    linked = resolver.flush(db)
+    record_site_ids(db, "fp_id", fp_ids)
+    return {**resolver.crosswalk_summary(), "linked": linked}
 
+def write_ecr_frame(db: Session, season: int, frame: pd.DataFrame, site_col: str | None = None) -> dict:
+    """
+    frame: cleaned columns name, team, pos, ecr_rank, ecr_pos_rank, tier
+    (+ optional FP id column). Matches every row against the players table
+    in one pass and writes the result with a single bulk upsert.
+    """
+    frame = frame[frame["name"].notna()]
+    resolver = PlayerResolver.from_db(db, source="fantasypros")
+    m = resolver.match_frame(frame, site_col=site_col)
+    hit = m["player_id"].notna()
+
+    vals = frame.loc[hit, ["ecr_rank", "ecr_pos_rank", "tier"]].assign(player_id=m.loc[hit, "player_id"])
+    _write_consensus(db, season, vals)
+    fp_ids = {}
+    if site_col:
+        ids = frame.loc[hit, site_col]
+        fp_ids = dict(zip(m.loc[hit, "player_id"][ids.notna()], ids[ids.notna()]))
+    crosswalk = finish_fp_matching(db, resolver, fp_ids)
     db.commit()
+
+    missed = frame.loc[~hit, ["name", "pos", "team"]].head(12)
+    unmatched_examples = [
+        {**r, "hint": "Check Sleeper import & team/pos normalization"} for r in to_records(missed)
+    ]
+    matched = int(hit.sum())
     return {
         "imported": matched,
         "matched": matched,
-        "unmatched": max(0, total_rows - matched),
+        "unmatched": max(0, len(frame) - matched),
         "unmatched_examples": unmatched_examples,
+        "match_tiers": resolver.summary(),
+        "crosswalk": crosswalk,
         "errors": [],
     }
 
+def _no_rows(error: str) -> dict:
+    return {"imported": 0, "matched": 0, "unmatched": 0, "unmatched_examples": [], "errors": [error]}
+
+def ecr_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, str | None]:
+    """Cleaned ECR frame from a rankings CSV, plus its FP id column (ValueError if unusable)."""
+    name_col, team_col, pos_col, ecr_col, posr_col, tier_col = _detect_cols(df)
+    id_col = fp_id_col(df)
+    if not name_col:
+        raise ValueError("CSV missing 'Player'/'Name' column")
+
+    frame = pd.DataFrame({
+        "name": clean_text(df[name_col]),
+        # same fallbacks the per-row loop used when the detected column is blank
+        "team": clean_team(col_or_na(df, team_col)).fillna(clean_team(col_or_na(df, "team"))),
+        "pos": clean_pos(col_or_na(df, pos_col)).fillna(clean_pos(col_or_na(df, "Position"))),
+        "ecr_rank": clean_float(col_or_na(df, ecr_col)),
+        "ecr_pos_rank": clean_float(col_or_na(df, posr_col)),
+        "tier": clean_int(col_or_na(df, tier_col)),
+    }, index=df.index)
+    if id_col:
+        frame["fp_id"] = fp_site_ids(df[id_col])
+    return frame, "fp_id" if id_col else None
+
+def _ingest_ecr_df(db: Session, season: int, df: pd.DataFrame) -> dict:
+    try:
+        frame, site_col = ecr_frame(df)
+    except ValueError as e:
+        return _no_rows(str(e))
+    return write_ecr_frame(db, season, frame, site_col)
+
 # --- Public entry points -----------------------------------------------------
 
 def import_fp_csv(db: Session, season: int, csv_path: str) -> dict:
@@ -195,109 +163,105 @@ def import_fp_csv(db: Session, season: int, csv_path: str) -> dict:
     df = pd.read_csv(csv_path)
     return _ingest_ecr_df(db, season, df)
 
-def _try_csv_from_url(client: httpx.Client, url: str) -> bytes | None:
+def _csv_candidates(url: str) -> list[str]:
     """
-    Try to coerce a FantasyPros rankings URL into a CSV download.
-    We attempt:
+    Ways to coerce a FantasyPros rankings URL into a CSV download:
       - original URL as-is (in case it already returns CSV)
       - add `csv=1`
       - add `export=csv`
     """
-    def _fetch(u):
+    out = [url]
+    for extra in (("csv", "1"), ("export", "csv")):
+        p = up.urlparse(url)
+        q = up.parse_qsl(p.query, keep_blank_values=True)
+        if extra not in q:
+            q.append(extra)
+        out.append(up.urlunparse(p._replace(query=up.urlencode(q))))
+    return out
+
+def _looks_like_csv(r: httpx.Response) -> bool:
+    return r.status_code == 200 and r.text.count(",") > 10
+
+def _try_csv_from_url(client: httpx.Client, url: str) -> bytes | None:
+    for u in _csv_candidates(url):
         r = client.get(u, headers={"User-Agent": _UA})
-        if r.status_code == 200 and r.text.count(",") > 10:
+        if _looks_like_csv(r):
             return r.content
-        return None
-
-    content = _fetch(url)
-    if content:
-        return content
+    return None
 
-    p = up.urlparse(url)
-    q = up.parse_qsl(p.query, keep_blank_values=True)
-    if ("csv", "1") not in q:
-        q.append(("csv", "1"))
-    url_csv = up.urlunparse(p._replace(query=up.urlencode(q)))
-    content = _fetch(url_csv)
-    if content:
-        return content
+async def fetch_csv(client: httpx.AsyncClient, url: str) -> bytes | None:
+    """Async twin of _try_csv_from_url for the job runner."""
+    for u in _csv_candidates(url):
+        r = await client.get(u, headers={"User-Agent": _UA})
+        if _looks_like_csv(r):
+            return r.content
+    return None
 
-    p = up.urlparse(url)
-    q = up.parse_qsl(p.query, keep_blank_values=True)
-    if ("export", "csv") not in q:
-        q.append(("export", "csv"))
-    url_export = up.urlunparse(p._replace(query=up.urlencode(q)))
-    content = _fetch(url_export)
-    if content:
-        return content
+async def fetch_html(client: httpx.AsyncClient, url: str) -> str:
+    r = await client.get(url, headers=_HTML_HEADERS)
+    return r.text
 
-    return None
+def parse_csv_bytes(content: bytes) -> tuple[pd.DataFrame, str | None]:
+    try:
+        df = pd.read_csv(io.BytesIO(content))
+    except Exception as e:
+        raise ValueError(f"CSV parse failed: {e}")
+    return ecr_frame(df)
 
 def import_fp_csv_from_url(db: Session, season: int, url: str) -> dict:
     with httpx.Client(timeout=60, follow_redirects=True) as client:
         content = _try_csv_from_url(client, url)
-        if not content:
-            return {"imported": 0, "matched": 0, "unmatched": 0, "unmatched_examples": [], "errors": [f"No CSV available at {url}"]}
-        try:
-            df = pd.read_csv(io.BytesIO(content))
-        except Exception as e:
-            return {"imported": 0, "matched": 0, "unmatched": 0, "unmatched_examples": [], "errors": [f"CSV parse failed: {e}"]}
-    return _ingest_ecr_df(db, season, df)
-
-def import_fp_overall_html(db: Session, season: int, url: str) -> dict:
-    headers = {"User-Agent": _UA, "Accept": "text/html,application/xhtml+xml"}
-    with httpx.Client(timeout=60, follow_redirects=True, headers=headers) as client:
-        html = client.get(url).text
-
-    soup = BeautifulSoup(html, "lxml")
-    table = soup.find("table")
-    if not table:
-        return {"imported": 0, "matched": 0, "unmatched": 0, "unmatched_examples": [], "errors": ["No table found (page may be JS-rendered). Try CSV mode."]}
-
-    total_rows = 0
-    matched = 0
-    unmatched_examples = []
-
-    rows = table.find_all("tr")
-    for tr in rows:
-        cols = [c.get_text(strip=True) for c in tr.find_all(["td", "th"])]
+    if not content:
+        return _no_rows(f"No CSV available at {url}")
+    try:
+        frame, site_col = parse_csv_bytes(content)
+    except ValueError as e:
+        return _no_rows(str(e))
+    return write_ecr_frame(db, season, frame, site_col)
+
+def parse_overall_html(html: str) -> pd.DataFrame:
+    """Cleaned ECR frame from the first table on the rankings page (ValueError if it has no rows)."""
+    parsed = []
+    for cols in iter_rows(html, max_tables=1):
         if len(cols) < 4:
             continue
         rank = _clean_float(cols[0])
         if rank is None:
             continue
-
-        total_rows += 1
-        name = norm_space(cols[1])
-        team = norm_team(cols[2] if len(cols) > 2 else None)
-        pos = norm_pos(cols[3] if len(cols) > 3 else None)
         tier = None
         for c in cols:
-            if isinstance(c, str) and c.lower().startswith("tier"):
+            if c.lower().startswith("tier"):
                 m = re.search(r"(\d+)", c)
                 if m:
                     tier = int(m.group(1))
+        parsed.append((cols[1], cols[2], cols[3], rank, tier))
+    if not parsed:
+        raise ValueError("No ranking table found (page may be JS-rendered). Try CSV mode.")
+
+    raw = pd.DataFrame(parsed, columns=["name", "team", "pos", "ecr_rank", "tier"])
+    return pd.DataFrame({
+        "name": clean_text(raw["name"]),
+        "team": clean_team(raw["team"]),
+        "pos": clean_pos(raw["pos"]),
+        "ecr_rank": raw["ecr_rank"].astype(float),
+        "ecr_pos_rank": pd.Series(float("nan"), index=raw.index),
+        "tier": raw["tier"].astype("Int64"),
+    })
 
-        p = _match_player(db, name, pos, team)
-        if not p:
-            if len(unmatched_examples) < 12:
-                unmatched_examples.append({"name": name, "pos": pos, "team": team})
-            continue
-
-        _ensure_consensus_row(db, season, p.player_id, rank, None, tier)
-        matched += 1
+def import_fp_overall_html(db: Session, season: int, url: str) -> dict:
+    with httpx.Client(timeout=60, follow_redirects=True, headers=_HTML_HEADERS) as client:
+        html = client.get(url).text
+    try:
+        frame = parse_overall_html(html)
+    except ValueError as e:
+        return _no_rows(str(e))
+    return write_ecr_frame(db, season, frame)
 
-    db.commit()
-    return {
-        "imported": matched,
-        "matched": matched,
-        "unmatched": max(0, total_rows - matched),
-        "unmatched_examples": unmatched_examples,
-        "errors": [],
-    }
+def is_url(path_or_url: str) -> bool:
+    return bool(re.match(r"^https?://", path_or_url, re.I))
 
 def import_fp_ecr_auto(db: Session, season: int, path_or_url: str) -> dict:
-    if re.match(r"^https?://", path_or_url, re.I):
+    if is_url(path_or_url):
         csv_res = import_fp_csv_from_url(db, season, path_or_url)
         if not csv_res["errors"] and csv_res["imported"] > 0:
             return csv_res
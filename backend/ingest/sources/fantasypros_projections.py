@@ -0,0 +1,161 @@
+import os
+import re
+import time
+from datetime import datetime
+import pandas as pd
+from sqlalchemy.orm import Session
+from ... import models
+from ..bulk import bulk_upsert
+from ..frames import clean_float, clean_text, clean_pos, clean_team, col_or_na, to_records
+from ..resolver import PlayerResolver
+from .fantasypros_ecr import fp_id_col, fp_site_ids, finish_fp_matching
+
+STAT_COLS = ["projected_points", "pass_yd", "pass_td", "pass_int", "rush_yd", "rush_td",
+             "rec_rec", "rec_yd", "rec_td", "fg", "xp"]
+
+# FantasyPros repeats YDS/TDS/ATT per stat group; pandas reads the repeats as
+# "YDS.1" etc., so each position's layout is a fixed header -> column map.
+HEADER_MAPS = {
+    "QB": {"YDS": "pass_yd", "TDS": "pass_td", "INTS": "pass_int",
+           "YDS.1": "rush_yd", "TDS.1": "rush_td", "FPTS": "projected_points"},
+    "RB": {"YDS": "rush_yd", "TDS": "rush_td", "REC": "rec_rec",
+           "YDS.1": "rec_yd", "TDS.1": "rec_td", "FPTS": "projected_points"},
+    "WR": {"REC": "rec_rec", "YDS": "rec_yd", "TDS": "rec_td",
+           "YDS.1": "rush_yd", "TDS.1": "rush_td", "FPTS": "projected_points"},
+    "TE": {"REC": "rec_rec", "YDS": "rec_yd", "TDS": "rec_td", "FPTS": "projected_points"},
+    "K":  {"FG": "fg", "XPT": "xp", "FPTS": "projected_points"},
+    "DEF": {"FPTS": "projected_points"},
+}
+
+_POS_IN_NAME = re.compile(r"(?:^|[^A-Z])(QB|RB|WR|TE|K|DST|DEF)(?:[^A-Z]|$)")
+
+def infer_position(path: str) -> str | None:
+    """'FantasyPros_Fantasy_Football_Projections_QB.csv' -> 'QB'."""
+    m = _POS_IN_NAME.search(os.path.splitext(os.path.basename(path))[0].upper())
+    if not m:
+        return None
+    return "DEF" if m.group(1) == "DST" else m.group(1)
+
+def _read(path: str) -> pd.DataFrame:
+    """Read one export; skips the PASSING/RUSHING group row some exports put above the header."""
+    df = pd.read_csv(path, dtype=str)
+    if not any(str(c).strip().upper() == "PLAYER" for c in df.columns):
+        df = pd.read_csv(path, dtype=str, header=1)
+    df.columns = [str(c).strip().upper() for c in df.columns]
+    return df
+
+def _stat(s: pd.Series) -> pd.Series:
+    return clean_float(s.str.replace(",", "", regex=False))
+
+def _projection_frame(df: pd.DataFrame, pos: str) -> pd.DataFrame:
+    """Cleaned name/team/pos + model stat columns for one position file."""
+    cols = {h: c for h, c in HEADER_MAPS.get(pos, {}).items() if h in df.columns}
+    # exports already using the model's own names pass straight through
+    cols.update({h: h.lower() for h in df.columns if h.lower() in STAT_COLS})
+    frame = pd.DataFrame({
+        "name": clean_text(col_or_na(df, "PLAYER")),
+        "team": clean_team(col_or_na(df, "TEAM")),
+        "pos": clean_pos(col_or_na(df, "POS").fillna(pos)),
+    }, index=df.index)
+    for c in STAT_COLS:
+        frame[c] = float("nan")
+    for h, c in cols.items():
+        frame[c] = _stat(df[h])
+    id_col = fp_id_col(df)
+    if id_col:
+        frame["fp_id"] = fp_site_ids(df[id_col])
+    return frame[frame["name"].notna()]
+
+def _write_projections(db: Session, season: int, source: str, vals: pd.DataFrame) -> int:
+    """One batched upsert for every position; a re-import replaces the stat line."""
+    if vals.empty:
+        return 0
+    rows = vals.drop_duplicates("player_id", keep="last")[["player_id", *STAT_COLS]]
+    rows = rows.assign(season=season, source=source)
+    return bulk_upsert(db, models.Projection, to_records(rows),
+                       key_cols=["season", "player_id", "source"], update_cols=STAT_COLS,
+                       extra_set={"asof_ts": datetime.utcnow()})
+
+def parse_projection_files(paths: list[str] | dict[str, str]) -> dict:
+    """
+    Read and clean every file. `paths` is a list of files whose names carry
+    the position, or a {position: path} dict. Returns the cleaned frames plus
+    per-file row counts / parse times and any per-file errors.
+    """
+    items = list(paths.items()) if isinstance(paths, dict) else [(infer_position(p), p) for p in paths]
+    files, frames, errors = [], [], []
+    for pos, path in items:
+        t0 = time.perf_counter()
+        pos = (pos or "").upper() or None
+        if pos not in HEADER_MAPS:
+            errors.append(f"{path}: cannot tell the position from the file name")
+            continue
+        if not os.path.exists(path):
+            errors.append(f"File not found: {path}")
+            continue
+        try:
+            frame = _projection_frame(_read(path), pos)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+            errors.append(f"{path}: {e}")
+            continue
+        frames.append(frame.assign(_file=len(files)))
+        files.append({"path": path, "pos": pos, "rows": len(frame),
+                      "parse_ms": round((time.perf_counter() - t0) * 1000.0, 1)})
+    return {"frames": frames, "files": files, "errors": errors}
+
+def split_paths(paths: list[str] | dict[str, str]) -> list:
+    """One `paths` value per file, for parsing the files in parallel."""
+    return [{pos: path} for pos, path in paths.items()] if isinstance(paths, dict) else [[p] for p in paths]
+
+def merge_parsed(parts: list[dict]) -> dict:
+    """parse_projection_files() results for separate files, as if parsed together."""
+    files, frames, errors = [], [], []
+    for part in parts:
+        frames += [f.assign(_file=f["_file"] + len(files)) for f in part["frames"]]
+        files += part["files"]
+        errors += part["errors"]
+    return {"frames": frames, "files": files, "errors": errors}
+
+def write_projection_files(db: Session, season: int, parsed: dict, source_name: str = "fp") -> dict:
+    """Match all parsed files in one resolver pass and write them in one transaction."""
+    frames, files, errors = parsed["frames"], parsed["files"], parsed["errors"]
+    if not frames:
+        return {"imported": 0, "files": files, "errors": errors or ["no projection files"]}
+
+    t0 = time.perf_counter()
+    allf = pd.concat(frames, ignore_index=True)
+    has_ids = "fp_id" in allf.columns
+    resolver = PlayerResolver.from_db(db, source="fantasypros")
+    m = resolver.match_frame(allf, site_col="fp_id" if has_ids else None)
+    hit = m["player_id"].notna()
+    match_ms = (time.perf_counter() - t0) * 1000.0
+
+    t0 = time.perf_counter()
+    written = _write_projections(db, season, source_name, allf.loc[hit].assign(player_id=m.loc[hit, "player_id"]))
+    fp_ids = {}
+    if has_ids:
+        ids = allf.loc[hit, "fp_id"]
+        fp_ids = dict(zip(m.loc[hit, "player_id"][ids.notna()], ids[ids.notna()]))
+    crosswalk = finish_fp_matching(db, resolver, fp_ids)
+    db.commit()
+    write_ms = (time.perf_counter() - t0) * 1000.0
+
+    per_file = allf.assign(_hit=hit).groupby("_file")["_hit"].sum()
+    for i, f in enumerate(files):
+        f["matched"] = int(per_file.get(i, 0))
+    return {
+        "imported": written,
+        "files": files,
+        "match_ms": round(match_ms, 1),
+        "write_ms": round(write_ms, 1),
+        "match_tiers": resolver.summary(),
+        "crosswalk": crosswalk,
+        "errors": errors,
+    }
+
+def import_fp_projections(db: Session, season: int, paths: list[str] | dict[str, str],
+                          source_name: str = "fp") -> dict:
+    """FantasyPros per-position projection CSVs (QB, RB, WR, TE, K; DST too)."""
+    t_start = time.perf_counter()
+    result = write_projection_files(db, season, parse_projection_files(paths), source_name)
+    return {**result, "elapsed_ms": round((time.perf_counter() - t_start) * 1000.0, 1)}
@@ -1,43 +1,95 @@
 import httpx
-from bs4 import BeautifulSoup
+from collections import Counter
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from ... import models
+from ..bulk import bulk_upsert
+from ..html_tables import iter_rows
+from ..resolver import PlayerResolver
 from datetime import datetime
 
 CBS_URL = "https://www.cbssports.com/nfl/injuries/"
 
+async def fetch_injuries(client: httpx.AsyncClient) -> str:
+    return (await client.get(CBS_URL)).text
+
+_TEAM_BLOCKS = (("div", "Page-colMain"), ("div", "TeamInjuries"))
+
+def parse_injuries(html: str) -> list[tuple[str, str, str, str, str]]:
+    """(name, pos, updated, body, status) for every row of every team block."""
+    # header rows are all <th>, so they come back empty and are skipped
+    # updated is not used but available; body: "Hamstring", "Knee", etc.;
+    # status: "Questionable for Week 1", "IR"...
+    return [tds[:5] for tds in iter_rows(html, within=_TEAM_BLOCKS, cells=("td",)) if len(tds) >= 5]
+
+def _current(db: Session, season: int) -> dict[str, tuple[str | None, str | None]]:
+    I = models.Injury
+    q = db.query(I.player_id, I.status, I.body_part).filter(I.season == season, I.source == "cbs")
+    return {pid: (status, body) for pid, status, body in q.all()}
+
+def diff_injuries(current: dict[str, tuple], report: dict[str, tuple]) -> list[dict]:
+    """
+    Compact change list between two {player_id: (status, body_part)} maps:
+    one entry per player added to, updated in or dropped from the report.
+    """
+    changes = []
+    for pid, new in report.items():
+        old = current.get(pid)
+        if old != new:
+            changes.append({"player_id": pid, "change": "added" if old is None else "updated",
+                            "status": new[0], "body_part": new[1],
+                            "prev_status": old and old[0], "prev_body_part": old and old[1]})
+    for pid, old in current.items():
+        if pid not in report:
+            changes.append({"player_id": pid, "change": "removed", "status": None, "body_part": None,
+                            "prev_status": old[0], "prev_body_part": old[1]})
+    return changes
+
+def write_injuries(db: Session, season: int, rows: list[tuple]) -> dict:
+    """
+    Diff the report against the stored CBS rows and write only the difference:
+    new/changed rows are upserted (asof_ts = now), players no longer listed are
+    deleted, untouched rows keep their asof_ts. `changes` lists what moved.
+    """
+    if not rows:
+        # an empty parse is a layout change or a bad fetch, not a healthy league
+        return {"imported": 0, "changes": [], "errors": ["No injury rows found on the CBS page"]}
+    resolver = PlayerResolver.from_db(db, source="cbs")
+    report: dict[str, tuple] = {}
+    for name, pos, _updated, body, status in rows:
+        # Match to player (name + position is most reliable here)
+        player_id = resolver.resolve(name, pos, name_only_fallback=False)
+        if player_id:
+            report[player_id] = (status, body)
+
+    changes = diff_injuries(_current(db, season), report)
+    now = datetime.utcnow()
+    upserts = [
+        {"season": season, "player_id": c["player_id"], "source": "cbs", "status": c["status"],
+         "body_part": c["body_part"], "practice_status": None, "return_timeline": None, "asof_ts": now}
+        for c in changes if c["change"] != "removed"
+    ]
+    removed = [c["player_id"] for c in changes if c["change"] == "removed"]
+    I = models.Injury
+    bulk_upsert(db, I, upserts, key_cols=["season", "player_id", "source"],
+                update_cols=["status", "body_part", "practice_status", "return_timeline", "asof_ts"])
+    if removed:
+        db.execute(delete(I).where(I.season == season, I.source == "cbs", I.player_id.in_(removed)))
+    linked = resolver.flush(db)
+    db.commit()
+
+    counts = Counter(c["change"] for c in changes)
+    return {
+        "imported": len(report),
+        "inserted": counts["added"], "updated": counts["updated"], "removed": counts["removed"],
+        "unchanged": len(report) - counts["added"] - counts["updated"],
+        "changes": changes,
+        "match_tiers": resolver.summary(),
+        "crosswalk": {**resolver.crosswalk_summary(), "linked": linked},
+        "errors": [],
+    }
+
 def import_cbs_injuries(db: Session, season: int) -> dict:
     with httpx.Client(timeout=60) as client:
         html = client.get(CBS_URL).text
-    soup = BeautifulSoup(html, "lxml")
-    sections = soup.select("div.Page-colMain div.TeamInjuries")  # team blocks
-    count = 0
-    for sec in sections:
-        rows = sec.select("table tr")[1:]  # skip header
-        for tr in rows:
-            tds = [td.get_text(strip=True) for td in tr.find_all("td")]
-            if len(tds) < 5: 
-                continue
-            name = tds[0]
-            pos = tds[1]
-            updated = tds[2]       # not used but available
-            body = tds[3]          # "Hamstring", "Knee", etc.
-            status = tds[4]        # "Questionable for Week 1", "IR"...
-            # Match to player (name + position is most reliable here)
-            q = db.query(models.Player).filter(models.Player.clean_name==name)
-            if pos: q = q.filter(models.Player.position==pos)
-            p = q.first()
-            if not p:
-                continue
-            inj = db.query(models.Injury).filter_by(season=season, player_id=p.player_id, source="cbs").first()
-            if not inj:
-                inj = models.Injury(season=season, player_id=p.player_id, source="cbs")
-                db.add(inj)
-            inj.status = status
-            inj.body_part = body
-            inj.practice_status = None
-            inj.return_timeline = None
-            inj.asof_ts = datetime.utcnow()
-            count += 1
-    db.commit()
-    return {"imported": count, "errors": []}
+    return write_injuries(db, season, parse_injuries(html))
@@ -1,65 +1,135 @@
-import httpx, time
+import os
+from typing import TYPE_CHECKING, Iterable, Iterator
 from sqlalchemy.orm import Session
 from ... import models
+from ...config.settings import settings
+from ..bulk import bulk_upsert, chunked
+from ..jsonstream import file_chunks, iter_object
+from ..runs import RunTracker, get_or_create_source  # noqa: F401 (re-exported)
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from ..fetch_cache import CachedClient
+
 URL = "https://api.sleeper.app/v1/players/nfl"
 
-def get_or_create_source(db: Session, name: str, kind: str):
-    s = db.query(models.Source).filter_by(name=name).first()
-    if not s:
-        s = models.Source(name=name, kind=kind)
-        db.add(s); db.commit(); db.refresh(s)
-    return s
+BATCH_SIZE = 2000
 
-def import_sleeper_players(db: Session, season: int) -> dict:
-    src = get_or_create_source(db, "sleeper", "players")
-    run = models.ImportRun(source_id=src.source_id)
-    db.add(run); db.commit(); db.refresh(run)
-    try:
-        # Sleeper suggests caching; do one fetch
-        with httpx.Client(timeout=60) as client:
-            resp = client.get(URL)
-            resp.raise_for_status()
-            data = resp.json()
+# Player columns the Sleeper payload owns (bye_week is left alone on update)
+_COMPARE = ("season", "clean_name", "position", "team", "sleeper_id", "espn_id", "nfl_id")
+
+def _player_row(pl: dict, season: int) -> dict | None:
+    # Filter out retired/empty
+    if not pl.get("position") or not pl.get("full_name"):
+        return None
+    clean_name = pl.get("full_name")
+    pos = pl.get("position")
+    # create a deterministic player_id if you don't have one:
+    player_id = pl.get("player_id") or f"{pos.lower()}.{clean_name.lower().replace(' ', '')}"
+    return {
+        "player_id": player_id,
+        "season": season,
+        "clean_name": clean_name,
+        "position": pos,
+        "team": pl.get("team"),
+        "sleeper_id": pl.get("player_id"),
+        "espn_id": str(pl.get("espn_id")) if pl.get("espn_id") else None,
+        "nfl_id": str(pl.get("nfl_id")) if pl.get("nfl_id") else None,
+    }
 
-        count = 0
-        for sid, pl in data.items():
-            # Filter out retired/empty
-            if not pl.get("position") or not pl.get("full_name"):
-                continue
-            clean_name = pl.get("full_name")
-            pos = pl.get("position")
-            team = pl.get("team")
-            # create a deterministic player_id if you don't have one:
-            player_id = pl.get("player_id") or f"{pos.lower()}.{clean_name.lower().replace(' ', '')}"
+def _existing_players(db: Session) -> dict[str, tuple]:
+    P = models.Player
+    return {r[0]: r[1:] for r in db.query(P.player_id, *(getattr(P, c) for c in _COMPARE)).all()}
 
-            p = db.query(models.Player).filter_by(player_id=player_id).first()
-            if not p:
-                p = models.Player(
-                    player_id=player_id,
-                    season=season,
-                    clean_name=clean_name,
-                    position=pos,
-                    team=team,
-                    bye_week=None,
-                    sleeper_id=pl.get("player_id"),
-                    espn_id=str(pl.get("espn_id")) if pl.get("espn_id") else None,
-                    nfl_id=str(pl.get("nfl_id")) if pl.get("nfl_id") else None,
-                )
-                db.add(p)
+def _write_players(db: Session, rows: Iterable[dict], batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Diff incoming rows against the players table (one SELECT up front) and
+    upsert only the new/changed ones, a batch at a time. Cross-site ids are
+    never cleared by a missing value.
+    """
+    P = models.Player
+    existing = _existing_players(db)
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    for batch in chunked(rows, batch_size):
+        inserts, updates = [], []
+        for row in batch:
+            old = existing.get(row["player_id"])
+            if old is None:
+                inserts.append({**row, "bye_week": None})
             else:
-                p.season=season; p.clean_name=clean_name; p.position=pos; p.team=team
-                p.sleeper_id = pl.get("player_id")
-                p.espn_id = str(pl.get("espn_id")) if pl.get("espn_id") else p.espn_id
-                p.nfl_id = str(pl.get("nfl_id")) if pl.get("nfl_id") else p.nfl_id
-            count += 1
+                prev = dict(zip(_COMPARE, old))
+                row["espn_id"] = row["espn_id"] or prev["espn_id"]
+                row["nfl_id"] = row["nfl_id"] or prev["nfl_id"]
+                if all(row[c] == prev[c] for c in _COMPARE):
+                    stats["unchanged"] += 1
+                    continue
+                updates.append(row)
+            existing[row["player_id"]] = tuple(row[c] for c in _COMPARE)
+
+        bulk_upsert(db, P, inserts, key_cols=["player_id"], update_cols=list(_COMPARE))
+        bulk_upsert(db, P, updates, key_cols=["player_id"], update_cols=list(_COMPARE),
+                    extra_set={"updated_at": datetime.utcnow()})
+        stats["inserted"] += len(inserts)
+        stats["updated"] += len(updates)
+    return stats
+
+def iter_player_rows(chunks: Iterable[bytes], season: int, counts: dict) -> Iterator[dict]:
+    """
+    Stream the payload entry by entry, keeping fantasy-relevant players only.
+    counts gets "seen" / "kept" as the stream is consumed.
+    """
+    positions = set(settings.fantasy_positions)
+    counts.setdefault("seen", 0); counts.setdefault("kept", 0)
+    for _sid, pl in iter_object(chunks):
+        counts["seen"] += 1
+        if pl.get("position") not in positions:
+            continue
+        row = _player_row(pl, season)
+        if row is not None:
+            counts["kept"] += 1
+            yield row
+
+async def fetch_players(client: "CachedClient") -> str:
+    """Path of the cached dump: the parse reads it back a chunk at a time."""
+    return await client.get_file(URL)
+
+def parse_players(path: str, season: int) -> dict:
+    """
+    Lazy: kept rows are decoded from the file as the writer consumes them, a
+    batch at a time; counts fill in as the stream is read.
+    """
+    counts = {}
+    return {"rows": iter_player_rows(file_chunks(path), season, counts), "counts": counts,
+            "payload_bytes": os.path.getsize(path)}
+
+def _rss() -> int | None:
+    """Current resident set size in bytes (Linux /proc); None elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _sampled(rows: Iterable[dict], mem: dict, every: int = BATCH_SIZE) -> Iterator[dict]:
+    """Pass rows through, recording the highest RSS seen at each batch boundary in mem["peak"]."""
+    for i, row in enumerate(rows):
+        if i % every == 0:
+            mem["peak"] = max(mem["peak"], _rss() or 0)
+        yield row
+    mem["peak"] = max(mem["peak"], _rss() or 0)
 
-        db.commit()
-        run.success = True; run.row_count = count; run.finished_at = datetime.utcnow()
-        db.commit()
-        return {"imported": count, "errors": []}
-    except Exception as e:
-        run.success = False; run.error_text = str(e); run.finished_at = datetime.utcnow()
-        db.commit()
-        return {"imported": 0, "errors": [str(e)]}
+def write_players(db: Session, parsed: dict) -> dict:
+    """
+    rss_growth_mb: how far the process's RSS rose above where it was when
+    this import started, sampled once per batch -- the import's own peak
+    (other work running in the same process at the time counts too).
+    """
+    start = _rss()
+    mem = {"peak": start or 0}
+    stats = _write_players(db, _sampled(parsed["rows"], mem))
+    db.commit()
+    counts = parsed["counts"]
+    growth = round((mem["peak"] - start) / 2**20, 1) if start is not None else None
+    return {"imported": counts["kept"], "seen": counts["seen"], **stats,
+            "payload_mb": round(parsed["payload_bytes"] / 2**20, 1), "rss_growth_mb": growth,
+            "errors": []}
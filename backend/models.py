@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Boolean, Text, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .db import Base
@@ -17,6 +17,19 @@ class Player(Base):
     espn_id = Column(String, index=True, nullable=True)
     nfl_id = Column(String, index=True, nullable=True)
 
+    __table_args__ = (
+        Index("ix_players_name_page", "clean_name", "player_id"),   # /players keyset order
+    )
+
+class PlayerCrosswalk(Base):
+    __tablename__ = "player_crosswalk"
+    source = Column(String, primary_key=True)        # 'fantasypros','cbs'
+    source_key = Column(String, primary_key=True)    # site id ('id:1234') or normalized 'name|pos|team'
+    player_id = Column(String, ForeignKey("players.player_id"), index=True, nullable=False)
+    method = Column(String)                          # resolver tier that created it, or 'manual'
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class ConsensusRank(Base):
     __tablename__ = "consensus_ranks"
     season = Column(Integer, primary_key=True)
@@ -42,16 +55,18 @@ class Pick(Base):
     team_slot_id = Column(Integer, ForeignKey("teams_league.team_slot_id"), nullable=False, index=True)
     player_id = Column(String, ForeignKey("players.player_id"), nullable=False, index=True)
     ts = Column(DateTime, default=datetime.utcnow, nullable=False)
+    idempotency_key = Column(String, nullable=True)   # client's Idempotency-Key header
 
     __table_args__ = (
         UniqueConstraint("overall_no", name="uq_overall_no"),
         UniqueConstraint("player_id", name="uq_picked_player"),
+        Index("ix_picks_idempotency_key", "idempotency_key", unique=True),
     )
 
 class Source(Base):
     __tablename__ = "sources"
     source_id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, unique=True, nullable=False)   # 'sleeper','fantasypros','cbs'
+    name = Column(String, unique=True, nullable=False)   # 'sleeper','fantasypros_ecr','fantasypros_adp','cbs',...
     kind = Column(String, nullable=True)                 # 'players','ecr','adp','injuries','projections'
 
 class ImportRun(Base):
@@ -63,6 +78,14 @@ class ImportRun(Base):
     success = Column(Boolean, default=False, nullable=False)
     row_count = Column(Integer, default=0, nullable=False)
     error_text = Column(Text, nullable=True)
+    inserted = Column(Integer, nullable=True)
+    updated = Column(Integer, nullable=True)
+    unchanged = Column(Integer, nullable=True)
+    elapsed_ms = Column(Float, nullable=True)
+    fetch_ms = Column(Float, nullable=True)
+    parse_ms = Column(Float, nullable=True)
+    write_ms = Column(Float, nullable=True)
+    content_hash = Column(String, nullable=True)   # fetched payload + params; unchanged -> import skipped
 
 class ADP(Base):
     __tablename__ = "adp"
@@ -73,6 +96,12 @@ class ADP(Base):
     rank = Column(Float)
     sample_size = Column(Integer)
     asof_ts = Column(DateTime, default=datetime.utcnow)
+    # spread across sources, only on the derived 'consensus' rows (ingest/adp_consensus.py)
+    adp_median = Column(Float, nullable=True)
+    adp_min = Column(Float, nullable=True)
+    adp_max = Column(Float, nullable=True)
+    adp_std = Column(Float, nullable=True)
+    n_sources = Column(Integer, nullable=True)
 
 class Projection(Base):
     __tablename__ = "projections"
@@ -111,3 +140,75 @@ class Note(Base):
     team_slot_id = Column(Integer, ForeignKey("teams_league.team_slot_id"), nullable=True)
     text = Column(Text, nullable=False)
     ts = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class PlayerEnriched(Base):
+    """Denormalized read model behind /meta/players_enriched (see services/enriched.py)."""
+    __tablename__ = "players_enriched"
+    season = Column(Integer, primary_key=True)
+    player_id = Column(String, ForeignKey("players.player_id"), primary_key=True)
+    name = Column(String, nullable=False)
+    pos = Column(String)
+    team = Column(String)
+    ecr = Column(Float)
+    ecr_pos = Column(Float)
+    tier = Column(Integer)
+    tier_source = Column(String)     # 'override' | 'core'
+    adp = Column(Float)
+    adp_min = Column(Float)
+    adp_max = Column(Float)
+    adp_std = Column(Float)
+    injury_status = Column(String)
+    injury_body = Column(String)
+
+    __table_args__ = (
+        # keyset paging order: (ecr, name, player_id) within a season / position
+        Index("ix_players_enriched_page", "season", "ecr", "name", "player_id"),
+        Index("ix_players_enriched_pos_page", "season", "pos", "ecr", "name", "player_id"),
+    )
+
+class ChangeLog(Base):
+    """Append-only change sequence for /meta/players_enriched?since= (see services/changes.py)."""
+    __tablename__ = "change_log"
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    season = Column(Integer, nullable=True)          # NULL: every season (picks)
+    player_id = Column(String, nullable=False)
+    kind = Column(String, nullable=False)            # 'enriched' | 'pick'
+    ts = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = {"sqlite_autoincrement": True}  # never reuse a seq, even after trimming
+
+class RankSnapshot(Base):
+    """One import's ranking (ECR or consensus ADP) for a season, packed (see services/history.py)."""
+    __tablename__ = "rank_snapshots"
+    snap_id = Column(Integer, primary_key=True, autoincrement=True)
+    season = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)            # 'ecr' | 'adp'
+    taken_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    source = Column(String)                          # import that triggered it
+    n = Column(Integer, nullable=False)
+    ids_hash = Column(String, ForeignKey("snapshot_ids.ids_hash"), nullable=False)
+    base_id = Column(Integer, nullable=True)         # snapshot this row is a diff against; NULL: keyframe
+    values = Column(LargeBinary, nullable=False)     # zlib(int32[n] hundredths, or their diff), id order
+    digest = Column(String, nullable=False)          # ids_hash + values: unchanged ranking -> no new snapshot
+
+    __table_args__ = (
+        Index("ix_rank_snapshots_series", "season", "kind", "taken_at"),
+    )
+
+class SnapshotIds(Base):
+    """Sorted player_id list shared by every snapshot over the same players."""
+    __tablename__ = "snapshot_ids"
+    ids_hash = Column(String, primary_key=True)
+    ids = Column(LargeBinary, nullable=False)        # zlib("\n".join(sorted ids))
+
+class EnrichedVersion(Base):
+    __tablename__ = "players_enriched_versions"
+    season = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    built_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SchemaVersion(Base):
+    """Fingerprint of the models the schema was last synced to (see db.ensure_schema)."""
+    __tablename__ = "schema_version"
+    fingerprint = Column(String, primary_key=True)
+    synced_at = Column(DateTime, default=datetime.utcnow)
@@ -1,19 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Header, Query
 from sqlalchemy.orm import Session
 import os
 from ..db import get_db
 from ..config.settings import settings
-from ..ingest.csv_importer import import_from_csv
 from .. import models
-from ..ingest.sources.sleeper_players import import_sleeper_players
-from ..ingest.sources.fantasypros_ecr import (
-    import_fp_csv,
-    import_fp_overall_html,
-    import_fp_csv_from_url,
-    import_fp_ecr_auto,
-)
-from ..ingest.sources.fantasypros_adp import import_fp_adp_csv
-from ..ingest.sources.injuries_cbs import import_cbs_injuries
+from ..services import hooks
+from ..ingest.jobs import runner, SOURCES
+from ..ingest.scheduler import injuries as injury_scheduler
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -21,12 +14,22 @@ def require_admin(x_token: str | None = Header(None, description="admin token fo
     if settings.admin_token and x_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="unauthorized")
 
+def _imported(db: Session, source: str, result: dict, season: int | None = None) -> dict:
+    """Notify the read models that an import touched the tables."""
+    hooks.on_import_finished(db, source, season, result)
+    return result
+
+async def _run_import(source: str, **params) -> dict:
+    """Run an import on the job pool and wait for it (the synchronous /import/* contract)."""
+    job = await runner.wait(runner.submit(source, params))
+    return job.result if job.result is not None else {"imported": 0, "errors": [job.error]}
+
 
 @router.post("/import/csv", dependencies=[Depends(require_admin)])
-def admin_import_csv(path: str, db: Session = Depends(get_db)):
+async def admin_import_csv(path: str):
     if not os.path.exists(path):
         raise HTTPException(status_code=400, detail=f"File not found: {path}")
-    result = import_from_csv(path, db)
+    result = await _run_import("csv", path=path)
     if result["errors"]:
         raise HTTPException(status_code=400, detail=result)
     return {"ok": True, "result": result}
@@ -53,38 +56,147 @@ def admin_import_demo(db: Session = Depends(get_db)):
         else:
             cr.ecr_rank=r["ecr_rank"]; cr.ecr_pos_rank=r["ecr_pos_rank"]; cr.tier=r["tier"]; cr.source="demo"
     db.commit()
-    return {"ok": True, "imported": len(demo)}
+    return _imported(db, "demo", {"ok": True, "imported": len(demo)})
 
 @router.post("/import/sleeper_players", dependencies=[Depends(require_admin)])
-def admin_import_sleeper_players(season: int, db: Session = Depends(get_db)):
-    return import_sleeper_players(db, season)
+async def admin_import_sleeper_players(season: int):
+    return await _run_import("sleeper_players", season=season)
 
 @router.post("/import/fp_ecr_csv", dependencies=[Depends(require_admin)])
-def admin_import_fp_ecr_csv(season: int, path: str, db: Session = Depends(get_db)):
-    return import_fp_csv(db, season, path)
+async def admin_import_fp_ecr_csv(season: int, path: str):
+    return await _run_import("fp_ecr", season=season, path_or_url=path)
 
 @router.post("/import/fp_ecr_html", dependencies=[Depends(require_admin)])
-def admin_import_fp_ecr_html(season: int, url: str, db: Session = Depends(get_db)):
-    return import_fp_overall_html(db, season, url)
+async def admin_import_fp_ecr_html(season: int, url: str):
+    return await _run_import("fp_ecr_html", season=season, url=url)
 
 @router.post("/import/fp_ecr_url", dependencies=[Depends(require_admin)])
-def admin_import_fp_ecr_url(season: int, url: str, db: Session = Depends(get_db)):
+async def admin_import_fp_ecr_url(season: int, url: str):
     """Directly fetch CSV from a FantasyPros URL (best-effort)."""
-    return import_fp_csv_from_url(db, season, url)
+    return await _run_import("fp_ecr", season=season, path_or_url=url, html_fallback=False)
 
 @router.post("/import/fp_ecr_auto", dependencies=[Depends(require_admin)])
-def admin_import_fp_ecr_auto_route(season: int, path_or_url: str, db: Session = Depends(get_db)):
+async def admin_import_fp_ecr_auto_route(season: int, path_or_url: str):
     """
     Smart import: 
       - if path_or_url is a URL, try CSV, fallback to HTML
       - else treat as local CSV path
     """
-    return import_fp_ecr_auto(db, season, path_or_url)
+    return await _run_import("fp_ecr", season=season, path_or_url=path_or_url)
 
 @router.post("/import/fp_adp_csv", dependencies=[Depends(require_admin)])
-def admin_import_fp_adp_csv(season: int, path: str, source: str = "fp_composite", db: Session = Depends(get_db)):
-    return import_fp_adp_csv(db, season, path, source_name=source)
+async def admin_import_fp_adp_csv(season: int, path: str, source: str = "fp_composite"):
+    return await _run_import("fp_adp", season=season, path=path, source_name=source)
+
+@router.post("/adp/consensus", dependencies=[Depends(require_admin)])
+def admin_adp_consensus(season: int, db: Session = Depends(get_db)):
+    """Recompute the cross-source ADP consensus (ADP imports already do this)."""
+    from ..ingest import adp_consensus
+    result = adp_consensus.aggregate_adp(db, season)
+    db.commit()
+    return _imported(db, "adp_consensus", {**result, "imported": result["players"], "errors": []}, season)
+
+@router.post("/import/fp_projections", dependencies=[Depends(require_admin)])
+async def admin_import_fp_projections(
+    season: int,
+    path: list[str] = Query(..., description="one per position file, e.g. ..._Projections_QB.csv"),
+    source: str = "fp",
+):
+    return await _run_import("fp_projections", season=season, paths=path, source_name=source)
 
 @router.post("/import/injuries_cbs", dependencies=[Depends(require_admin)])
-def admin_import_injuries_cbs(season: int, db: Session = Depends(get_db)):
-    return import_cbs_injuries(db, season)
+async def admin_import_injuries_cbs(season: int):
+    return await _run_import("injuries_cbs", season=season)
+
+# --- Background jobs ---------------------------------------------------------
+
+@router.get("/jobs", dependencies=[Depends(require_admin)])
+def admin_list_jobs():
+    return {"sources": {k: list(v.required) for k, v in SOURCES.items()},
+            "jobs": [j.to_dict() for j in runner.list()]}
+
+@router.post("/jobs/{source}", status_code=202, dependencies=[Depends(require_admin)])
+async def admin_submit_job(source: str, params: dict = Body(default={}, examples=[{"season": 2025}])):
+    """
+    Start an import in the background and return its job id right away.
+    params are the import's arguments, e.g. {"season": 2025, "path": "..."}
+    (GET /admin/jobs lists each source's required keys).
+    """
+    if source not in SOURCES:
+        raise HTTPException(status_code=404, detail=f"Unknown import source: {source}")
+    try:
+        job = runner.submit(source, params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(require_admin)])
+def admin_get_job(job_id: str):
+    job = runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+# --- Draft-day injury refresh ------------------------------------------------
+
+@router.get("/injuries/refresh", dependencies=[Depends(require_admin)])
+def admin_injury_refresh_status():
+    return injury_scheduler.status()
+
+@router.post("/injuries/refresh/start", dependencies=[Depends(require_admin)])
+async def admin_injury_refresh_start(season: int, interval: int | None = Query(None, description="seconds; default DA_INJURY_REFRESH_SECONDS")):
+    """Refresh CBS injuries every `interval` seconds (restarts a running loop)."""
+    injury_scheduler.start(season, interval)
+    return injury_scheduler.status()
+
+@router.post("/injuries/refresh/stop", dependencies=[Depends(require_admin)])
+async def admin_injury_refresh_stop():
+    return {"stopped": injury_scheduler.stop(), **injury_scheduler.status()}
+
+# --- Crosswalk (source, source_key) -> player_id ----------------------------
+
+def _xwalk_out(x: models.PlayerCrosswalk) -> dict:
+    return {
+        "source": x.source, "source_key": x.source_key, "player_id": x.player_id,
+        "method": x.method, "created_at": x.created_at, "updated_at": x.updated_at,
+    }
+
+@router.get("/crosswalk", dependencies=[Depends(require_admin)])
+def admin_list_crosswalk(
+    source: str | None = Query(None),
+    player_id: str | None = Query(None),
+    q: str | None = Query(None, description="substring of source_key"),
+    limit: int = Query(200, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    X = models.PlayerCrosswalk
+    qry = db.query(X)
+    if source:
+        qry = qry.filter(X.source == source)
+    if player_id:
+        qry = qry.filter(X.player_id == player_id)
+    if q:
+        qry = qry.filter(X.source_key.ilike(f"%{q}%"))
+    return [_xwalk_out(x) for x in qry.order_by(X.source, X.source_key).limit(limit).all()]
+
+@router.put("/crosswalk", dependencies=[Depends(require_admin)])
+def admin_set_crosswalk(source: str, source_key: str, player_id: str, db: Session = Depends(get_db)):
+    """Create or correct a mapping; manual mappings win on every later import."""
+    if not db.query(models.Player).filter_by(player_id=player_id).first():
+        raise HTTPException(status_code=404, detail="player not found")
+    x = db.query(models.PlayerCrosswalk).filter_by(source=source, source_key=source_key).first()
+    if not x:
+        x = models.PlayerCrosswalk(source=source, source_key=source_key)
+        db.add(x)
+    x.player_id = player_id
+    x.method = "manual"
+    db.commit(); db.refresh(x)
+    return _xwalk_out(x)
+
+@router.delete("/crosswalk", dependencies=[Depends(require_admin)])
+def admin_delete_crosswalk(source: str, source_key: str, db: Session = Depends(get_db)):
+    x = db.query(models.PlayerCrosswalk).filter_by(source=source, source_key=source_key).first()
+    if not x:
+        raise HTTPException(status_code=404, detail="mapping not found")
+    db.delete(x); db.commit()
+    return {"ok": True}
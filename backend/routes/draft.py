@@ -0,0 +1,69 @@
+# backend/routes/draft.py
+import asyncio
+import json
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from ..services.events import bus
+
+router = APIRouter(prefix="/draft", tags=["draft"])
+
+KEEPALIVE_SECONDS = 15
+
+def _sse(ev: dict) -> str:
+    data = json.dumps(ev["data"], separators=(",", ":"), default=str)
+    return f"id: {ev['id']}\nevent: {ev['type']}\ndata: {data}\n\n"
+
+@router.get("/stream")
+async def draft_stream(
+    request: Request,
+    last_event_id: int | None = Query(None, description="resume after this event id"),
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-Sent Events: pick-made, pick-undone, tier-override, import-finished.
+    Browsers resend Last-Event-ID on reconnect; a `reset` event means the
+    missed events are gone and the client should reload everything.
+    """
+    if last_event_id is None and last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+
+    async def gen():
+        q = bus.subscribe()          # subscribe first so nothing slips between replay and live
+        try:
+            last = last_event_id
+            yield "retry: 3000\n\n"
+            if last is not None:
+                missed = bus.since(last)
+                if missed is None:
+                    yield _sse({"id": bus.last_id, "type": "reset", "data": {"last_id": bus.last_id}})
+                    last = bus.last_id
+                else:
+                    for ev in missed:
+                        yield _sse(ev)
+                        last = ev["id"]
+            while not await request.is_disconnected():
+                try:
+                    ev = await asyncio.wait_for(q.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if last is not None and ev["id"] <= last:
+                    continue
+                yield _sse(ev)
+                last = ev["id"]
+        finally:
+            bus.unsubscribe(q)
+
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/events")
+def draft_events(since: int = Query(0, ge=0)):
+    """Polling fallback: events after `since`, or reset=true when they are gone."""
+    missed = bus.since(since)
+    if missed is None:
+        return {"reset": True, "last_id": bus.last_id, "events": []}
+    return {"reset": False, "last_id": bus.last_id, "events": missed}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models
+from ..services import hooks
 
 router = APIRouter(prefix="/edits", tags=["edits"])
 
@@ -27,6 +28,7 @@ def set_tier_override(
         if row:
             db.delete(row)
             db.commit()
+            hooks.on_tier_changed(db, player_id, None)
         return {"ok": True, "tier_override": None}
 
     # Parse to int
@@ -42,7 +44,8 @@ def set_tier_override(
     else:
         row.tier_override = tval
     db.commit()
-    return {"ok": True, "tier_override": row.tier_override}
+    hooks.on_tier_changed(db, player_id, tval)
+    return {"ok": True, "tier_override": tval}
 
 
 @router.post("/notes")
@@ -1,35 +1,121 @@
 # backend/routes/meta.py
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models
+from ..services import changes, enriched, paging
+from ..services.history import store as history
 
 router = APIRouter(prefix="/meta", tags=["meta"])
 
+def _page_rows(q, key: tuple | None, n: int) -> list:
+    """
+    n rows after `key` in (ecr nulls last, name, player_id) order. Ranked and
+    unranked players are two index range scans rather than one NULLS LAST
+    sort, so a deep page costs the same as the first.
+    """
+    E = models.PlayerEnriched
+    rows = []
+    if key is None or key[0] is not None:
+        ranked = q.filter(E.ecr.isnot(None))
+        if key is not None:
+            ranked = ranked.filter(paging.after((E.ecr, E.name, E.player_id), key))
+        rows = ranked.order_by(E.ecr, E.name, E.player_id).limit(n).all()
+    if len(rows) < n:
+        unranked = q.filter(E.ecr.is_(None))
+        if key is not None and key[0] is None:
+            unranked = unranked.filter(paging.after((E.name, E.player_id), key[1:]))
+        rows += unranked.order_by(E.name, E.player_id).limit(n - len(rows)).all()
+    return rows
+
+def _encode(rows, keys: tuple, format: str):
+    if format == "columns":
+        cols = zip(*rows) if rows else ([] for _ in keys)
+        return {"count": len(rows), "columns": dict(zip(keys, map(list, cols)))}
+    return [dict(zip(keys, r)) for r in rows]
+
+def _delta(db: Session, q, season: int, since: int, limit: int) -> dict:
+    """
+    Rows of players touched after `since` (current state; gone or no longer
+    matching the filter -> removed) and their draft status, or a full first
+    page when the change log can't answer (services/changes.py).
+    """
+    E, K = models.PlayerEnriched, models.Pick
+    hit = changes.touched(db, since, season)
+    if hit is None:
+        drafted = {pid for (pid,) in db.query(K.player_id).all()}
+        return {"full": True, "rows": _page_rows(q, None, limit), "removed": [],
+                "drafted": sorted(drafted), "undrafted": []}
+    ids, picked = hit.get("enriched", set()), hit.get("pick", set())
+    rows = q.filter(E.player_id.in_(ids)).order_by(E.ecr.asc().nulls_last(), E.name, E.player_id).all() if ids else []
+    drafted = {pid for (pid,) in db.query(K.player_id).filter(K.player_id.in_(picked)).all()} if picked else set()
+    return {"full": False, "rows": rows, "removed": sorted(ids - {r.player_id for r in rows}),
+            "drafted": sorted(drafted), "undrafted": sorted(picked - drafted)}
+
 @router.get("/players_enriched")
 def players_enriched(
     season: int = Query(...),
     position: str | None = Query(None),
     limit: int = Query(500, ge=1, le=2000),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    since: int | None = Query(None, ge=0, description="X-Change-Seq from an earlier response: only what changed after it"),
+    format: str = Query("rows", pattern="^(rows|columns)$",
+                        description="columns: {count, columns: {field: [values...]}} -- names sent once"),
     db: Session = Depends(get_db),
 ):
-    # join players + consensus + adp (fp composite) + injuries + tier_override
-    P, C, A, I, T = models.Player, models.ConsensusRank, models.ADP, models.Injury, models.TierOverride
-    q = db.query(P, C.ecr_rank, C.ecr_pos_rank, C.tier, A.adp, I.status, I.body_part, T.tier_override)\
-         .outerjoin(C, (C.player_id==P.player_id) & (C.season==season))\
-         .outerjoin(A, (A.player_id==P.player_id) & (A.season==season) & (A.source=="fp_composite"))\
-         .outerjoin(I, (I.player_id==P.player_id) & (I.season==season) & (I.source=="cbs"))\
-         .outerjoin(T, (T.player_id==P.player_id))
+    # players + consensus + adp (fp composite) + injuries + tier_override,
+    # pre-joined in the players_enriched table (services/enriched.py)
+    if cursor and since is not None:
+        raise HTTPException(400, "since returns changes, not a page: drop the cursor")
+    scope = ["players_enriched", season, position]
+    key = paging.decode_cursor(cursor, scope, 3) if cursor else None
+    version = enriched.ensure(db, season)
+    seq = changes.current(db)    # read before the rows: a change racing in is resent next time, not lost
+    E = models.PlayerEnriched
+    q = db.query(E.player_id, *(getattr(E, f) for f in enriched.FIELDS)).filter(E.season == season)
     if position:
-        q = q.filter(P.position==position)
-    rows = q.order_by(C.ecr_rank.asc().nulls_last(), P.clean_name.asc()).limit(limit).all()
-    out = []
-    for (p, ecr, epos, tier, adp, istat, ibody, tovr) in rows:
-        out.append({
-            "player_id": p.player_id, "name": p.clean_name, "pos": p.position, "team": p.team,
-            "ecr": ecr, "ecr_pos": epos, "tier": tovr if tovr is not None else tier,
-            "tier_source": "override" if tovr is not None else "core",
-            "adp": adp,
-            "injury_status": istat, "injury_body": ibody,
-        })
+        q = q.filter(E.pos == position)
+    keys = ("player_id", *enriched.FIELDS)
+    headers = {"X-Enriched-Version": str(version), "X-Change-Seq": str(seq)}
+    if since is not None:
+        body = _delta(db, q, season, since, limit)
+        body = {"seq": seq, **body, "rows": _encode(body["rows"], keys, format)}
+        return ORJSONResponse(body, headers=headers)
+
+    rows, next_cursor = paging.page(_page_rows(q, key, limit + 1), limit, scope,
+                                    lambda r: (r.ecr, r.name, r.player_id))
+    body = _encode(rows, keys, format)
+    if format == "columns":
+        body["seq"] = seq
+    if next_cursor:
+        headers[paging.HEADER] = next_cursor
+    # returned as a Response so FastAPI doesn't run jsonable_encoder over every row
+    return ORJSONResponse(body, headers=headers)
+
+_KIND = Query("ecr", pattern="^(ecr|adp)$", description="ecr: consensus rank; adp: cross-source ADP")
+
+@router.get("/movers")
+def movers(
+    season: int = Query(...),
+    since: datetime = Query(..., description="compare against the ranking as of this date/time"),
+    kind: str = _KIND,
+    limit: int = Query(25, ge=1, le=200),
+    top: int = Query(300, ge=1, description="only players ranked inside this in either snapshot"),
+    db: Session = Depends(get_db),
+):
+    """Risers and fallers between the snapshot as of `since` and the latest one."""
+    out = history.movers(db, season, kind, since, limit, top)
+    if out is None:
+        raise HTTPException(404, f"need two {kind} snapshots for {season}; imports add one each")
     return out
+
+@router.get("/history/{player_id}")
+def rank_history(player_id: str, season: int = Query(...), kind: str = _KIND, db: Session = Depends(get_db)):
+    return {"player_id": player_id, "season": season, "kind": kind,
+            "history": history.player_history(db, season, kind, player_id)}
+
+@router.get("/snapshots")
+def snapshots(season: int = Query(...), kind: str = _KIND, db: Session = Depends(get_db)):
+    return history.snapshots(db, season, kind)
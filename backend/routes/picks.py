@@ -1,29 +1,130 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import String, func, insert, literal, select, true
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models, schemas
+from ..ingest import draft_log
+from ..services import changes, hooks
+from ..services.draft_order import snake_position_sql
 
 router = APIRouter(prefix="/picks", tags=["picks"])
 
-@router.post("", response_model=schemas.PickOut)
-def create_pick(payload: schemas.PickIn, db: Session = Depends(get_db)):
-    if not db.query(models.Player).filter_by(player_id=payload.player_id).first():
-        raise HTTPException(status_code=400, detail="Unknown player_id")
-    if not db.query(models.TeamLeague).filter_by(team_slot_id=payload.team_slot_id).first():
-        raise HTTPException(status_code=400, detail="Unknown team_slot_id")
-    if db.query(models.Pick).filter_by(overall_no=payload.overall_no).first():
-        raise HTTPException(status_code=400, detail=f"overall_no {payload.overall_no} already used")
-    p = models.Pick(**payload.model_dump())
-    db.add(p); db.commit(); db.refresh(p)
+PICK_COLS = tuple(schemas.PickOut.model_fields)
+
+def _insert_pick(payload: schemas.PickIn, key: str | None):
+    """
+    INSERT ... SELECT ... RETURNING that only produces a row when the player
+    and the team exist; round_no / team_slot_id default to the snake slot of
+    overall_no. The unique constraints settle races between clients.
+    """
+    P, T, K = models.Player, models.TeamLeague, models.Pick
+    n_teams = select(func.count()).select_from(T).scalar_subquery()
+    round_no, draft_position = snake_position_sql(payload.overall_no, n_teams)
+    if payload.round_no is not None:
+        round_no = literal(payload.round_no)
+    if payload.team_slot_id is not None:
+        team = T.team_slot_id == payload.team_slot_id
+    else:
+        team = T.draft_position == draft_position
+    sel = select(round_no, literal(payload.overall_no), T.team_slot_id, P.player_id, literal(key, String))\
+        .join_from(P, T, true()).where(P.player_id == payload.player_id, team)
+    return insert(K).from_select(["round_no", "overall_no", "team_slot_id", "player_id", "idempotency_key"], sel)\
+        .returning(K.pick_id, K.round_no, K.overall_no, K.team_slot_id, K.player_id)
+
+def _rejected(db: Session, payload: schemas.PickIn) -> HTTPException:
+    """Why the INSERT ... SELECT came back empty (only runs on that path)."""
+    if not db.get(models.Player, payload.player_id):
+        return HTTPException(status_code=400, detail="Unknown player_id")
+    if payload.team_slot_id is not None:
+        return HTTPException(status_code=400, detail="Unknown team_slot_id")
+    return HTTPException(status_code=400, detail=f"No team on the clock at overall_no {payload.overall_no} (set up /teams first)")
+
+def _conflict(payload: schemas.PickIn, err: IntegrityError) -> HTTPException:
+    msg = str(err.orig)
+    if "overall_no" in msg:
+        return HTTPException(status_code=409, detail=f"overall_no {payload.overall_no} already used")
+    if "player" in msg:
+        return HTTPException(status_code=409, detail=f"{payload.player_id} already drafted")
+    return HTTPException(status_code=409, detail=msg)
+
+def _replayed(db: Session, payload: schemas.PickIn, key: str):
+    """The pick an earlier request with this Idempotency-Key created, if any."""
+    p = db.query(models.Pick).filter_by(idempotency_key=key).first()
+    if p is not None and (p.overall_no, p.player_id) != (payload.overall_no, payload.player_id):
+        raise HTTPException(status_code=409, detail="Idempotency-Key already used for a different pick")
     return p
 
+@router.post("", response_model=schemas.PickOut)
+def create_pick(
+    payload: schemas.PickIn,
+    response: Response,
+    idempotency_key: str | None = Header(None, description="retries with the same key return the original pick"),
+    db: Session = Depends(get_db),
+):
+    try:
+        row = db.execute(_insert_pick(payload, idempotency_key)).first()
+        if row is not None:
+            changes.record(db, "pick", [row.player_id])
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        prior = _replayed(db, payload, idempotency_key) if idempotency_key else None
+        if prior is None:
+            raise _conflict(payload, e)
+        response.headers["Idempotent-Replayed"] = "true"
+        return prior
+    if row is None:
+        raise _rejected(db, payload)
+    hooks.on_pick_made(row)
+    return row
+
+def _batch(db: Session, items: list[dict], replace: bool) -> dict:
+    try:
+        result = draft_log.import_picks(db, items, replace)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"a concurrent pick conflicts with the batch: {e.orig}")
+    if result["errors"]:
+        raise HTTPException(status_code=400, detail=result)
+    hooks.on_picks_batch(result.pop("replaced_player_ids"), result["picks"])
+    return result
+
+@router.post("/batch")
+def create_picks_batch(payload: schemas.PickBatchIn, db: Session = Depends(get_db)):
+    """
+    Insert many picks in one transaction (e.g. rebuilding a draft). Every pick
+    is validated first; any error rejects the whole batch with the full list.
+    """
+    return _batch(db, [p.model_dump() for p in payload.picks], payload.replace)
+
+@router.post("/batch/csv")
+def create_picks_batch_csv(
+    body: str = Body(..., media_type="text/csv",
+                     description="draft log with a player (name) or player_id column; optional "
+                                 "overall/round/slot/picked_by/position/team columns"),
+    replace: bool = Query(False, description="drop the current draft first"),
+    db: Session = Depends(get_db),
+):
+    items, errors = draft_log.parse_draft_csv(body)
+    if errors:
+        raise HTTPException(status_code=400, detail={"inserted": 0, "errors": errors})
+    return _batch(db, items, replace)
+
 @router.get("", response_model=list[schemas.PickOut])
 def list_picks(db: Session = Depends(get_db)):
-    return db.query(models.Pick).order_by(models.Pick.overall_no.asc()).all()
+    K = models.Pick
+    rows = db.query(*(getattr(K, c) for c in PICK_COLS)).order_by(K.overall_no.asc()).all()
+    return ORJSONResponse([dict(zip(PICK_COLS, r)) for r in rows])    # trusted rows, no per-row validation
 
 @router.delete("/{pick_id}")
 def delete_pick(pick_id: int, db: Session = Depends(get_db)):
     p = db.query(models.Pick).filter_by(pick_id=pick_id).first()
     if not p: raise HTTPException(status_code=404, detail="pick not found")
-    db.delete(p); db.commit()
+    gone = hooks.pick_payload(p)
+    db.delete(p)
+    changes.record(db, "pick", [p.player_id])
+    db.commit()
+    hooks.on_pick_undone(gone)
     return {"ok": True, "deleted_pick_id": pick_id}
@@ -1,22 +1,50 @@
-from fastapi import APIRouter, Depends, Query
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from ..db import get_db
 from .. import models, schemas
+from ..services import paging
+from ..services.search import index as search
 
 router = APIRouter(prefix="/players", tags=["players"])
 
+PLAYER_COLS = tuple(schemas.PlayerOut.model_fields)
+
 @router.get("", response_model=list[schemas.PlayerOut])
 def list_players(
     q: str | None = Query(None, description="search by name/position/team"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page (not with q)"),
     db: Session = Depends(get_db),
 ):
-    qry = db.query(models.Player)
+    headers = {}
     if q:
-        like = f"%{q}%"
-        qry = qry.filter(
-            (models.Player.clean_name.ilike(like)) |
-            (models.Player.position.ilike(like)) |
-            (models.Player.team.ilike(like))
-        )
-    return qry.order_by(models.Player.clean_name.asc()).limit(limit).all()
+        if cursor:
+            raise HTTPException(400, "cursor paging is by name; search results are not paged")
+        # ranked by the search index (best match, then ECR) instead of a LIKE scan
+        rows = [tuple(getattr(e, c) for c in PLAYER_COLS) for e, _, _ in search.ensure(db).search(q, limit)]
+    else:
+        # keyset page over (clean_name, player_id): ix_players_name_page
+        P = models.Player
+        query = db.query(*(getattr(P, c) for c in PLAYER_COLS))
+        if cursor:
+            query = query.filter(paging.after((P.clean_name, P.player_id), paging.decode_cursor(cursor, ["players"], 2)))
+        rows = query.order_by(P.clean_name.asc(), P.player_id.asc()).limit(limit + 1).all()
+        rows, next_cursor = paging.page(rows, limit, ["players"], lambda r: (r.clean_name, r.player_id))
+        if next_cursor:
+            headers[paging.HEADER] = next_cursor
+    # rows already have PlayerOut's shape: skip per-row response_model validation
+    return ORJSONResponse([dict(zip(PLAYER_COLS, r)) for r in rows], headers=headers)
+
+@router.get("/search", response_model=list[schemas.PlayerSearchOut])
+def search_players(
+    q: str = Query(..., description="typeahead text; case, accents and punctuation are ignored"),
+    limit: int = Query(10, ge=1, le=50),
+    exclude_drafted: bool = Query(False),
+    position: str | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Exact name prefixes first, then word prefixes, substrings and position/team codes; ECR breaks ties."""
+    hits = search.ensure(db).search(q, limit, exclude_drafted=exclude_drafted, position=position)
+    return [{**asdict(e), "match": tier, "drafted": drafted} for e, tier, drafted in hits]
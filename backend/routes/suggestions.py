@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from ..db import get_db
-from .. import models, schemas
+from .. import schemas
+from ..services.board import board
+from ..services.survival import engine as survival, DEFAULT_SIMS
+from ..services.vor import engine as vor, SCORING_PROFILES
 
 router = APIRouter(prefix="/suggestions", tags=["suggestions"])
 
@@ -10,21 +13,45 @@ def suggestions(
     limit_top: int = Query(3, ge=1, le=10),
     limit_next: int = Query(10, ge=1, le=30),
     position: str | None = Query(None),
+    mode: str = Query("ecr", pattern="^(ecr|vor)$"),
+    scoring: str = Query("ppr", description="mode=vor: " + ", ".join(SCORING_PROFILES)),
+    season: int | None = Query(None, description="mode=vor: defaults to the latest projected season"),
     db: Session = Depends(get_db)
 ):
-    picked_ids = [pid for (pid,) in db.query(models.Pick.player_id).all()]
-    q = db.query(models.Player, models.ConsensusRank).join(
-        models.ConsensusRank,
-        (models.ConsensusRank.player_id == models.Player.player_id)
-        & (models.ConsensusRank.season == models.Player.season)
-    )
-    if position:
-        q = q.filter(models.Player.position == position)
-    if picked_ids:
-        q = q.filter(~models.Player.player_id.in_(picked_ids))
-    rows = q.order_by(
-        (models.ConsensusRank.ecr_rank.is_(None)).asc(),
-        models.ConsensusRank.ecr_rank.asc()
-    ).limit(limit_top + limit_next).all()
-    players = [r[0] for r in rows]
-    return {"top": players[:limit_top], "next": players[limit_top:]}
+    if mode == "vor":
+        if scoring not in SCORING_PROFILES:
+            raise HTTPException(status_code=400, detail=f"Unknown scoring profile: {scoring}")
+        season = season if season is not None else vor.latest_season(db)
+        players = vor.top(db, limit_top + limit_next, season, scoring, position) if season is not None else []
+        return {"mode": mode, "scoring": scoring, "top": players[:limit_top], "next": players[limit_top:]}
+    # served from the in-memory board; db is only touched on a (re)build
+    players = board.ensure(db).top(limit_top + limit_next, position)
+    return {"mode": mode, "top": players[:limit_top], "next": players[limit_top:]}
+
+@router.get("/board")
+def board_stats(db: Session = Depends(get_db)):
+    """Build time / size of the in-memory draft board (for monitoring)."""
+    return board.ensure(db).stats()
+
+@router.get("/vor")
+def vor_stats():
+    """Loaded projection seasons and cached scoring profiles of the VOR engine."""
+    return vor.stats()
+
+@router.get("/survival")
+def survival_odds(
+    season: int = Query(...),
+    team_slot_id: int = Query(..., description="team whose next pick we are asking about"),
+    sims: int = Query(DEFAULT_SIMS, ge=100, le=50_000),
+    limit: int = Query(25, ge=1, le=200),
+    seed: int | None = Query(None, description="fix the RNG for reproducible numbers"),
+    db: Session = Depends(get_db),
+):
+    """Probability that each top available player is still there at this team's next pick."""
+    try:
+        out = survival.run(db, season, team_slot_id, sims=sims, limit=limit, seed=seed)
+    except ValueError as e:     # the team's draft_position doesn't fit the league size
+        raise HTTPException(status_code=400, detail=str(e))
+    if out is None:
+        raise HTTPException(status_code=404, detail="Unknown team_slot_id")
+    return out
@@ -1,5 +1,6 @@
 # backend/run_debug.py
 import os
+import subprocess
 import sys
 from pathlib import Path
 import uvicorn
@@ -23,7 +24,56 @@ def in_reload_worker() -> bool:
         return True
     return False
 
+# only an import job should load these; seeing one at startup is a regression
+HEAVY = ("pandas", "lxml", "bs4", "httpx")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import backend.app
+t1 = time.perf_counter()
+from backend.db import ensure_schema
+synced = ensure_schema()
+t2 = time.perf_counter()
+print(f"app import {(t1 - t0) * 1000:.0f} ms, ensure_schema {(t2 - t1) * 1000:.0f} ms (synced={synced})")
+print("heavy:", ",".join(m for m in %r if m in sys.modules))
+"""
+
+def profile_startup(top: int = 15) -> int:
+    """
+    Import backend.app in a fresh interpreter under -X importtime and report
+    the slowest imports, the schema check, and any heavy ingest dependency
+    that got loaded. Exit status 1 if one did.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE % (HEAVY,)],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode:
+        print(proc.stderr[-2000:])
+        return proc.returncode
+    rows = []   # (self_us, cumulative_us, module)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cum_us), name.strip()))
+    total = sum(r[0] for r in rows)
+    print(f">> {len(rows)} modules imported, {total / 1000:.0f} ms")
+    for title, key in (("cumulative", 1), ("self", 0)):
+        print(f">> top {top} by {title} ms")
+        for r in sorted(rows, key=lambda r: -r[key])[:top]:
+            print(f"   {r[key] / 1000:8.1f}  {r[2]}")
+    out = proc.stdout.splitlines()
+    print(">> " + out[0])
+    heavy = out[1].split(":", 1)[1].strip()
+    if heavy:
+        print(f">> WARNING: loaded at startup: {heavy}")
+        return 1
+    return 0
+
 def main():
+    if "--profile-startup" in sys.argv[1:]:
+        sys.exit(profile_startup())
+
     # Start debugpy only in the worker process
     if in_reload_worker():
         try:
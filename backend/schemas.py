@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class PlayerOut(BaseModel):
@@ -10,6 +10,11 @@ class PlayerOut(BaseModel):
     bye_week: Optional[int] = None
     class Config: from_attributes = True
     
+class PlayerSearchOut(PlayerOut):
+    ecr_rank: Optional[float] = None
+    match: int                 # 0 name prefix, 1 word prefix, 2 substring, 3 position/team code
+    drafted: bool
+
 class TeamIn(BaseModel):
     team_slot_id: int
     team_name: str
@@ -22,12 +27,29 @@ class TeamOut(BaseModel):
     class Config:
         from_attributes = True
 
+MAX_PICK = 10_000    # far past any real draft; also keeps pick numbers inside SQLite's integer range
+
 class PickIn(BaseModel):
-    round_no: int
-    overall_no: int
-    team_slot_id: int
+    round_no: Optional[int] = Field(None, ge=1, le=MAX_PICK)       # derived from snake order when omitted
+    overall_no: int = Field(ge=1, le=MAX_PICK)
+    team_slot_id: Optional[int] = Field(None, ge=1, le=MAX_PICK)   # likewise: the team on the clock at overall_no
     player_id: str
 
+class PickBatchItem(BaseModel):
+    """One pick of a batch: player_id, or a player name (+ pos / nfl_team to disambiguate)."""
+    overall_no: Optional[int] = None     # default: the pick after the previous one
+    round_no: Optional[int] = None
+    team_slot_id: Optional[int] = None
+    fantasy_team: Optional[str] = None   # team_name, instead of team_slot_id
+    player_id: Optional[str] = None
+    player: Optional[str] = None
+    pos: Optional[str] = None
+    nfl_team: Optional[str] = None
+
+class PickBatchIn(BaseModel):
+    picks: list[PickBatchItem]
+    replace: bool = False                # drop the current draft first (same transaction)
+
 class PickOut(BaseModel):
     pick_id: int
     round_no: int
@@ -37,6 +59,13 @@ class PickOut(BaseModel):
     class Config:
         from_attributes = True
 
+class SuggestedPlayerOut(PlayerOut):
+    ecr_rank: Optional[float] = None
+    points: Optional[float] = None   # mode=vor only
+    vor: Optional[float] = None
+
 class SuggestionOut(BaseModel):
-    top: list[PlayerOut]
-    next: list[PlayerOut]
\ No newline at end of file
+    mode: str = "ecr"
+    scoring: Optional[str] = None
+    top: list[SuggestedPlayerOut]
+    next: list[SuggestedPlayerOut]
\ No newline at end of file
@@ -0,0 +1,176 @@
+# backend/services/board.py
+"""
+Process-resident draft board.
+
+Players with a consensus rank are loaded once, sorted by ECR, and given a fixed
+slot in an overall order plus a slot in their position's order. Availability is
+tracked with Fenwick trees over those slots, so a pick/undo is O(log n) and the
+k-th best available player is found with an O(log n) descent -- /suggestions
+never has to go back to the database between imports.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from .. import models
+
+
+@dataclass(frozen=True, slots=True)
+class BoardEntry:
+    player_id: str
+    season: int
+    clean_name: str
+    position: str
+    team: str | None
+    bye_week: int | None
+    ecr_rank: float | None
+
+
+class _Fenwick:
+    """Binary indexed tree of 0/1 availability flags (1-based internally)."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.tree = [0] * (n + 1)
+        # O(n) build with every slot available
+        for i in range(1, n + 1):
+            self.tree[i] += 1
+            j = i + (i & -i)
+            if j <= n:
+                self.tree[j] += self.tree[i]
+        self._log = 1 << max(n.bit_length() - 1, 0) if n else 0
+
+    def add(self, idx: int, delta: int):
+        i = idx + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> int:
+        s, i = 0, self.n
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def kth(self, k: int) -> int:
+        """0-based slot of the k-th (1-based) available entry."""
+        pos, step = 0, self._log
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+
+class DraftBoard:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._entries: list[BoardEntry] = []
+        self._slot: dict[str, int] = {}                  # player_id -> overall slot
+        self._pos_slot: dict[str, tuple[str, int]] = {}  # player_id -> (pos, slot in pos order)
+        self._pos_entries: dict[str, list[BoardEntry]] = {}
+        self._overall: _Fenwick = _Fenwick(0)
+        self._by_pos: dict[str, _Fenwick] = {}
+        self._taken: set[str] = set()
+        self._built_at: float | None = None
+        self._build_ms: float | None = None
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def invalidate(self):
+        """Drop the board; it is rebuilt on next use (e.g. after an import)."""
+        with self._lock:
+            self._built = False
+
+    def ensure(self, db: Session) -> "DraftBoard":
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.rebuild(db)
+        return self
+
+    def rebuild(self, db: Session):
+        t0 = time.perf_counter()
+        P, C = models.Player, models.ConsensusRank
+        rows = db.query(
+            P.player_id, P.season, P.clean_name, P.position, P.team, P.bye_week, C.ecr_rank
+        ).join(C, (C.player_id == P.player_id) & (C.season == P.season)).all()
+        entries = sorted(
+            (BoardEntry(*r) for r in rows),
+            key=lambda e: (e.ecr_rank is None, e.ecr_rank or 0.0, e.clean_name, e.player_id),
+        )
+        picked = {pid for (pid,) in db.query(models.Pick.player_id).all()}
+
+        with self._lock:
+            self._entries = entries
+            self._slot = {e.player_id: i for i, e in enumerate(entries)}
+            self._pos_entries = {}
+            self._pos_slot = {}
+            for e in entries:
+                lst = self._pos_entries.setdefault(e.position, [])
+                self._pos_slot[e.player_id] = (e.position, len(lst))
+                lst.append(e)
+            self._overall = _Fenwick(len(entries))
+            self._by_pos = {pos: _Fenwick(len(lst)) for pos, lst in self._pos_entries.items()}
+            self._taken = set()
+            for pid in picked:
+                self._take(pid)
+            self._built = True
+            self._built_at = time.time()
+            self._build_ms = (time.perf_counter() - t0) * 1000.0
+
+    # --- pick / undo ---------------------------------------------------------
+
+    def _take(self, player_id: str):
+        if player_id in self._taken or player_id not in self._slot:
+            return
+        self._taken.add(player_id)
+        self._overall.add(self._slot[player_id], -1)
+        pos, i = self._pos_slot[player_id]
+        self._by_pos[pos].add(i, -1)
+
+    def mark_picked(self, player_id: str):
+        with self._lock:
+            if self._built:
+                self._take(player_id)
+
+    def mark_available(self, player_id: str):
+        with self._lock:
+            if not self._built or player_id not in self._taken:
+                return
+            self._taken.discard(player_id)
+            self._overall.add(self._slot[player_id], 1)
+            pos, i = self._pos_slot[player_id]
+            self._by_pos[pos].add(i, 1)
+
+    # --- queries -------------------------------------------------------------
+
+    def top(self, n: int, position: str | None = None) -> list[BoardEntry]:
+        with self._lock:
+            if position is None:
+                tree, entries = self._overall, self._entries
+            else:
+                tree, entries = self._by_pos.get(position), self._pos_entries.get(position)
+                if tree is None:
+                    return []
+            n = min(n, tree.total())
+            return [entries[tree.kth(k)] for k in range(1, n + 1)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "built": self._built,
+                "built_at": self._built_at,
+                "build_ms": round(self._build_ms, 3) if self._build_ms is not None else None,
+                "size": len(self._entries),
+                "available": self._overall.total() if self._built else None,
+                "taken": len(self._taken),
+                "positions": {pos: len(lst) for pos, lst in self._pos_entries.items()},
+            }
+
+
+board = DraftBoard()
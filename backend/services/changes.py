@@ -0,0 +1,55 @@
+# backend/services/changes.py
+"""
+Change sequence behind /meta/players_enriched?since=.
+
+Every write that can move what a client shows appends (seq, season,
+player_id, kind) rows in its own transaction: enriched.refresh() for each
+players_enriched row it changed or removed (tier overrides, injuries, ECR,
+ADP and player imports all land there), and the pick routes for drafted /
+undrafted players (season NULL: picks aren't per season). seq is SQLite
+AUTOINCREMENT and writers are serialized, so it only grows in commit order.
+
+A delta is state-based: the log only says *which* players to look at, the
+caller then reads their current rows. The log keeps the last KEEP entries; a
+client behind that (or behind by more than FULL_AFTER players, where a
+snapshot is as cheap) is told to take a full snapshot.
+"""
+from sqlalchemy import delete, func, insert, or_
+from sqlalchemy.orm import Session
+from .. import models
+
+KEEP = 20000           # log entries retained
+FULL_AFTER = 1000      # touched players beyond which a delta is no cheaper than a snapshot
+
+
+def record(db: Session, kind: str, player_ids, season: int | None = None):
+    """Append entries for `player_ids` (does not commit) and trim the log."""
+    L = models.ChangeLog
+    rows = [{"season": season, "player_id": pid, "kind": kind} for pid in dict.fromkeys(player_ids)]
+    if not rows:
+        return
+    db.execute(insert(L), rows)
+    top = db.query(func.max(L.seq)).scalar()
+    db.execute(delete(L).where(L.seq <= top - KEEP))
+
+
+def current(db: Session) -> int:
+    return db.query(func.max(models.ChangeLog.seq)).scalar() or 0
+
+
+def touched(db: Session, since: int, season: int) -> dict[str, set[str]] | None:
+    """
+    {kind: player_ids} changed after `since` for the season (pick entries
+    apply to every season), or None when a full snapshot is needed.
+    """
+    L = models.ChangeLog
+    oldest, top = db.query(func.min(L.seq), func.max(L.seq)).one()
+    if since < 0 or since > (top or 0) or (oldest is not None and since < oldest - 1):
+        return None
+    out: dict[str, set[str]] = {}
+    q = db.query(L.kind, L.player_id).filter(L.seq > since, or_(L.season == season, L.season.is_(None)))
+    for kind, pid in q.distinct():
+        out.setdefault(kind, set()).add(pid)
+    if sum(map(len, out.values())) > FULL_AFTER:
+        return None
+    return out
@@ -0,0 +1,35 @@
+# backend/services/draft_order.py
+"""Snake-draft arithmetic shared by picks and the simulation code."""
+from sqlalchemy import case, literal
+
+
+def snake_position(overall_no: int, n_teams: int) -> tuple[int, int]:
+    """(round_no, draft_position) of a 1-based overall pick in a snake draft."""
+    round_no = (overall_no - 1) // n_teams + 1
+    idx = (overall_no - 1) % n_teams
+    draft_position = idx + 1 if round_no % 2 == 1 else n_teams - idx
+    return round_no, draft_position
+
+
+def overall_no(round_no: int, draft_position: int, n_teams: int) -> int:
+    """Inverse of snake_position()."""
+    idx = draft_position - 1 if round_no % 2 == 1 else n_teams - draft_position
+    return (round_no - 1) * n_teams + idx + 1
+
+
+def next_pick_for(draft_position: int, from_overall: int, n_teams: int) -> int:
+    """First overall pick >= from_overall that belongs to draft_position (ValueError if it never comes)."""
+    if not 1 <= draft_position <= n_teams:
+        raise ValueError(f"draft_position {draft_position} is outside 1..{n_teams}")
+    # this round's slot, else the next round's: at most 2 * n_teams ahead
+    round_no = (from_overall - 1) // n_teams + 1
+    o = overall_no(round_no, draft_position, n_teams)
+    return o if o >= from_overall else overall_no(round_no + 1, draft_position, n_teams)
+
+
+def snake_position_sql(overall_no: int, n_teams):
+    """snake_position() as SQL expressions, for a team count that is itself an expression."""
+    o = literal(overall_no - 1)
+    round_no = o // n_teams + 1
+    idx = o % n_teams
+    return round_no, case((round_no % 2 == 1, idx + 1), else_=n_teams - idx)
@@ -0,0 +1,112 @@
+# backend/services/enriched.py
+"""
+Materialized players_enriched read model.
+
+The five-way join (players, consensus ranks, cross-source ADP, CBS injuries, tier
+overrides) is computed here on writes -- a full season after an import, a
+single player after a tier edit -- and only rows that actually changed are
+written. Each season carries a version number that is bumped whenever its rows
+change, so /meta/players_enriched is a single indexed scan plus a header.
+"""
+from sqlalchemy import delete, func, update
+from sqlalchemy.orm import Session, aliased
+from .. import models
+from ..ingest.bulk import bulk_upsert
+from . import changes
+
+FIELDS = ("name", "pos", "team", "ecr", "ecr_pos", "tier", "tier_source",
+          "adp", "adp_min", "adp_max", "adp_std", "injury_status", "injury_body")
+
+
+def _compute(db: Session, season: int, player_ids: list[str] | None = None) -> dict[str, dict]:
+    P, C, A, I, T = models.Player, models.ConsensusRank, models.ADP, models.Injury, models.TierOverride
+    F = aliased(models.ADP)    # fp_composite, for ADP imported before the consensus stage existed
+    q = db.query(P.player_id, P.clean_name, P.position, P.team, C.ecr_rank, C.ecr_pos_rank, C.tier,
+                 func.coalesce(A.adp, F.adp), A.adp_min, A.adp_max, A.adp_std,
+                 I.status, I.body_part, T.tier_override)\
+         .outerjoin(C, (C.player_id==P.player_id) & (C.season==season))\
+         .outerjoin(A, (A.player_id==P.player_id) & (A.season==season) & (A.source=="consensus"))\
+         .outerjoin(F, (F.player_id==P.player_id) & (F.season==season) & (F.source=="fp_composite"))\
+         .outerjoin(I, (I.player_id==P.player_id) & (I.season==season) & (I.source=="cbs"))\
+         .outerjoin(T, (T.player_id==P.player_id))
+    if player_ids is not None:
+        q = q.filter(P.player_id.in_(player_ids))
+    out = {}
+    for (pid, name, pos, team, ecr, epos, tier, adp, amin, amax, astd, istat, ibody, tovr) in q.all():
+        out[pid] = {
+            "name": name, "pos": pos, "team": team,
+            "ecr": ecr, "ecr_pos": epos, "tier": tovr if tovr is not None else tier,
+            "tier_source": "override" if tovr is not None else "core",
+            "adp": adp, "adp_min": amin, "adp_max": amax, "adp_std": astd,
+            "injury_status": istat, "injury_body": ibody,
+        }
+    return out
+
+
+def _stored(db: Session, season: int, player_ids: list[str] | None = None) -> dict[str, tuple]:
+    E = models.PlayerEnriched
+    q = db.query(E.player_id, *(getattr(E, f) for f in FIELDS)).filter(E.season == season)
+    if player_ids is not None:
+        q = q.filter(E.player_id.in_(player_ids))
+    return {r[0]: tuple(r[1:]) for r in q.all()}
+
+
+def refresh(db: Session, season: int, player_ids: list[str] | None = None) -> dict:
+    """
+    Recompute the season (or just `player_ids`) and write the difference.
+    Commits, and bumps the season version when anything changed.
+    """
+    fresh = _compute(db, season, player_ids)
+    old = _stored(db, season, player_ids)
+    changed = [
+        {"season": season, "player_id": pid, **row}
+        for pid, row in fresh.items()
+        if old.get(pid) != tuple(row[f] for f in FIELDS)
+    ]
+    removed = [pid for pid in old if pid not in fresh]
+
+    E, V = models.PlayerEnriched, models.EnrichedVersion
+    bulk_upsert(db, E, changed, key_cols=["season", "player_id"], update_cols=list(FIELDS))
+    if removed:
+        db.execute(delete(E).where(E.season == season, E.player_id.in_(removed)))
+
+    changes.record(db, "enriched", [r["player_id"] for r in changed] + removed, season)
+
+    if db.get(V, season) is None:
+        # two first requests for a season can both build it; the later one keeps the existing row
+        bulk_upsert(db, V, [{"season": season, "version": 1}], key_cols=["season"], update_cols=[])
+    elif changed or removed:
+        db.execute(update(V).where(V.season == season).values(version=V.version + 1))
+    db.commit()
+    return {"season": season, "changed": len(changed), "removed": len(removed), "version": version(db, season)}
+
+
+def ensure(db: Session, season: int) -> int:
+    """Build the season on first use; returns its current version."""
+    v = version(db, season)
+    if v is None:
+        refresh(db, season)
+        v = version(db, season)
+    return v
+
+
+def version(db: Session, season: int) -> int | None:
+    row = db.query(models.EnrichedVersion.version).filter_by(season=season).first()
+    return row[0] if row else None
+
+
+def built_seasons(db: Session) -> list[int]:
+    return [s for (s,) in db.query(models.EnrichedVersion.season).all()]
+
+
+def refresh_players(db: Session, player_ids: list[str]):
+    """Incremental refresh of a few players in every materialized season."""
+    for season in built_seasons(db):
+        refresh(db, season, player_ids)
+
+
+def refresh_all(db: Session, season: int | None = None):
+    """After an import: the given season, or every materialized one."""
+    seasons = [season] if season is not None else built_seasons(db)
+    for s in seasons:
+        refresh(db, s)
@@ -0,0 +1,69 @@
+# backend/services/events.py
+"""
+In-process draft event bus behind /draft/stream (Server-Sent Events).
+
+Write paths publish small events through services/hooks; every connected
+stream gets them pushed instead of polling. The last HISTORY events are kept
+so a client that reconnects with Last-Event-ID can catch up without a full
+reload; if it is too far behind (or the server restarted) it gets a `reset`.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+HISTORY = 1000
+
+
+class EventBus:
+    def __init__(self, history: int = HISTORY):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: deque[dict] = deque(maxlen=history)
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+
+    @property
+    def last_id(self) -> int:
+        return self._seq
+
+    def publish(self, type_: str, data: dict) -> dict:
+        """Thread-safe; called from sync route handlers in the threadpool."""
+        with self._lock:
+            self._seq += 1
+            ev = {"id": self._seq, "type": type_, "data": data, "ts": round(time.time(), 3)}
+            self._history.append(ev)
+            subs = list(self._subscribers.items())
+        for q, loop in subs:
+            try:
+                loop.call_soon_threadsafe(q.put_nowait, ev)
+            except RuntimeError:          # loop closed; stream is gone
+                self.unsubscribe(q)
+        return ev
+
+    def since(self, last_id: int) -> list[dict] | None:
+        """Events after last_id, or None when they are no longer all retained."""
+        with self._lock:
+            if last_id > self._seq:
+                return None               # id from before a restart
+            if last_id == self._seq:
+                return []
+            if not self._history or self._history[0]["id"] > last_id + 1:
+                return None
+            return [ev for ev in self._history if ev["id"] > last_id]
+
+    def subscribe(self) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[q] = asyncio.get_running_loop()
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"last_id": self._seq, "retained": len(self._history), "subscribers": len(self._subscribers)}
+
+
+bus = EventBus()
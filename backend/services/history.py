@@ -0,0 +1,206 @@
+# backend/services/history.py
+"""
+Rank history: packed per-import snapshots of ECR and consensus ADP.
+
+Imports overwrite consensus_ranks / adp in place, so after every import the
+season's rankings are appended here as one row per kind:
+
+  - the sorted player_id list, stored once per distinct player set
+    (snapshot_ids) and shared by every snapshot over the same players
+  - the values in player_id order as int32 hundredths, zlib'd -- either whole
+    (a keyframe) or as the difference from the previous snapshot over the
+    same players (base_id), whichever packs smaller. Day-to-day rankings
+    mostly move a little, so most snapshots are mostly zeros. Chains are cut
+    at MAX_CHAIN diffs, so decoding never replays more than that.
+
+A ranking identical to the latest snapshot is not stored again, so re-running
+an import costs nothing.
+
+Snapshots never change once written, so unpacked arrays are cached by
+snap_id. Movers are one aligned array diff between two snapshots; a player's
+history is a binary search per snapshot.
+"""
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .. import models
+
+KINDS = ("ecr", "adp")
+CACHE_SIZE = 256       # unpacked snapshots kept in memory
+MAX_CHAIN = 15         # diffs between keyframes
+
+
+def _current(db: Session, season: int, kind: str) -> list[tuple[str, float]]:
+    if kind == "ecr":
+        C = models.ConsensusRank
+        q = db.query(C.player_id, C.ecr_rank).filter(C.season == season, C.ecr_rank.isnot(None))
+    else:
+        A = models.ADP
+        q = db.query(A.player_id, A.adp).filter(A.season == season, A.source == "consensus", A.adp.isnot(None))
+    return sorted(q.all())
+
+
+def seasons(db: Session) -> list[int]:
+    C, A = models.ConsensusRank, models.ADP
+    return sorted({s for (s,) in db.query(C.season).distinct()} | {s for (s,) in db.query(A.season).distinct()})
+
+
+def _centi(values) -> np.ndarray:
+    return np.rint(np.asarray(values, dtype=np.float64) * 100).astype(np.int32)
+
+
+def _depth(db: Session, snap) -> int:
+    """Diffs between `snap` and its keyframe."""
+    n = 0
+    while snap.base_id is not None:
+        snap, n = db.get(models.RankSnapshot, snap.base_id), n + 1
+    return n
+
+
+def capture(db: Session, season: int, source: str | None = None) -> list[int]:
+    """Snapshot the season's rankings that changed since their last snapshot; commits."""
+    S, I = models.RankSnapshot, models.SnapshotIds
+    made = []
+    for kind in KINDS:
+        rows = _current(db, season, kind)
+        if not rows:
+            continue
+        ids = "\n".join(pid for pid, _ in rows).encode()
+        ids_hash = hashlib.sha1(ids).hexdigest()
+        centi = _centi([v for _, v in rows])
+        digest = hashlib.sha1(ids_hash.encode() + centi.tobytes()).hexdigest()
+        prev = db.query(S).filter(S.season == season, S.kind == kind)\
+            .order_by(S.taken_at.desc(), S.snap_id.desc()).first()
+        if prev is not None and prev.digest == digest:
+            continue
+        if db.get(I, ids_hash) is None:
+            db.add(I(ids_hash=ids_hash, ids=zlib.compress(ids, 9)))
+
+        packed, base_id = zlib.compress(centi.tobytes(), 9), None
+        if prev is not None and prev.ids_hash == ids_hash and _depth(db, prev) < MAX_CHAIN:
+            diff = zlib.compress((centi - store.centi(db, prev)).tobytes(), 9)
+            if len(diff) < len(packed):
+                packed, base_id = diff, prev.snap_id
+        snap = S(season=season, kind=kind, source=source, n=len(rows), ids_hash=ids_hash,
+                 base_id=base_id, values=packed, digest=digest)
+        db.add(snap)
+        db.flush()
+        made.append(snap.snap_id)
+    db.commit()
+    return made
+
+
+class HistoryStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: dict[str, np.ndarray] = {}
+        self._snaps: OrderedDict[int, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+
+    def centi(self, db: Session, snap) -> np.ndarray:
+        """A RankSnapshot row's values in hundredths (keyframe + diff for a delta row)."""
+        with self._lock:
+            hit = self._snaps.get(snap.snap_id)
+            if hit is not None:
+                self._snaps.move_to_end(snap.snap_id)
+                return hit
+        out = np.frombuffer(zlib.decompress(snap.values), dtype=np.int32)
+        if snap.base_id is not None:
+            out = out + self.centi(db, db.get(models.RankSnapshot, snap.base_id))
+        with self._lock:
+            self._snaps[snap.snap_id] = out
+            while len(self._snaps) > CACHE_SIZE:
+                self._snaps.popitem(last=False)
+        return out
+
+    def _unpack(self, db: Session, snap) -> tuple[np.ndarray, np.ndarray]:
+        """(sorted player_ids, values) for a RankSnapshot row."""
+        with self._lock:
+            ids = self._ids.get(snap.ids_hash)
+        if ids is None:
+            blob = db.query(models.SnapshotIds.ids).filter_by(ids_hash=snap.ids_hash).scalar()
+            ids = np.array(zlib.decompress(blob).decode().split("\n"))    # fixed-width str: fast sorted ops
+            with self._lock:
+                self._ids[snap.ids_hash] = ids
+        return ids, self.centi(db, snap) / 100.0
+
+    def _series(self, db: Session, season: int, kind: str):
+        S = models.RankSnapshot
+        return db.query(S).filter(S.season == season, S.kind == kind).order_by(S.taken_at, S.snap_id)
+
+    def _last(self, db: Session, season: int, kind: str, at: datetime | None = None):
+        """Latest snapshot taken at or before `at` (or at all)."""
+        S = models.RankSnapshot
+        q = db.query(S).filter(S.season == season, S.kind == kind)
+        if at is not None:
+            q = q.filter(S.taken_at <= at)
+        return q.order_by(S.taken_at.desc(), S.snap_id.desc()).first()
+
+    def snapshots(self, db: Session, season: int, kind: str) -> list[dict]:
+        S = models.RankSnapshot
+        rows = db.query(S.snap_id, S.taken_at, S.source, S.n, func.length(S.values))\
+            .filter(S.season == season, S.kind == kind).order_by(S.taken_at, S.snap_id).all()
+        return [{"snap_id": i, "taken_at": t, "source": src, "n": n, "bytes": b} for i, t, src, n, b in rows]
+
+    def movers(self, db: Session, season: int, kind: str, since: datetime, limit: int = 25,
+               top: int = 300) -> dict | None:
+        """
+        Biggest moves between the last snapshot taken at or before `since`
+        (else the first one) and the latest, among players ranked inside `top`
+        in either. None without two snapshots.
+        """
+        latest = self._last(db, season, kind)
+        base = self._last(db, season, kind, since) or self._series(db, season, kind).first()
+        if latest is None or base is None or base.snap_id == latest.snap_id:
+            return None
+        (ids0, v0), (ids1, v1) = self._unpack(db, base), self._unpack(db, latest)
+
+        # both id lists are sorted: align the common players without a dict
+        common, i0, i1 = np.intersect1d(ids0, ids1, assume_unique=True, return_indices=True)
+        new, dropped = len(ids1) - len(common), len(ids0) - len(common)
+        before, after = v0[i0], v1[i1]
+        keep = (before <= top) | (after <= top)
+        common, before, after = common[keep], before[keep], after[keep]
+        change = before - after                     # > 0: moved up the board
+        order = np.argsort(-change, kind="stable")
+        up = [i for i in order[:limit] if change[i] > 0]
+        down = [i for i in order[::-1][:limit] if change[i] < 0]
+
+        P = models.Player
+        pids = [str(common[i]) for i in up + down]
+        info = {r[0]: r[1:] for r in db.query(P.player_id, P.clean_name, P.position, P.team)
+                .filter(P.player_id.in_(pids)).all()} if pids else {}
+
+        def entry(i):
+            pid = str(common[i])
+            name, pos, team = info.get(pid, (None, None, None))
+            return {"player_id": pid, "name": name, "pos": pos, "team": team,
+                    "before": round(float(before[i]), 2), "after": round(float(after[i]), 2),
+                    "change": round(float(change[i]), 2)}
+
+        return {
+            "season": season, "kind": kind,
+            "from": {"snap_id": base.snap_id, "taken_at": base.taken_at},
+            "to": {"snap_id": latest.snap_id, "taken_at": latest.taken_at},
+            "risers": [entry(i) for i in up],
+            "fallers": [entry(i) for i in down],
+            "new": new, "dropped": dropped,
+        }
+
+    def player_history(self, db: Session, season: int, kind: str, player_id: str) -> list[dict]:
+        """The player's value in every snapshot of the series (None where unranked)."""
+        out = []
+        for snap in self._series(db, season, kind).all():
+            ids, vals = self._unpack(db, snap)
+            i = int(np.searchsorted(ids, player_id))
+            hit = i < len(ids) and ids[i] == player_id
+            out.append({"snap_id": snap.snap_id, "taken_at": snap.taken_at, "source": snap.source,
+                        "value": round(float(vals[i]), 2) if hit else None})
+        return out
+
+
+store = HistoryStore()
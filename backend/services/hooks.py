@@ -0,0 +1,80 @@
+# backend/services/hooks.py
+"""
+Single place where write paths (picks, edits, admin imports) notify the
+read models so they stay in sync with the database, and publish the
+matching event on the draft stream.
+"""
+from sqlalchemy.orm import Session
+from . import enriched, history
+from .board import board
+from .events import bus
+from .search import index as search
+from .survival import engine as survival
+from .vor import engine as vor
+
+
+def pick_payload(p) -> dict:
+    return {
+        "pick_id": p.pick_id, "overall_no": p.overall_no, "round_no": p.round_no,
+        "team_slot_id": p.team_slot_id, "player_id": p.player_id,
+    }
+
+
+def on_pick_made(pick):
+    board.mark_picked(pick.player_id)
+    vor.mark_picked(pick.player_id)
+    search.mark_picked(pick.player_id)
+    survival.invalidate()
+    bus.publish("pick-made", pick_payload(pick))
+
+
+def on_pick_undone(pick: dict):
+    """`pick` is pick_payload() captured before the row was deleted."""
+    board.mark_available(pick["player_id"])
+    vor.mark_available(pick["player_id"])
+    search.mark_available(pick["player_id"])
+    survival.invalidate()
+    bus.publish("pick-undone", pick)
+
+
+def on_picks_batch(replaced: list[str], picks: list[dict]):
+    """A batch import (optionally replacing the draft): one event for all of it."""
+    for pid in replaced:
+        board.mark_available(pid)
+        vor.mark_available(pid)
+        search.mark_available(pid)
+    for p in picks:
+        board.mark_picked(p["player_id"])
+        vor.mark_picked(p["player_id"])
+        search.mark_picked(p["player_id"])
+    survival.invalidate()
+    bus.publish("picks-batch", {"replaced": len(replaced), "picks": picks})
+
+
+def on_tier_changed(db: Session, player_id: str, tier: int | None):
+    enriched.refresh_players(db, [player_id])
+    bus.publish("tier-override", {"player_id": player_id, "tier": tier})
+
+
+def on_injuries_changed(db: Session, season: int, changes: list[dict]):
+    """Injury refresh: only the listed players' enriched rows can have moved."""
+    if not changes:
+        return
+    if season in enriched.built_seasons(db):
+        enriched.refresh(db, season, [c["player_id"] for c in changes])
+    bus.publish("injuries-changed", {"season": season, "changes": changes})
+
+
+def on_import_finished(db: Session, source: str, season: int | None = None, result: dict | None = None):
+    board.invalidate()
+    survival.invalidate()
+    vor.invalidate()
+    search.invalidate()
+    enriched.refresh_all(db, season)
+    for s in [season] if season is not None else history.seasons(db):
+        history.capture(db, s, source)
+    result = result or {}
+    bus.publish("import-finished", {
+        "source": source, "season": season,
+        "imported": result.get("imported"), "ok": not result.get("errors"),
+    })
@@ -0,0 +1,49 @@
+# backend/services/paging.py
+"""
+Keyset (cursor) pagination helpers.
+
+A page is "the next `limit` rows after the last key the client saw", so a
+page costs one index range scan however deep it is, and rows inserted or
+changed elsewhere don't shift later pages the way OFFSET does. Cursors are
+opaque to clients: url-safe base64 of the sort key plus a scope (endpoint and
+filters) so a cursor can't be replayed against a different listing.
+"""
+import base64
+import binascii
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(scope: list, key: tuple) -> str:
+    raw = orjson.dumps([scope, list(key)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, scope: list, width: int) -> tuple:
+    """Sort key from a cursor issued for `scope`; 400 for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        got_scope, key = orjson.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+    if got_scope != scope or not isinstance(key, list) or len(key) != width:
+        raise HTTPException(400, "Cursor does not belong to this listing")
+    if not all(v is None or isinstance(v, (str, int, float)) for v in key):
+        raise HTTPException(400, "Invalid cursor")
+    return tuple(key)
+
+
+def after(cols, key: tuple):
+    """WHERE clause for rows strictly after `key` in (cols...) ascending order."""
+    return tuple_(*cols) > tuple_(*key)
+
+
+def page(rows: list, limit: int, scope: list, key_of) -> tuple[list, str | None]:
+    """Trim a limit+1 fetch to `limit` rows; cursor for the next page if there is one."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(scope, key_of(rows[-1]))
@@ -0,0 +1,175 @@
+# backend/services/search.py
+"""
+In-process player search index behind /players/search (typeahead) and
+/players?q=.
+
+Names are folded once at build time (diacritics, case and punctuation: "St.
+Brown" -> "st brown", "Ja'Marr" -> "jamarr"). Entries are stored in board
+order (ECR, then name), so a smaller entry number is a better player and
+ranking is a sort on (match tier, entry). Match tiers:
+
+  0  the whole name starts with the query (spaces optional: "amonra")
+  1  every query word starts one of the name's words ("st bro", "chase")
+  2  the query appears anywhere in the name (trigram postings, >= 3 chars)
+  3  the query is a position or team code ("wr", "dal")
+
+Prefix tiers are bisections over sorted key lists; nothing touches the
+database between imports. Drafted players are tracked through the hooks
+like the draft board, so they can be excluded without a query.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from sqlalchemy.orm import Session
+from .. import models
+from ..ingest.normalize import fold_name
+from .board import BoardEntry
+
+_HIGH = "\uffff"
+
+
+def _sorted_keys(pairs) -> tuple[list[str], list[int]]:
+    pairs = sorted(pairs)
+    return [k for k, _ in pairs], [i for _, i in pairs]
+
+
+def _prefixed(keys: list[str], idx: list[int], prefix: str) -> list[int]:
+    lo = bisect_left(keys, prefix)
+    hi = bisect_left(keys, prefix + _HIGH, lo)
+    return idx[lo:hi]
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._entries: list[BoardEntry] = []
+        self._compact: list[str] = []                # folded name without spaces, per entry
+        self._names: tuple[list[str], list[int]] = ([], [])
+        self._squeezed: tuple[list[str], list[int]] = ([], [])
+        self._words: tuple[list[str], list[int]] = ([], [])
+        self._grams: dict[str, list[int]] = {}
+        self._codes: dict[str, list[int]] = {}
+        self._slot: dict[str, int] = {}
+        self._taken: set[int] = set()
+        self._build_ms: float | None = None
+
+    # --- lifecycle -----------------------------------------------------------
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+
+    def ensure(self, db: Session) -> "SearchIndex":
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.rebuild(db)
+        return self
+
+    def rebuild(self, db: Session):
+        t0 = time.perf_counter()
+        P, C = models.Player, models.ConsensusRank
+        rows = db.query(
+            P.player_id, P.season, P.clean_name, P.position, P.team, P.bye_week, C.ecr_rank
+        ).outerjoin(C, (C.player_id == P.player_id) & (C.season == P.season)).all()
+        entries = sorted(
+            (BoardEntry(*r) for r in rows),
+            key=lambda e: (e.ecr_rank is None, e.ecr_rank or 0.0, e.clean_name, e.player_id),
+        )
+        folded = [fold_name(e.clean_name) for e in entries]
+        compact = [f.replace(" ", "") for f in folded]
+        grams: dict[str, list[int]] = {}
+        codes: dict[str, list[int]] = {}
+        for i, (c, e) in enumerate(zip(compact, entries)):
+            for g in {c[j:j + 3] for j in range(len(c) - 2)}:
+                grams.setdefault(g, []).append(i)       # ascending i: postings stay sorted
+            for code in {(e.position or "").lower(), (e.team or "").lower()} - {""}:
+                codes.setdefault(code, []).append(i)
+        picked = {pid for (pid,) in db.query(models.Pick.player_id).all()}
+
+        with self._lock:
+            self._entries = entries
+            self._compact = compact
+            self._names = _sorted_keys((f, i) for i, f in enumerate(folded))
+            self._squeezed = _sorted_keys((c, i) for i, c in enumerate(compact))
+            self._words = _sorted_keys((w, i) for i, f in enumerate(folded) for w in set(f.split()))
+            self._grams = grams
+            self._codes = codes
+            self._slot = {e.player_id: i for i, e in enumerate(entries)}
+            self._taken = {self._slot[pid] for pid in picked if pid in self._slot}
+            self._built = True
+            self._build_ms = (time.perf_counter() - t0) * 1000.0
+
+    # --- pick / undo ---------------------------------------------------------
+
+    def mark_picked(self, player_id: str):
+        with self._lock:
+            if self._built and player_id in self._slot:
+                self._taken.add(self._slot[player_id])
+
+    def mark_available(self, player_id: str):
+        with self._lock:
+            if self._built and player_id in self._slot:
+                self._taken.discard(self._slot[player_id])
+
+    # --- queries -------------------------------------------------------------
+
+    def _substring(self, needle: str) -> list[int]:
+        postings = [self._grams.get(needle[j:j + 3], []) for j in range(len(needle) - 2)]
+        postings.sort(key=len)
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits.intersection_update(p)
+            if not hits:
+                break
+        return [i for i in hits if needle in self._compact[i]]
+
+    def search(self, q: str, limit: int = 10, exclude_drafted: bool = False,
+               position: str | None = None) -> list[tuple[BoardEntry, int, bool]]:
+        """Best `limit` (entry, tier, drafted) matches; call ensure(db) first."""
+        key = fold_name(q)
+        if not key:
+            return []
+        squeezed = key.replace(" ", "")
+        words = key.split()
+        with self._lock:
+            tier: dict[int, int] = {}
+
+            def add(idxs, t):
+                for i in idxs:
+                    tier.setdefault(i, t)
+
+            add(_prefixed(*self._names, key), 0)
+            add(_prefixed(*self._squeezed, squeezed), 0)
+            hits = set(_prefixed(*self._words, words[0]))
+            for w in words[1:]:
+                hits.intersection_update(_prefixed(*self._words, w))
+            add(hits, 1)
+            if len(squeezed) >= 3:
+                add(self._substring(squeezed), 2)
+            if len(words) == 1:
+                add(self._codes.get(key, ()), 3)
+
+            pos = position.upper() if position else None
+            ranked = heapq.nsmallest(limit, (
+                (t, i) for i, t in tier.items()
+                if not (exclude_drafted and i in self._taken)
+                and (pos is None or self._entries[i].position == pos)
+            ))
+            return [(self._entries[i], t, i in self._taken) for t, i in ranked]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "built": self._built,
+                "build_ms": round(self._build_ms, 3) if self._build_ms is not None else None,
+                "size": len(self._entries),
+                "words": len(self._words[0]),
+                "trigrams": len(self._grams),
+                "taken": len(self._taken),
+            }
+
+
+index = SearchIndex()
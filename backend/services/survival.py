@@ -0,0 +1,136 @@
+# backend/services/survival.py
+"""
+"Will he be there at my next pick?" -- Monte Carlo over opponent picks.
+
+Each simulation draws a noisy ADP for every available player
+(adp + spread * N(0, 1)); the picks made before ours take the players with the
+lowest draws. A player survives a simulation if he is not among them. All
+simulations run as one (sims x players) NumPy array, so 10k sims over the top
+few hundred players is a handful of milliseconds. The spread is a fraction
+of ADP, or the cross-source ADP std when the sites disagree by more.
+
+Results are cached per draft state and dropped on every pick/undo/import.
+"""
+import threading
+import time
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+from .. import models
+from .draft_order import next_pick_for
+
+DEFAULT_SIMS = 10_000
+CANDIDATES = 300        # hard cap on the simulated pool
+POOL_PER_PICK = 4       # pool = max(limit, POOL_PER_PICK * picks_before + POOL_MARGIN) ...
+POOL_MARGIN = 60        # ... deeper players cannot realistically go before our next pick
+MIN_SPREAD = 1.5        # picks
+SPREAD_FRAC = 0.15      # default spread as a fraction of ADP when no better estimate exists
+NO_ADP_PENALTY = 1.15   # ECR-only players go a bit later than their rank
+
+
+def default_spread(adp: np.ndarray) -> np.ndarray:
+    return np.maximum(MIN_SPREAD, SPREAD_FRAC * adp)
+
+
+def player_spread(adp: np.ndarray, adp_std: np.ndarray) -> np.ndarray:
+    """Default spread, widened where the ADP sources disagree by more (NaN std: one source)."""
+    return np.fmax(default_spread(adp), adp_std)
+
+
+def _available(db: Session, season: int):
+    """
+    Undrafted players with an ADP (cross-source consensus, else fp_composite)
+    or, failing that, an ECR. Rows end with (adp, ecr, adp_std).
+    """
+    P, C, A, K = models.Player, models.ConsensusRank, models.ADP, models.Pick
+    F = aliased(models.ADP)
+    adp = func.coalesce(A.adp, F.adp)
+    rows = db.query(P.player_id, P.clean_name, P.position, P.team, adp, C.ecr_rank, A.adp_std)\
+        .outerjoin(A, (A.player_id == P.player_id) & (A.season == season) & (A.source == "consensus"))\
+        .outerjoin(F, (F.player_id == P.player_id) & (F.season == season) & (F.source == "fp_composite"))\
+        .outerjoin(C, (C.player_id == P.player_id) & (C.season == season))\
+        .outerjoin(K, K.player_id == P.player_id)\
+        .filter(K.pick_id.is_(None))\
+        .filter((adp.isnot(None)) | (C.ecr_rank.isnot(None)))\
+        .all()
+    return rows
+
+
+def simulate(mu: np.ndarray, spread: np.ndarray, picks_before: int, sims: int,
+             rng: np.random.Generator) -> np.ndarray:
+    """Survival probability per player for `picks_before` opponent picks."""
+    n = len(mu)
+    if picks_before <= 0 or n == 0:
+        return np.ones(n)
+    if picks_before >= n:
+        return np.zeros(n)
+    draws = rng.standard_normal((sims, n), dtype=np.float32)
+    draws *= spread.astype(np.float32)
+    draws += mu.astype(np.float32)
+    # k-th lowest draw per simulation; everyone above it is still on the board
+    cutoff = np.partition(draws, picks_before - 1, axis=1)[:, picks_before - 1:picks_before]
+    return (draws > cutoff).mean(axis=0)
+
+
+class SurvivalEngine:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: dict[tuple, dict] = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _state(self, db: Session) -> tuple:
+        K = models.Pick
+        return tuple(db.query(func.count(K.pick_id), func.max(K.pick_id), func.max(K.overall_no)).one())
+
+    def run(self, db: Session, season: int, team_slot_id: int, sims: int = DEFAULT_SIMS,
+            limit: int = 25, seed: int | None = None) -> dict | None:
+        """None when team_slot_id is unknown."""
+        state = self._state(db)
+        key = (season, team_slot_id, sims, limit, seed, state)
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is not None:
+            return {**hit, "cached": True}
+
+        t0 = time.perf_counter()
+        team = db.query(models.TeamLeague).filter_by(team_slot_id=team_slot_id).first()
+        if not team:
+            return None
+        n_teams = db.query(func.count(models.TeamLeague.team_slot_id)).scalar() or 12
+        current = (state[2] or 0) + 1
+        next_pick = next_pick_for(team.draft_position, current, n_teams)
+        picks_before = next_pick - current
+
+        rows = _available(db, season)
+        mu = np.array([a if a is not None else e * NO_ADP_PENALTY for (*_, a, e, _) in rows], dtype=float)
+        std = np.array([s for (*_, s) in rows], dtype=float)    # None -> NaN
+        pool = min(CANDIDATES, max(limit, POOL_PER_PICK * picks_before + POOL_MARGIN))
+        order = np.argsort(mu, kind="stable")[:pool]
+        rows = [rows[i] for i in order]
+        mu = mu[order]
+        spread = player_spread(mu, std[order])
+        surv = simulate(mu, spread, picks_before, sims, np.random.default_rng(seed))
+
+        out = {
+            "season": season,
+            "team_slot_id": team_slot_id,
+            "current_overall": current,
+            "next_pick": next_pick,
+            "picks_before": picks_before,
+            "sims": sims,
+            "players": [
+                {"player_id": pid, "name": name, "pos": pos, "team": tm, "adp": adp, "ecr": ecr,
+                 "spread": round(float(sd), 2), "survival": round(float(p), 4)}
+                for (pid, name, pos, tm, adp, ecr, _), sd, p in zip(rows[:limit], spread[:limit], surv[:limit])
+            ],
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+        with self._lock:
+            self._cache[key] = out
+        return {**out, "cached": False}
+
+
+engine = SurvivalEngine()
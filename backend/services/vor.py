@@ -0,0 +1,187 @@
+# backend/services/vor.py
+"""
+Value over replacement (VOR) from the projections table.
+
+A season's projections are loaded once into a (players x stats) matrix, with
+multiple sources averaged. A scoring profile is a weight vector over the same
+stats, so fantasy points for every player are one matrix-vector product; the
+result is cached per profile. Replacement level for a position is the best
+available player after the league's remaining starters at that position are
+filled, so picks only flip an availability flag and the next request re-reads
+replacement from the cached points -- nothing goes back to the database until
+the next import.
+"""
+import threading
+import time
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .. import models
+from ..config.settings import settings
+
+STATS = ("pass_yd", "pass_td", "pass_int", "rush_yd", "rush_td",
+         "rec_rec", "rec_yd", "rec_td", "fg", "xp")
+
+_BASE = {"pass_yd": 0.04, "pass_td": 4, "pass_int": -2, "rush_yd": 0.1, "rush_td": 6,
+         "rec_yd": 0.1, "rec_td": 6, "fg": 3, "xp": 1}
+
+SCORING_PROFILES: dict[str, dict[str, float]] = {
+    "std": {**_BASE, "rec_rec": 0},
+    "half_ppr": {**_BASE, "rec_rec": 0.5},
+    "ppr": {**_BASE, "rec_rec": 1},
+    "ppr_6pt_pass_td": {**_BASE, "rec_rec": 1, "pass_td": 6},
+}
+
+FLEX_POSITIONS = ("RB", "WR", "TE")
+
+
+def profile_weights(name: str) -> np.ndarray:
+    prof = SCORING_PROFILES[name]
+    return np.array([prof.get(s, 0.0) for s in STATS], dtype=float)
+
+
+def starters_per_position(slots: dict[str, int], n_teams: int, points: dict[str, np.ndarray],
+                          drafted: dict[str, int] | None = None) -> dict[str, int]:
+    """
+    League-wide starters per position. FLEX slots go to whichever RB/WR/TE is
+    best after the dedicated slots are filled (`points` sorted descending).
+    When `points` holds only the available players, `drafted` is the count
+    already taken per position: those starters are no longer in the arrays.
+    """
+    drafted = drafted or {}
+    need = {pos: n * n_teams for pos, n in slots.items() if pos != "FLEX"}
+    for _ in range(slots.get("FLEX", 0) * n_teams):
+        best, best_pts = None, -np.inf
+        for pos in FLEX_POSITIONS:
+            arr, k = points.get(pos), max(need.get(pos, 0) - drafted.get(pos, 0), 0)
+            if arr is not None and k < len(arr) and arr[k] > best_pts:
+                best, best_pts = pos, arr[k]
+        if best is None:
+            break
+        need[best] = need.get(best, 0) + 1
+    return need
+
+
+class _Season:
+    """Projection matrix and availability flags for one season."""
+
+    def __init__(self, db: Session, season: int):
+        import pandas as pd
+        from ..ingest.frames import to_records
+        t0 = time.perf_counter()
+        P, J = models.Player, models.Projection
+        cols = [getattr(J, s) for s in STATS]
+        rows = db.query(P.player_id, P.season, P.clean_name, P.position, P.team, P.bye_week,
+                        J.projected_points, *cols)\
+            .join(J, J.player_id == P.player_id)\
+            .filter(J.season == season)\
+            .order_by(P.player_id)\
+            .all()
+
+        # several sources for a player are averaged stat by stat
+        df = pd.DataFrame(rows, columns=["player_id", "season", "clean_name", "position", "team",
+                                         "bye_week", "projected_points", *STATS])
+        info = df.drop_duplicates("player_id")[list(df.columns[:6])]
+        means = df.groupby("player_id", sort=True)[["projected_points", *STATS]].mean()
+
+        self.season = season
+        self.info = [tuple(r.values()) for r in to_records(info)]   # (player_id, season, name, pos, team, bye)
+        self.index = {r[0]: i for i, r in enumerate(self.info)}
+        self.pos = info["position"].to_numpy(dtype=object)
+        m = means[list(STATS)].to_numpy(dtype=float)
+        # rows with no stat lines (e.g. DEF) fall back to the source's own point total
+        self.no_stats = np.isnan(m).all(axis=1)
+        self.matrix = np.nan_to_num(m)
+        self.listed = np.nan_to_num(means["projected_points"].to_numpy(dtype=float))
+        self.available = np.ones(len(info), dtype=bool)
+        self._points: dict[str, np.ndarray] = {}
+        self.build_ms = (time.perf_counter() - t0) * 1000.0
+
+    def points(self, profile: str) -> np.ndarray:
+        p = self._points.get(profile)
+        if p is None:
+            p = self.matrix @ profile_weights(profile)
+            p = np.where(self.no_stats, self.listed, p)
+            self._points[profile] = p
+        return p
+
+    def set_available(self, player_id: str, flag: bool):
+        i = self.index.get(player_id)
+        if i is not None:
+            self.available[i] = flag
+
+
+class VorEngine:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._seasons: dict[int, _Season] = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._seasons.clear()
+
+    def _ensure(self, db: Session, season: int) -> _Season:
+        with self._lock:
+            s = self._seasons.get(season)
+            if s is None:
+                s = _Season(db, season)
+                picked = {pid for (pid,) in db.query(models.Pick.player_id).all()}
+                for pid in picked:
+                    s.set_available(pid, False)
+                self._seasons[season] = s
+            return s
+
+    def mark_picked(self, player_id: str):
+        with self._lock:
+            for s in self._seasons.values():
+                s.set_available(player_id, False)
+
+    def mark_available(self, player_id: str):
+        with self._lock:
+            for s in self._seasons.values():
+                s.set_available(player_id, True)
+
+    def latest_season(self, db: Session) -> int | None:
+        return db.query(func.max(models.Projection.season)).scalar()
+
+    def replacement(self, s: _Season, points: np.ndarray, n_teams: int) -> dict[str, float]:
+        """Points of the best available player past the remaining starters, per position."""
+        by_pos, drafted = {}, {}
+        for pos in set(s.pos):
+            mask = s.pos == pos
+            by_pos[pos] = -np.sort(-points[mask & s.available])
+            drafted[pos] = int((mask & ~s.available).sum())
+        need = starters_per_position(settings.roster_slots, n_teams, by_pos, drafted)
+        out = {}
+        for pos, arr in by_pos.items():
+            k = max(need.get(pos, 0) - drafted[pos], 0)
+            out[pos] = float(arr[k]) if k < len(arr) else (float(arr[-1]) if len(arr) else 0.0)
+        return out
+
+    def top(self, db: Session, n: int, season: int, profile: str = "ppr",
+            position: str | None = None) -> list[dict]:
+        n_teams = db.query(func.count(models.TeamLeague.team_slot_id)).scalar() or 12
+        with self._lock:
+            s = self._ensure(db, season)
+            points = s.points(profile)
+            repl = self.replacement(s, points, n_teams)
+            vor = points - np.array([repl[p] for p in s.pos], dtype=float) if len(s.pos) else points
+            mask = s.available if position is None else s.available & (s.pos == position)
+            idx = np.flatnonzero(mask)
+            idx = idx[np.argsort(-vor[idx], kind="stable")[:n]]
+            keys = ("player_id", "season", "clean_name", "position", "team", "bye_week")
+            return [
+                {**dict(zip(keys, s.info[i])), "points": round(float(points[i]), 2), "vor": round(float(vor[i]), 2)}
+                for i in idx
+            ]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                season: {"players": len(s.info), "available": int(s.available.sum()),
+                         "build_ms": round(s.build_ms, 3), "profiles_cached": sorted(s._points)}
+                for season, s in self._seasons.items()
+            }
+
+
+engine = VorEngine()
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { api, API_BASE_EFFECTIVE } from "./api";
 import { Section } from "./components/Section";
 import { PlayerRow } from "./components/PlayerRow";
@@ -53,10 +53,40 @@ export default function App() {
     }
   };
 
+  const enrichedSeq = useRef(null);
+
   const loadPlayersTable = async () => {
     try {
-      const rows = await api.playersEnriched(season, positionFilter || "");
+      const { rows, seq } = await api.playersEnriched(season, positionFilter || "");
       setPlayersTable(rows);
+      enrichedSeq.current = seq;
+    } catch (e) {
+      console.error(e);
+    }
+  };
+
+  // Apply only what changed since the last load (a few rows after an edit).
+  const updatePlayersTable = async () => {
+    if (enrichedSeq.current == null) return loadPlayersTable();
+    try {
+      const d = await api.playersEnrichedSince(
+        season,
+        enrichedSeq.current,
+        positionFilter || ""
+      );
+      enrichedSeq.current = d.seq;
+      if (d.full) return setPlayersTable(d.rows);
+      if (!d.rows.length && !d.removed.length) return;
+      const gone = new Set([...d.removed, ...d.rows.map((r) => r.player_id)]);
+      const key = (r) => [r.ecr == null ? 1 : 0, r.ecr ?? 0, r.name, r.player_id];
+      const cmp = (a, b) => {
+        const [x, y] = [key(a), key(b)];
+        for (let i = 0; i < x.length; i++) if (x[i] !== y[i]) return x[i] < y[i] ? -1 : 1;
+        return 0;
+      };
+      setPlayersTable((prev) =>
+        [...prev.filter((r) => !gone.has(r.player_id)), ...d.rows].sort(cmp)
+      );
     } catch (e) {
       console.error(e);
     }
@@ -81,6 +111,51 @@ export default function App() {
     })();
   }, [positionFilter]);
 
+  const refreshSuggestions = async () => {
+    const sug = await api.suggestions(positionFilter || null);
+    setSuggestTop(sug.top || []);
+    setSuggestNext(sug.next || []);
+  };
+
+  // Live draft stream: picks/edits/imports from any client are pushed here,
+  // so we only re-fetch what an event actually touched.
+  const streamLive = useRef(false);
+  const handlers = useRef({});
+  handlers.current = { reloadAll, updatePlayersTable, refreshSuggestions };
+
+  useEffect(() => {
+    if (typeof EventSource === "undefined") return;
+    const es = new EventSource(api.streamUrl());
+    const on = (type, fn) =>
+      es.addEventListener(type, (e) => {
+        try {
+          fn(e.data ? JSON.parse(e.data) : {});
+        } catch (err) {
+          console.error(err);
+        }
+      });
+    es.onopen = () => (streamLive.current = true);
+    es.onerror = () => (streamLive.current = false);
+    on("pick-made", (pk) => {
+      setPicks((prev) =>
+        [...prev.filter((p) => p.pick_id !== pk.pick_id), pk].sort(
+          (a, b) => a.overall_no - b.overall_no
+        )
+      );
+      handlers.current.refreshSuggestions();
+    });
+    on("pick-undone", (pk) => {
+      setPicks((prev) => prev.filter((p) => p.pick_id !== pk.pick_id));
+      handlers.current.refreshSuggestions();
+    });
+    on("tier-override", () => handlers.current.updatePlayersTable());
+    on("injuries-changed", () => handlers.current.updatePlayersTable());
+    on("picks-batch", () => handlers.current.reloadAll());
+    on("import-finished", () => handlers.current.reloadAll());
+    on("reset", () => handlers.current.reloadAll());
+    return () => es.close();
+  }, []);
+
   const nextOverall = useMemo(
     () => (picks.length ? Math.max(...picks.map((p) => p.overall_no)) + 1 : 1),
     [picks]
@@ -101,7 +176,7 @@ export default function App() {
     try {
       await api.makePick(payload);
       setMakePickForm((f) => ({ ...f, overall_no: payload.overall_no + 1 }));
-      await reloadAll();
+      if (!streamLive.current) await reloadAll();
     } catch (e) {
       alert("Pick failed: " + e.message);
     }
@@ -109,12 +184,12 @@ export default function App() {
 
   const undo = async (pickId) => {
     await api.undoPick(pickId);
-    await reloadAll();
+    if (!streamLive.current) await reloadAll();
   };
 
   const onTier = async (row, tierVal) => {
     await api.setTier(row.player_id, tierVal);
-    await loadPlayersTable();
+    if (!streamLive.current) await updatePlayersTable();
   };
 
   const onNote = async (row, text) => {
@@ -126,7 +201,7 @@ export default function App() {
   const runImport = async (fn, label) => {
     try {
       await fn();
-      await reloadAll();
+      if (!streamLive.current) await reloadAll();
       alert(`${label}: ok`);
     } catch (e) {
       alert(`${label}: ${e.message}`);
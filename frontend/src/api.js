@@ -46,6 +46,14 @@ async function request(path, { method = "GET", body, headers = {} } = {}) {
   return parseJSON(res);
 }
 
+// {count, columns: {field: [values...]}} -> [{field: value, ...}, ...]
+const fromColumns = ({ count = 0, columns = {} }) => {
+  const fields = Object.keys(columns);
+  return Array.from({ length: count }, (_, i) =>
+    Object.fromEntries(fields.map((f) => [f, columns[f][i]]))
+  );
+};
+
 // Public API
 export const api = {
   health: () => request("/health"),
@@ -61,6 +69,9 @@ export const api = {
   makePick: (payload) => request("/picks", { method: "POST", body: payload }),
   undoPick: (pickId) => request(`/picks/${pickId}`, { method: "DELETE" }),
 
+  // Live draft events (Server-Sent Events); EventSource resumes via Last-Event-ID
+  streamUrl: () => join(API, "/draft/stream"),
+
   // Suggestions
   suggestions: (pos = null, opts = {}) => {
     const q = pos ? `?position=${encodeURIComponent(pos)}` : "";
@@ -104,12 +115,21 @@ export const api = {
     }),
 
   // Enriched players
+  // columnar on the wire (field names sent once), rows for the UI;
+  // seq is the change sequence to pass back as `since`
   playersEnriched: (season, position = "") =>
     request(
-      `/meta/players_enriched?season=${season}${
+      `/meta/players_enriched?season=${season}&format=columns${
         position ? `&position=${encodeURIComponent(position)}` : ""
       }`
-    ),
+    ).then((body) => ({ rows: fromColumns(body), seq: body.seq })),
+  // what changed after `since`: {seq, full, rows, removed, drafted, undrafted}
+  playersEnrichedSince: (season, since, position = "") =>
+    request(
+      `/meta/players_enriched?season=${season}&format=columns&since=${since}${
+        position ? `&position=${encodeURIComponent(position)}` : ""
+      }`
+    ).then((body) => ({ ...body, rows: fromColumns(body.rows) })),
 
   // Edits
   setTier: (player_id, tier) =>
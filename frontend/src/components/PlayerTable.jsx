@@ -9,7 +9,7 @@ export function PlayerTable({ rows, onPick, onTier, onNote }) {
         style={{
           display: "grid",
           gridTemplateColumns:
-            "60px 220px 60px 60px 60px 80px 200px 120px 140px",
+            "60px 220px 60px 60px 60px 100px 200px 120px 140px",
           gap: 8,
           padding: "8px 12px",
           background: "#151515",
@@ -48,7 +48,7 @@ function Row({ r, onPick, onTier, onNote }) {
       style={{
         display: "grid",
         gridTemplateColumns:
-          "60px 220px 60px 60px 60px 80px 200px 120px 140px",
+          "60px 220px 60px 60px 60px 100px 200px 120px 140px",
         gap: 8,
         padding: "6px 12px",
         borderTop: "1px solid #222",
@@ -69,7 +69,14 @@ function Row({ r, onPick, onTier, onNote }) {
       <div title={r.tier_source === "override" ? "Overridden" : "Core"}>
         {r.tier ?? "—"}
       </div>
-      <div>{r.adp ?? "—"}</div>
+      <div
+        title={
+          r.adp_min != null ? `sources: ${r.adp_min} – ${r.adp_max}` : undefined
+        }
+      >
+        {r.adp ?? "—"}
+        {r.adp_std ? ` ±${r.adp_std}` : ""}
+      </div>
       <div>
         {r.injury_status
           ? `${r.injury_status}${r.injury_body ? ` (${r.injury_body})` : ""}`